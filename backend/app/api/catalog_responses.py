@@ -0,0 +1,157 @@
+# backend/app/api/catalog_responses.py
+
+from __future__ import annotations
+
+import base64
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+from ..infrastructure.catalog_store import CatalogSnapshot, get_snapshot, register_derived
+from ..infrastructure.scholarship_repo import ScholarshipCatalog
+from .responses import BodyCache, PrecomputedBody, cached_json_response, make_etag, not_modified
+
+
+# Fields the frontend list view uses; precomputed alongside the full list
+COMMON_LIST_FIELDS: Tuple[str, ...] = (
+    "id", "name", "description", "deadline", "value", "category",
+)
+
+MAX_BATCH_IDS = 500
+
+
+class CatalogBodies:
+    """
+    Per-snapshot cache of serialized + compressed catalog response bodies.
+    The most common shapes are built eagerly (off the request path when the
+    catalog reloads); other shapes are built on first use and kept in an LRU.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.catalog: ScholarshipCatalog = snapshot.derived("scholarship_catalog")
+        self.known_fields: Set[str] = {k for s in self.catalog.scholarships for k in s}
+        self.bodies = BodyCache(max_entries=256)
+
+        self.list_body(None, 0, None)
+        self.list_body(COMMON_LIST_FIELDS, 0, None)
+
+    def etag(self, *shape: object) -> str:
+        return make_etag(self.snapshot.content_hash, shape)
+
+    def _project(self, record: Dict, fields: Optional[Sequence[str]]) -> Dict:
+        if fields is None:
+            return record
+        return {f: record.get(f) for f in fields}
+
+    def list_body(
+        self, fields: Optional[Tuple[str, ...]], offset: int, limit: Optional[int]
+    ) -> PrecomputedBody:
+        key = ("list", fields, offset, limit)
+
+        def build() -> PrecomputedBody:
+            records = self.catalog.scholarships
+            total = len(records)
+            end = total if limit is None else min(offset + limit, total)
+            headers = {"X-Total-Count": str(total)}
+            if end < total:
+                headers["X-Next-Cursor"] = encode_offset(end)
+            return PrecomputedBody(
+                [self._project(s, fields) for s in records[offset:end]],
+                etag=self.etag(*key),
+                headers=headers,
+            )
+
+        return self.bodies.get_or_build(key, build)
+
+    def batch_body(self, ids: Tuple[str, ...], fields: Optional[Tuple[str, ...]]) -> PrecomputedBody:
+        key = ("batch", ids, fields)
+
+        def build() -> PrecomputedBody:
+            found: List[Dict] = []
+            missing: List[str] = []
+            for sid in ids:
+                record = self.catalog.by_id.get(sid)
+                if record is None:
+                    missing.append(sid)
+                else:
+                    found.append(self._project(record, fields))
+            return PrecomputedBody(
+                {"scholarships": found, "missing_ids": missing},
+                etag=self.etag(*key),
+            )
+
+        return self.bodies.get_or_build(key, build)
+
+
+register_derived("catalog_bodies", CatalogBodies)
+
+
+def encode_offset(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_offset(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode((cursor + "=" * (-len(cursor) % 4)).encode("ascii"))
+        prefix, _, value = raw.decode("ascii").partition(":")
+        offset = int(value)
+        if prefix != "o" or offset < 0:
+            raise ValueError
+        return offset
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+
+def _parse_fields(bodies: CatalogBodies, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if not fields:
+        return None
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in bodies.known_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}",
+        )
+    return requested or None
+
+
+def catalog_list_response(
+    request: Request,
+    fields: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Response:
+    """GET /api/scholarships/ with projection, pagination and ETag/304."""
+    bodies: CatalogBodies = get_snapshot().derived("catalog_bodies")
+    shape_fields = _parse_fields(bodies, fields)
+    offset = decode_offset(cursor) if cursor else 0
+
+    key = ("list", shape_fields, offset, limit)
+    response = not_modified(request, bodies.etag(*key))
+    if response is not None:
+        return response
+
+    return cached_json_response(request, bodies.list_body(shape_fields, offset, limit))
+
+
+def catalog_batch_response(request: Request, ids: str, fields: Optional[str]) -> Response:
+    """GET /api/scholarships/batch?ids=... with projection and ETag/304."""
+    bodies: CatalogBodies = get_snapshot().derived("catalog_bodies")
+    shape_fields = _parse_fields(bodies, fields)
+
+    id_list = tuple(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not id_list:
+        raise HTTPException(status_code=400, detail="At least one id is required.")
+    if len(id_list) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_IDS} ids per request.",
+        )
+
+    key = ("batch", id_list, shape_fields)
+    response = not_modified(request, bodies.etag(*key))
+    if response is not None:
+        return response
+
+    return cached_json_response(request, bodies.batch_body(id_list, shape_fields))
@@ -0,0 +1,167 @@
+# backend/app/api/responses.py
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from fastapi import HTTPException, Request, Response
+
+try:  # fast JSON encoder if available
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # brotli is optional; we fall back to gzip only
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+from ..infrastructure.resilience import CircuitOpenError
+
+
+# Bodies smaller than this aren't worth compressing
+_MIN_COMPRESS_BYTES = 1024
+
+
+def _default(obj: Any) -> Any:
+    # Read-only record views (compiled catalog) serialize as plain objects
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def service_unavailable(error: CircuitOpenError) -> HTTPException:
+    """503 + Retry-After for a Claude call the circuit breaker refused."""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag value from e.g. (catalog content hash, response shape)."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:24]
+
+
+class PrecomputedBody:
+    """
+    A JSON body serialized once, with gzip (and brotli, if installed)
+    variants compressed up front, plus its strong ETag.
+    """
+
+    __slots__ = ("raw", "gzip", "br", "etag", "headers")
+
+    def __init__(self, obj: Any, etag: str, headers: Optional[Dict[str, str]] = None):
+        self.raw = dumps(obj)
+        self.headers = headers or {}
+        self.etag = etag
+        self.gzip: Optional[bytes] = None
+        self.br: Optional[bytes] = None
+        if len(self.raw) >= _MIN_COMPRESS_BYTES:
+            self.gzip = gzip.compress(self.raw, compresslevel=6, mtime=0)
+            if brotli is not None:
+                self.br = brotli.compress(self.raw, quality=9)
+
+
+def _accepts(request: Request, coding: str) -> bool:
+    accept = request.headers.get("accept-encoding", "")
+    for part in accept.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        # Encoding variants carry a -gz / -br suffix; all share one resource version
+        value = candidate.strip().removeprefix("W/").strip('"')
+        if value.split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+_CACHE_HEADERS = {
+    "Cache-Control": "no-cache",  # always revalidate, but reuse on 304
+    "Vary": "Accept-Encoding",
+}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    A 304 response if the client already has this ETag, else None.
+    Call it before building anything: a hit costs one string comparison.
+    """
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={**_CACHE_HEADERS, "ETag": f'"{etag}"'})
+    return None
+
+
+def cached_json_response(request: Request, body: PrecomputedBody) -> Response:
+    """
+    Serve a precomputed body: 304 if the client's If-None-Match matches,
+    otherwise the best pre-compressed variant the client accepts.
+    """
+    response = not_modified(request, body.etag)
+    if response is not None:
+        return response
+
+    headers = {**_CACHE_HEADERS, **body.headers}
+
+    if body.br is not None and _accepts(request, "br"):
+        content, suffix = body.br, "-br"
+        headers["Content-Encoding"] = "br"
+    elif body.gzip is not None and _accepts(request, "gzip"):
+        content, suffix = body.gzip, "-gz"
+        headers["Content-Encoding"] = "gzip"
+    else:
+        content, suffix = body.raw, ""
+
+    headers["ETag"] = f'"{body.etag}{suffix}"'
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+class BodyCache:
+    """Small thread-safe LRU of PrecomputedBody objects keyed by response shape."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, PrecomputedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], PrecomputedBody]) -> PrecomputedBody:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+
+        body = build()
+
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Dict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional, Dict, Tuple
+import asyncio
 import json
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from ...core.config import settings
 from ...infrastructure.scholarship_repo import get_scholarship
-from ...infrastructure.success_story_repo import find_best_matching_story
+from ...infrastructure.success_story_repo import (
+    find_best_matching_story,
+    find_matching_stories,
+)
 from ...infrastructure.ai_client import get_claude_client, MODEL_NAME
+from ...infrastructure.resilience import CircuitOpenError
+from ...infrastructure.prompt_builder import build_request
+from ...infrastructure.tracing import span
+from ...infrastructure.scoring_engine import score_essays_batch, score_essay_breakdown
+from ...schemas.essay import EssayDraftOut
+from ..responses import service_unavailable
 
 router = APIRouter(
     prefix="/api/essays",
@@ -44,6 +57,30 @@ class EssayGenerationRequest(BaseModel):
     scholarship_id: str
     selected_priorities: List[PrioritySelection]
     student_profile: EssayStudentProfile
+    # > 1: write that many drafts concurrently and rank them (/generate only)
+    num_variants: int = Field(1, ge=1, le=settings.essay_max_variants)
+
+
+class DraftIn(BaseModel):
+    id: Optional[str] = None
+    text: str
+
+
+class DraftScoreRequest(BaseModel):
+    # priority id -> weight; any scale, normalized to sum to 100
+    weights: Dict[str, float]
+    drafts: List[DraftIn] = Field(..., min_length=1, max_length=1000)
+
+
+class DraftScore(BaseModel):
+    id: str
+    rank: int
+    score: float
+    score_breakdown: Dict[str, float]
+
+
+class DraftScoreResponse(BaseModel):
+    results: List[DraftScore]
 
 
 class EssayResponse(BaseModel):
@@ -53,6 +90,9 @@ class EssayResponse(BaseModel):
     winner_story_id: Optional[str]
     winner_story_recipient_name: Optional[str]
     priorities: List[PrioritySelection]
+    # num_variants > 1: every draft, ranked best first by local score
+    # (essay and the winner story fields are the best draft's)
+    drafts: List[EssayDraftOut] = []
 
 
 # ---------- Helper: normalize priorities ----------
@@ -75,102 +115,13 @@ def _normalize_priorities(priorities: List[PrioritySelection]) -> Dict[str, floa
     return {p.name: p.weight / total for p in priorities}
 
 
-# ---------- Route: generate essay ----------
-
-
-@router.post("/generate", response_model=EssayResponse)
-async def generate_essay(req: EssayGenerationRequest) -> EssayResponse:
-    """
-    Generate a scholarship essay draft in TWO conceptual layers:
-
-    1) Content layer:
-       - Use the scholarship info.
-       - Use the user's chosen priorities and their re-weighted importance.
-       - Use the student's profile (experiences, interests, awards) to
-         ground the essay in their real story.
-
-    2) Style layer:
-       - Find the most compatible winner story based on overlapping priorities
-         (no API call, just comparing weights).
-       - Use that story's "style_profile" (hook_style, tone, voice_notes,
-         emotional_pacing) to shape the essay's voice and narrative flow.
-
-    The final result is one literacy-fulfilled essay draft ready for the user
-    to edit in the UI.
-    """
-
-    # 1) Fetch scholarship from JSON
-    scholarship = get_scholarship(req.scholarship_id)
-    if not scholarship:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Scholarship {req.scholarship_id} not found",
-        )
-
-    # 2) Normalize the selected priorities to get a clean weight profile
-    norm_weights = _normalize_priorities(req.selected_priorities)
-    if not norm_weights:
-        raise HTTPException(
-            status_code=400,
-            detail="At least one priority with a non-negative weight is required.",
-        )
-
-    # 3) Pick the most compatible success story (pure Python, no AI)
-    winner_story = find_best_matching_story(norm_weights)
-
-    winner_style_profile: Optional[Dict] = None
-    winner_story_summary: Optional[str] = None
-    winner_story_id: Optional[str] = None
-    winner_story_recipient_name: Optional[str] = None
-
-    if winner_story:
-        winner_style_profile = winner_story.get("style_profile") or {}
-        story_paragraphs = winner_story.get("story_paragraphs") or []
-        # Short summary for Claude to get a feel for the narrative arc
-        winner_story_summary = "\n\n".join(story_paragraphs[:2])
-        winner_story_id = winner_story.get("id")
-        winner_story_recipient_name = winner_story.get("recipient_name")
-
-    # 4) Build payload for Claude
-    student_profile_dict = req.student_profile.model_dump()
-
-    scholarship_payload = {
-        "id": str(scholarship.get("id")),
-        "title": scholarship.get("title") or scholarship.get("name"),
-        "description": scholarship.get("description"),
-        "value": scholarship.get("value"),
-        "deadline": scholarship.get("deadline"),
-        "level_of_study": scholarship.get("level_of_study"),
-        "legal_status": scholarship.get("legal_status"),
-        "institution": (
-            scholarship.get("institution")
-            or scholarship.get("college")
-            or scholarship.get("faculty")
-            or scholarship.get("division")
-            or scholarship.get("department")
-            or scholarship.get("unit")
-            or "University of Toronto"
-        ),
-    }
-
-    priorities_payload = [
-        {"name": p.name, "weight": norm_weights[p.name]}
-        for p in req.selected_priorities
-        if p.name in norm_weights
-    ]
+# ---------- System prompt ----------
 
-    payload = {
-        "student_profile": student_profile_dict,
-        "scholarship": scholarship_payload,
-        "selected_priorities": priorities_payload,
-        "winner_story_style_profile": winner_style_profile,
-        "winner_story_summary": winner_story_summary,
-    }
 
-    system_prompt = """
+ESSAY_SYSTEM_PROMPT = """
 You are an expert scholarship essay coach and ghostwriter.
 
-You will receive JSON with:
+You will receive JSON (split across several blocks) with:
 - "student_profile": info about the student (name, program, experiences, interests, awards).
 - "scholarship": details about the scholarship (title, description, value, institution, etc.).
 - "selected_priorities": up to 3 priorities that the student chose to focus on,
@@ -214,34 +165,185 @@ Output requirements:
 - Output ONLY the final essay as plain text, nothing else.
 """.strip()
 
-    client = get_claude_client()
 
-    try:
-        message = client.messages.create(
+# ---------- Helper: build the Claude request ----------
+
+
+@dataclass
+class EssayPlan:
+    """Everything needed to call Claude for one essay, plus response metadata."""
+    scholarship_id: str
+    scholarship_title: Optional[str]
+    winner_story_id: Optional[str]
+    winner_story_recipient_name: Optional[str]
+    winner_story_priorities: Optional[List[str]]
+    norm_weights: Dict[str, float]
+    claude_kwargs: Dict[str, Any]
+
+
+def _plan_essay(
+    req: EssayGenerationRequest,
+    norm_weights: Optional[Dict[str, float]] = None,
+    winner_story: Optional[Dict] = None,
+) -> EssayPlan:
+    """
+    Steps shared by the essay routes: fetch the scholarship, normalize
+    priorities, pick the winner story and build the Claude payload.
+    Variants pass their own norm_weights / winner_story to override steps 2-3.
+    Raises HTTPException for bad input.
+    """
+
+    # 1) Fetch scholarship from JSON
+    with span("catalog"):
+        scholarship = get_scholarship(req.scholarship_id)
+    if not scholarship:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Scholarship {req.scholarship_id} not found",
+        )
+
+    # 2) Normalize the selected priorities to get a clean weight profile
+    if norm_weights is None:
+        norm_weights = _normalize_priorities(req.selected_priorities)
+    if not norm_weights:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one priority with a non-negative weight is required.",
+        )
+
+    # 3) Pick the most compatible success story (pure Python, no AI)
+    if winner_story is None:
+        with span("story_match"):
+            winner_story = find_best_matching_story(norm_weights)
+
+    winner_style_profile: Optional[Dict] = None
+    winner_story_summary: Optional[str] = None
+    winner_story_id: Optional[str] = None
+    winner_story_recipient_name: Optional[str] = None
+    winner_story_priorities: Optional[List[str]] = None
+
+    if winner_story:
+        winner_style_profile = winner_story.get("style_profile") or {}
+        story_paragraphs = winner_story.get("story_paragraphs") or []
+        # Short summary for Claude to get a feel for the narrative arc
+        winner_story_summary = "\n\n".join(story_paragraphs[:2])
+        winner_story_id = winner_story.get("id")
+        winner_story_recipient_name = winner_story.get("recipient_name")
+        winner_story_priorities = winner_story.get("priorities")
+
+    # 4) Build payload for Claude
+    with span("payload"):
+        student_profile_dict = req.student_profile.model_dump()
+
+        scholarship_payload = {
+            "id": str(scholarship.get("id")),
+            "title": scholarship.get("title") or scholarship.get("name"),
+            "description": scholarship.get("description"),
+            "value": scholarship.get("value"),
+            "deadline": scholarship.get("deadline"),
+            "level_of_study": scholarship.get("level_of_study"),
+            "legal_status": scholarship.get("legal_status"),
+            "institution": (
+                scholarship.get("institution")
+                or scholarship.get("college")
+                or scholarship.get("faculty")
+                or scholarship.get("division")
+                or scholarship.get("department")
+                or scholarship.get("unit")
+                or "University of Toronto"
+            ),
+        }
+
+        priorities_payload = [
+            {"name": p.name, "weight": norm_weights[p.name]}
+            for p in req.selected_priorities
+            if p.name in norm_weights
+        ]
+
+        # Static-first for prompt caching: the scholarship and winner story are
+        # shared by every student writing for this scholarship; the profile and
+        # priorities are per-request.
+        scholarship_block = {"scholarship": scholarship_payload}
+        winner_story_block = {
+            "winner_story_style_profile": winner_style_profile,
+            "winner_story_summary": winner_story_summary,
+        }
+        student_block = {
+            "student_profile": student_profile_dict,
+            "selected_priorities": priorities_payload,
+        }
+        claude_kwargs = build_request(
             model=MODEL_NAME,
             max_tokens=1200,
             temperature=0.6,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": json.dumps(payload),
-                }
-            ],
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error while calling Claude for essay generation: {e}",
+            system=ESSAY_SYSTEM_PROMPT,
+            static=[scholarship_block, winner_story_block],
+            dynamic=student_block,
         )
 
-    # Collect text blocks into a single essay string
+    return EssayPlan(
+        scholarship_id=str(scholarship.get("id")),
+        scholarship_title=scholarship.get("title") or scholarship.get("name"),
+        winner_story_id=winner_story_id,
+        winner_story_recipient_name=winner_story_recipient_name,
+        winner_story_priorities=winner_story_priorities,
+        norm_weights=norm_weights,
+        claude_kwargs=claude_kwargs,
+    )
+
+
+def _essay_text(message: Any) -> str:
+    """Collect text blocks into a single essay string."""
     essay_chunks: List[str] = []
     for block in message.content:
         if block.type == "text":
             essay_chunks.append(block.text)
+    return "\n".join(essay_chunks).strip()
+
+
+# ---------- Route: generate essay ----------
+
+
+@router.post("/generate", response_model=EssayResponse)
+async def generate_essay(req: EssayGenerationRequest) -> EssayResponse:
+    """
+    Generate a scholarship essay draft in TWO conceptual layers:
+
+    1) Content layer:
+       - Use the scholarship info.
+       - Use the user's chosen priorities and their re-weighted importance.
+       - Use the student's profile (experiences, interests, awards) to
+         ground the essay in their real story.
+
+    2) Style layer:
+       - Find the most compatible winner story based on overlapping priorities
+         (no API call, just comparing weights).
+       - Use that story's "style_profile" (hook_style, tone, voice_notes,
+         emotional_pacing) to shape the essay's voice and narrative flow.
+
+    The final result is one literacy-fulfilled essay draft ready for the user
+    to edit in the UI. With num_variants > 1, several drafts are written
+    concurrently and ranked (see _generate_variants).
+    """
+    plan = _plan_essay(req)
+    if req.num_variants > 1:
+        return await _generate_variants(req, plan)
 
-    essay_text = "\n".join(essay_chunks).strip()
+    client = get_claude_client()
+
+    try:
+        with span("claude"):
+            message = await client.create_message(route="essays", **plan.claude_kwargs)
+    except CircuitOpenError as e:
+        raise service_unavailable(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error while calling Claude for essay generation: {e}",
+        )
+
+    with span("parse"):
+        essay_text = _essay_text(message)
 
     if not essay_text:
         raise HTTPException(
@@ -251,9 +353,236 @@ Output requirements:
 
     return EssayResponse(
         essay=essay_text,
-        scholarship_id=str(scholarship.get("id")),
-        scholarship_title=scholarship.get("title") or scholarship.get("name"),
-        winner_story_id=winner_story_id,
-        winner_story_recipient_name=winner_story_recipient_name,
+        scholarship_id=plan.scholarship_id,
+        scholarship_title=plan.scholarship_title,
+        winner_story_id=plan.winner_story_id,
+        winner_story_recipient_name=plan.winner_story_recipient_name,
         priorities=req.selected_priorities,
     )
+
+
+# ---------- generate several essay variants (num_variants > 1) ----------
+
+
+# Extra weight given to a variant's focus priority before re-normalizing
+_FOCUS_BOOST = 0.5
+
+
+def _variant_specs(
+    norm_weights: Dict[str, float], num_variants: int
+) -> List[Tuple[Optional[str], Dict[str, float], Optional[Dict]]]:
+    """
+    (focus_priority, weights, winner_story) for each variant.
+
+    Variant 1 keeps the user's weights; the others rotate through the
+    priorities (highest weight first), boosting one as the focus. Winner
+    stories rotate through the top-k matches so each draft can borrow a
+    different style.
+    """
+    ordered = sorted(norm_weights, key=norm_weights.get, reverse=True)
+    stories = [story for story, _ in find_matching_stories(norm_weights, k=num_variants)]
+
+    specs: List[Tuple[Optional[str], Dict[str, float], Optional[Dict]]] = []
+    for i in range(num_variants):
+        story = stories[i % len(stories)] if stories else None
+        if i == 0 or len(ordered) == 1:
+            specs.append((None, norm_weights, story))
+            continue
+
+        focus = ordered[(i - 1) % len(ordered)]
+        boosted = {
+            name: w + (_FOCUS_BOOST if name == focus else 0.0)
+            for name, w in norm_weights.items()
+        }
+        total = sum(boosted.values())
+        specs.append((focus, {name: w / total for name, w in boosted.items()}, story))
+    return specs
+
+
+async def _generate_variants(req: EssayGenerationRequest, base_plan: EssayPlan) -> EssayResponse:
+    """
+    /generate with num_variants > 1: write the drafts concurrently (bounded
+    by ESSAY_VARIANT_CONCURRENCY), each with a different focus priority
+    and/or winner-story style, then rank them with the local lexicon scorer.
+
+    Wall-clock time is close to a single draft. Variants that fail are
+    dropped; the request only fails if every variant does.
+    """
+    specs = _variant_specs(base_plan.norm_weights, req.num_variants)
+
+    plans = [
+        (focus, _plan_essay(req, norm_weights=weights, winner_story=story))
+        for focus, weights, story in specs
+    ]
+
+    client = get_claude_client()
+    semaphore = asyncio.Semaphore(settings.essay_variant_concurrency)
+
+    async def write(plan: EssayPlan) -> str:
+        async with semaphore:
+            # Never coalesce: identical variants should still be separate samples
+            message = await client.create_message(
+                route="essays_variants", coalesce=False, **plan.claude_kwargs
+            )
+        return _essay_text(message)
+
+    outcomes = await asyncio.gather(
+        *(write(plan) for _, plan in plans),
+        return_exceptions=True,
+    )
+
+    # Score against the user's own weights (0-100 scale), not the boosted ones
+    score_weights = {name: w * 100.0 for name, w in base_plan.norm_weights.items()}
+
+    drafts: List[EssayDraftOut] = []
+    plan_by_draft: Dict[str, EssayPlan] = {}
+    errors: List[str] = []
+    for i, ((focus, plan), outcome) in enumerate(zip(plans, outcomes), start=1):
+        if isinstance(outcome, BaseException) or not outcome:
+            errors.append(str(outcome) if outcome else "empty essay")
+            continue
+        score, breakdown = score_essay_breakdown(outcome, score_weights)
+        plan_by_draft[f"v{i}"] = plan
+        drafts.append(
+            EssayDraftOut(
+                id=f"v{i}",
+                text=outcome,
+                focus_priority=focus,
+                winner_story_id=plan.winner_story_id,
+                winner_story_priorities=plan.winner_story_priorities,
+                score=round(score, 2),
+                score_breakdown={name: round(c, 3) for name, c in breakdown.items()},
+            )
+        )
+
+    if not drafts:
+        if isinstance(outcomes[0], CircuitOpenError):
+            raise service_unavailable(outcomes[0])
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error while calling Claude for essay generation: {errors[0]}",
+        )
+
+    drafts.sort(key=lambda d: d.score, reverse=True)
+    best = plan_by_draft[drafts[0].id]
+
+    return EssayResponse(
+        essay=drafts[0].text,
+        scholarship_id=base_plan.scholarship_id,
+        scholarship_title=base_plan.scholarship_title,
+        winner_story_id=best.winner_story_id,
+        winner_story_recipient_name=best.winner_story_recipient_name,
+        priorities=req.selected_priorities,
+        drafts=drafts,
+    )
+
+
+# ---------- Route: generate essay (streaming) ----------
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_essay_stream(req: EssayGenerationRequest) -> StreamingResponse:
+    """
+    Same essay as /generate, streamed as server-sent events while Claude
+    writes it, so the UI can show text after ~1 second instead of waiting
+    for the whole draft.
+
+    Events:
+      - "delta": {"text": "..."}           one chunk of essay text
+      - "done":  EssayResponse without the essay text (scholarship, winner
+                 story id / recipient name, priorities)
+      - "error": {"detail": "..."}         Claude failed mid-stream
+
+    Input errors (unknown scholarship, no priorities) are still returned as
+    normal 404/400 responses before the stream starts. Only one draft is
+    streamed; use /generate for num_variants > 1.
+    """
+    if req.num_variants != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Streaming writes a single draft; use /api/essays/generate for num_variants > 1.",
+        )
+    plan = _plan_essay(req)
+    client = get_claude_client()
+
+    async def event_stream() -> AsyncIterator[str]:
+        got_text = False
+        try:
+            async for text in client.stream_text(route="essays_stream", **plan.claude_kwargs):
+                if text:
+                    got_text = True
+                    yield _sse("delta", {"text": text})
+        except Exception as e:
+            yield _sse(
+                "error",
+                {"detail": f"Error while calling Claude for essay generation: {e}"},
+            )
+            return
+
+        if not got_text:
+            yield _sse("error", {"detail": "Claude did not return any essay content."})
+            return
+
+        yield _sse(
+            "done",
+            {
+                "scholarship_id": plan.scholarship_id,
+                "scholarship_title": plan.scholarship_title,
+                "winner_story_id": plan.winner_story_id,
+                "winner_story_recipient_name": plan.winner_story_recipient_name,
+                "priorities": [p.model_dump() for p in req.selected_priorities],
+            },
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+# ---------- Route: score drafts locally (batch) ----------
+
+
+@router.post("/score/batch", response_model=DraftScoreResponse)
+def score_drafts_batch(req: DraftScoreRequest) -> DraftScoreResponse:
+    """
+    Score many drafts against one priority weight profile with the local
+    compiled lexicon scorer (no Claude), and return them ranked best first.
+
+    score is 0-100; score_breakdown is each priority's coverage (0-1).
+    Drafts without an id are numbered by position ("0", "1", ...).
+    """
+    total = sum(w for w in req.weights.values() if w > 0)
+    if total <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one priority with a positive weight is required.",
+        )
+    weights = {pid: max(w, 0.0) * 100.0 / total for pid, w in req.weights.items()}
+
+    scored = score_essays_batch([d.text for d in req.drafts], weights)
+
+    results = [
+        DraftScore(
+            id=d.id if d.id is not None else str(i),
+            rank=0,
+            score=round(score, 2),
+            score_breakdown={pid: round(c, 3) for pid, c in breakdown.items()},
+        )
+        for i, (d, (score, breakdown)) in enumerate(zip(req.drafts, scored))
+    ]
+    results.sort(key=lambda r: r.score, reverse=True)
+    for rank, r in enumerate(results, start=1):
+        r.rank = rank
+
+    return DraftScoreResponse(results=results)
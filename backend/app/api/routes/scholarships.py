@@ -1,19 +1,46 @@
 # backend/app/api/routes/scholarships.py
 
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Tuple
+import asyncio
+import heapq
+import itertools
 import json
+import logging
 from json import JSONDecodeError
 
-from fastapi import APIRouter, HTTPException
+import numpy as np
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 # You are running `uvicorn app.main:app`, so imports are from app.*
 from ...infrastructure.scholarship_repo import (
-    list_scholarships,
     get_scholarship,
+    similar_scholarships,
 )
+from ...infrastructure.text_vectorizer import profile_text
 from ...core.scholarship_analysis import analyze_scholarship_priorities
-from ...infrastructure.ai_client import get_claude_client
+from ...core.eligibility import eligible_scholarships
+from ...infrastructure.analysis_cache import get_analysis_cache
+from ...infrastructure.catalog_store import CatalogSnapshot, get_snapshot
+from ...infrastructure.match_cache import get_match_cache, match_cache_key
+from ...infrastructure.search_index import (
+    get_search_index,
+    encode_cursor,
+    decode_cursor,
+)
+from ..catalog_responses import catalog_list_response, catalog_batch_response
+from ..responses import service_unavailable
+from ...core.config import settings
+from ...core.match_ranking import get_match_ranker, student_vector
+from ...infrastructure.ai_client import get_claude_client, MODEL_NAME
+from ...infrastructure.resilience import CircuitOpenError
+from ...infrastructure.prompt_builder import build_request
+from ...infrastructure.json_stream import JsonArrayStreamer
+from ...infrastructure.metrics import JSON_PARSE_FAILURES, MATCH_CACHE_REQUESTS
+from ...infrastructure.structured_log import log_event, log_model_output
+from ...infrastructure.tracing import span
 
 router = APIRouter(
     prefix="/api/scholarships",
@@ -21,14 +48,107 @@ router = APIRouter(
 )
 
 # -------------------------------------------------------------------
-# EXISTING ROUTES (unchanged)
+# CATALOG ROUTES (no AI)
 # -------------------------------------------------------------------
 
 
 @router.get("/", summary="List all scholarships")
-def list_all_scholarships():
-    """Return all scholarships from the local JSON file."""
-    return list_scholarships()
+def list_all_scholarships(
+    request: Request,
+    fields: Optional[str] = Query(None, description="e.g. id,name,deadline"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> Response:
+    """
+    Return scholarships from the local JSON file (all of them by default).
+
+    - ?fields=id,name,deadline projects each record to those fields.
+    - ?limit=N pages the list; the next page's cursor comes back in the
+      X-Next-Cursor header (X-Total-Count has the catalog size).
+
+    Bodies are serialized and compressed once per catalog version and
+    shape, and carry a strong ETag: a matching If-None-Match gets a 304.
+    """
+    return catalog_list_response(request, fields, limit, cursor)
+
+
+@router.get("/batch", summary="Get several scholarships by id")
+def get_scholarships_batch(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated ids, e.g. 1,5,12"),
+    fields: Optional[str] = Query(None, description="e.g. id,name,deadline"),
+) -> Response:
+    """
+    Bulk lookup in one round trip. Returns {"scholarships": [...] in the
+    requested order, "missing_ids": [...]}; same ETag/304 behaviour as /.
+    """
+    return catalog_batch_response(request, ids, fields)
+
+
+class ScholarshipSearchHit(BaseModel):
+    scholarship: Dict
+    score: float
+
+
+class ScholarshipSearchResponse(BaseModel):
+    results: List[ScholarshipSearchHit]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+@router.get(
+    "/search",
+    response_model=ScholarshipSearchResponse,
+    summary="Full-text search over the catalog (BM25, no AI)",
+)
+def search_scholarships(
+    q: str = "",
+    citizenship: Optional[str] = Query(None, description="domestic / international"),
+    category: Optional[str] = Query(None, description="e.g. Financial Need"),
+    offered_by: Optional[str] = Query(None, description="e.g. Victoria College"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """
+    Search name, description, offered_by and category with BM25 ranking
+    over a local inverted index (kept in sync with the catalog).
+
+    Filters are exact (case-insensitive); citizenship matches scholarships
+    open to that residency (including ones open to both). Pass next_cursor
+    back as ?cursor= to get the following page.
+    """
+    index = get_search_index()
+    hits = index.search(
+        q, citizenship=citizenship, category=category, offered_by=offered_by
+    )
+
+    start = 0
+    if cursor:
+        try:
+            after_score, after_position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        after_key = (-after_score, after_position)
+        while start < len(hits) and (
+            -round(hits[start][1], 9),
+            index.position(hits[start][0]),
+        ) <= after_key:
+            start += 1
+
+    page = hits[start : start + limit]
+    next_cursor = None
+    if start + limit < len(hits) and page:
+        last_id, last_score = page[-1]
+        next_cursor = encode_cursor(last_score, index.position(last_id))
+
+    return ScholarshipSearchResponse(
+        results=[
+            ScholarshipSearchHit(scholarship=index.record(doc_id), score=round(score, 4))
+            for doc_id, score in page
+        ],
+        total=len(hits),
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{scholarship_id}", summary="Get one scholarship by id")
@@ -50,17 +170,34 @@ def get_scholarship_by_id(scholarship_id: str):
     "/{scholarship_id}/analysis",
     summary="AI analysis of scholarship priorities",
 )
-async def scholarship_analysis(scholarship_id: str):
+async def scholarship_analysis(scholarship_id: str, refresh: bool = False):
     """
     Use Claude + winner stories to produce a priorities/weights analysis.
     We catch ValueError from the core function and turn it into 404 instead
     of a 500 Internal Server Error.
+
+    Analyses are served from the persistent cache when available;
+    pass ?refresh=true to force a new Claude call.
     """
     try:
-        analysis = await analyze_scholarship_priorities(scholarship_id)
+        analysis = await analyze_scholarship_priorities(
+            scholarship_id, use_cache=not refresh
+        )
         return analysis
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except CircuitOpenError as e:
+        raise service_unavailable(e)
+
+
+@router.delete(
+    "/{scholarship_id}/analysis",
+    summary="Invalidate the cached analysis for a scholarship",
+)
+async def invalidate_scholarship_analysis(scholarship_id: str):
+    """Drop the cached analysis so the next view re-runs Claude."""
+    removed = await get_analysis_cache().ainvalidate(scholarship_id)
+    return {"scholarship_id": scholarship_id, "invalidated": removed}
 
 
 # -------------------------------------------------------------------
@@ -75,6 +212,8 @@ class UserProfileInput(BaseModel):
     year: int
     # e.g. "domestic", "international"
     residency_status: str
+    # "undergraduate" / "graduate"; unknown = not used for eligibility
+    level_of_study: Optional[str] = None
 
     ethnicities: List[str] = []
 
@@ -102,109 +241,63 @@ class ScholarshipMatchResponse(BaseModel):
 
 
 # -------------------------------------------------------------------
-# NEW ROUTE: TOP 5 MATCHES WITH DOMESTIC/INTERNATIONAL FILTER
-# AND "HIDDEN PRIORITY" / WEIGHT PROFILE LOGIC
+# TEXT SIMILARITY (offline TF-IDF, no AI)
 # -------------------------------------------------------------------
 
 
-@router.post("/match", response_model=ScholarshipMatchResponse)
-async def match_scholarships(profile: UserProfileInput) -> ScholarshipMatchResponse:
-    """
-    Given a user's profile, return the TOP 5 most compatible scholarships
-    with a match percentage computed by Claude.
-
-    Algorithm (high level):
-    1. Load all scholarships from local JSON.
-    2. Filter by residency_status (domestic vs international) using a normalized
-       legal_status derived from the scholarship's citizenship field.
-    3. Send ONLY that filtered subset + student profile to Claude.
-    4. In the prompt, ask Claude to:
-       - Infer a hidden "weight profile" (academics, leadership, community, research,
-         financial need, adversity, etc.) for each scholarship, using description and
-         (conceptually) web research on the scholarship page.
-       - Map the student's experiences/awards into the same dimensions.
-       - Compute a match_percentage and a very short reason for each scholarship.
-    5. Parse Claude's JSON, sort by match_percentage, and return the top 5.
-    """
-
-    # 1) Load scholarships from JSON
-    scholarships = list_scholarships()
-
-    if not scholarships:
-        raise HTTPException(
-            status_code=500,
-            detail="No scholarships available.",
-        )
+class SimilarScholarship(BaseModel):
+    scholarship: Dict
+    similarity: float
 
-    # 2) Filter by domestic / international to reduce search space.
-    #    Your JSON uses "citizenship" like "Domestic" or "Domestic;International",
-    #    so we normalize that into a legal_status field here.
-    residency = profile.residency_status.lower()
-    eligible: List[Dict] = []
-
-    for s in scholarships:
-        # Start from any existing legal_status if present
-        legal_raw = (s.get("legal_status") or "").lower().strip()
-        citizenship_raw = (s.get("citizenship") or "").lower()
-
-        if not legal_raw:
-            # Derive from citizenship string
-            has_domestic = "domestic" in citizenship_raw
-            has_international = "international" in citizenship_raw
-
-            if has_domestic and has_international:
-                legal = "both"
-            elif has_international:
-                legal = "international"
-            elif has_domestic:
-                legal = "domestic"
-            else:
-                # If we really can't tell, treat as both so it isn't silently dropped
-                legal = "both"
-        else:
-            legal = legal_raw
 
-        # Build a normalized copy so downstream always has legal_status
-        normalized = {**s, "legal_status": legal}
+class SimilarScholarshipsResponse(BaseModel):
+    results: List[SimilarScholarship]
 
-        if residency == "domestic":
-            if legal in ("domestic", "both"):
-                eligible.append(normalized)
-        else:  # international student
-            if legal in ("international", "both"):
-                eligible.append(normalized)
 
-    # Safety fallback: if filtering removed everything, fall back to all scholarships
-    if not eligible:
-        eligible = [{**s, "legal_status": "both"} for s in scholarships]
+@router.post(
+    "/similar",
+    response_model=SimilarScholarshipsResponse,
+    summary="Scholarships whose text is most similar to a profile (TF-IDF, no AI)",
+)
+def similar_to_profile(
+    profile: UserProfileInput,
+    limit: int = Query(10, ge=1, le=100),
+    eligible_only: bool = True,
+):
+    """
+    Rank the catalog by TF-IDF cosine similarity between the profile's
+    program / experiences / interests / awards / skills and each
+    scholarship's name, category and description. With eligible_only,
+    only scholarships the profile is eligible for (residency, faculty,
+    program, level and year; see core/eligibility.py).
+    Scholarships sharing no terms with the profile are left out.
+    """
+    data = profile.model_dump()
+    # One snapshot for the mask, the index and the records (hot reloads)
+    snapshot = get_snapshot()
+    hits = similar_scholarships(
+        profile_text(data),
+        k=limit,
+        candidate_mask=snapshot.derived("eligibility_rules").mask(data) if eligible_only else None,
+        snapshot=snapshot,
+    )
+    return SimilarScholarshipsResponse(
+        results=[
+            SimilarScholarship(scholarship=scholarship, similarity=similarity)
+            for scholarship, similarity in hits
+        ]
+    )
 
-    # 3) Build compact summaries to send to Claude
-    scholarship_summaries: List[Dict] = []
-    for s in eligible:
-        scholarship_summaries.append(
-            {
-                "id": str(s.get("id")),
-                "title": s.get("title") or s.get("name"),
-                "value": s.get("value"),
-                "deadline": s.get("deadline"),
-                "level_of_study": s.get("level_of_study"),
-                "legal_status": s.get("legal_status"),  # now normalized
-                "description": s.get("description"),
-            }
-        )
 
-    if not scholarship_summaries:
-        raise HTTPException(
-            status_code=500,
-            detail="No eligible scholarships found after filtering.",
-        )
+# -------------------------------------------------------------------
+# SYSTEM PROMPTS
+# -------------------------------------------------------------------
 
-    client = get_claude_client()
 
-    system_prompt = """
+MATCH_SCORING_SYSTEM_PROMPT = """
 You are an assistant that matches scholarships to a student.
 
-You will receive JSON with:
+You will receive JSON (split across several blocks) with:
 - "student_profile": the student's info, experiences, interests, and awards.
 - "scholarships": a list of scholarships with id, title, description, value,
   deadline, level_of_study, and legal_status.
@@ -261,59 +354,186 @@ Include one entry for EVERY scholarship you are given.
 Do not say anything else besides this JSON object.
 """.strip()
 
-    user_payload = {
-        "student_profile": profile.model_dump(),
-        "scholarships": scholarship_summaries,
+
+MATCH_REASONS_SYSTEM_PROMPT = """
+You are an assistant that explains scholarship matches to a student.
+
+You will receive JSON with:
+- "student_profile": the student's info, experiences, interests, and awards.
+- "matches": the student's top scholarships, ALREADY ranked, each with id,
+  title, description, value, deadline, level_of_study, legal_status and
+  match_percentage.
+
+For EACH match, write a "reason": ONE VERY SHORT sentence (max ~15 words)
+explaining in natural language why this scholarship fits this student.
+Ground it in the student's real experiences and the scholarship's description.
+Do NOT change or comment on the ranking or the percentages.
+
+You MUST respond with STRICT JSON in exactly this shape.
+The response MUST:
+- contain ONLY JSON
+- NOT include any explanations, markdown, or code fences
+- start with '{' and end with '}':
+
+{
+  "reasons": [
+    {
+      "scholarship_id": "string",
+      "reason": "short one-sentence explanation"
     }
+  ]
+}
+""".strip()
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=2000,
-            temperature=0.3,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": json.dumps(user_payload),
-                }
-            ],
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error while calling Claude for scholarship matching: {e}",
-        )
 
-    raw_text = message.content[0].text
-    print("RAW CLAUDE OUTPUT (match_scholarships):", raw_text)
+# -------------------------------------------------------------------
+# HELPERS FOR TOP-5 MATCHING
+# -------------------------------------------------------------------
 
+
+def _parse_claude_json(raw_text: str, what: str, site: str) -> Dict:
+    """Strict JSON first, then a fallback using the outermost { ... } slice."""
     try:
-        ai_data = json.loads(raw_text)
+        return json.loads(raw_text)
     except JSONDecodeError:
+        JSON_PARSE_FAILURES.inc(site=site, stage="strict")
         start = raw_text.find("{")
         end = raw_text.rfind("}")
         if start != -1 and end != -1:
             candidate = raw_text[start : end + 1]
             try:
-                ai_data = json.loads(candidate)
+                return json.loads(candidate)
             except JSONDecodeError:
+                JSON_PARSE_FAILURES.inc(site=site, stage="failed")
                 raise HTTPException(
                     status_code=500,
                     detail=(
-                        "Claude returned invalid JSON while computing scholarship "
-                        "matches (candidate parse failed)."
+                        f"Claude returned invalid JSON while computing {what} "
+                        "(candidate parse failed)."
                     ),
                 )
         else:
+            JSON_PARSE_FAILURES.inc(site=site, stage="failed")
             raise HTTPException(
                 status_code=500,
                 detail=(
-                    "Claude returned output without any JSON object while computing "
-                    "scholarship matches."
+                    f"Claude returned output without any JSON object while computing "
+                    f"{what}."
                 ),
             )
 
+
+def _to_match_result(
+    summary: Dict, percentage: float, reason: Optional[str] = None
+) -> ScholarshipMatchResult:
+    return ScholarshipMatchResult(
+        id=summary["id"],
+        title=summary["title"],
+        value=summary["value"],
+        deadline=summary["deadline"],
+        level_of_study=summary["level_of_study"],
+        legal_status=summary["legal_status"],
+        description=summary["description"],
+        match_percentage=percentage,
+        reason=reason,
+    )
+
+
+# Rough sizing for the chunked "claude" mode (~4 characters per token)
+_CHARS_PER_TOKEN = 4
+_MATCH_OUTPUT_TOKENS_BASE = 64
+_MATCH_OUTPUT_TOKENS_PER_SCHOLARSHIP = 48
+
+
+def _estimate_tokens(obj: object) -> int:
+    return len(json.dumps(obj)) // _CHARS_PER_TOKEN + 1
+
+
+def _chunk_summaries(summaries: List[Dict], token_budget: int) -> List[List[Dict]]:
+    """
+    Split scholarship summaries into consecutive chunks whose estimated
+    prompt size stays under token_budget (every chunk has at least one).
+    """
+    chunks: List[List[Dict]] = []
+    current: List[Dict] = []
+    current_tokens = 0
+
+    for summary in summaries:
+        tokens = _estimate_tokens(summary)
+        if current and current_tokens + tokens > token_budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(summary)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _profile_for_claude(profile: UserProfileInput) -> Dict:
+    # The name doesn't affect fit; leaving it out keeps answers (and the
+    # /match cache, which ignores it) free of another student's name
+    return profile.model_dump(exclude={"full_name"})
+
+
+def _scoring_request(profile: UserProfileInput, scholarship_summaries: List[Dict]) -> Dict:
+    # The catalog chunk is identical for every student with the same
+    # eligible set, so it goes before the profile and is cached.
+    return build_request(
+        model=MODEL_NAME,
+        # Sized to the chunk so the JSON answer is never truncated
+        max_tokens=(
+            _MATCH_OUTPUT_TOKENS_BASE
+            + _MATCH_OUTPUT_TOKENS_PER_SCHOLARSHIP * len(scholarship_summaries)
+        ),
+        temperature=0.3,
+        system=MATCH_SCORING_SYSTEM_PROMPT,
+        static=[{"scholarships": scholarship_summaries}],
+        dynamic={"student_profile": _profile_for_claude(profile)},
+    )
+
+
+def _match_from_entry(
+    summary_by_id: Dict[str, Dict], entry: Dict
+) -> Optional[ScholarshipMatchResult]:
+    """One {"scholarship_id", "match_percentage", "reason"} entry -> result (None if unusable)."""
+    if not isinstance(entry, dict) or "match_percentage" not in entry:
+        return None
+    scholarship = summary_by_id.get(str(entry.get("scholarship_id")))
+    if not scholarship:
+        return None
+    try:
+        percentage = float(entry["match_percentage"])
+    except (TypeError, ValueError):
+        return None
+    return _to_match_result(scholarship, percentage, entry.get("reason"))
+
+
+async def _score_with_claude(
+    profile: UserProfileInput,
+    scholarship_summaries: List[Dict],
+) -> List[ScholarshipMatchResult]:
+    """Claude scores every scholarship in ONE prompt (one chunk)."""
+    client = get_claude_client()
+    request = _scoring_request(profile, scholarship_summaries)
+
+    try:
+        with span("claude"):
+            message = await client.create_message(route="match_scoring", **request)
+    except CircuitOpenError as e:
+        raise service_unavailable(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error while calling Claude for scholarship matching: {e}",
+        )
+
+    with span("parse"):
+        raw_text = message.content[0].text
+        log_model_output("match_scoring", raw_text)
+        ai_data = _parse_claude_json(raw_text, "scholarship matches", "match_scoring")
+
     raw_matches = ai_data.get("matches", [])
     if not isinstance(raw_matches, list) or not raw_matches:
         raise HTTPException(
@@ -321,49 +541,447 @@ Do not say anything else besides this JSON object.
             detail="Claude did not return any scholarship matches.",
         )
 
+    # Last entry wins if Claude repeats a scholarship
     scores_by_id: Dict[str, Dict] = {}
     for m in raw_matches:
-        sid = str(m.get("scholarship_id"))
-        if not sid or "match_percentage" not in m:
-            continue
-        scores_by_id[sid] = m
+        if isinstance(m, dict):
+            scores_by_id[str(m.get("scholarship_id"))] = m
 
     summary_by_id: Dict[str, Dict] = {s["id"]: s for s in scholarship_summaries}
-    results: List[ScholarshipMatchResult] = []
+    results = (_match_from_entry(summary_by_id, m) for m in scores_by_id.values())
+    return [r for r in results if r is not None]
 
-    for sid, score_entry in scores_by_id.items():
-        scholarship = summary_by_id.get(sid)
-        if not scholarship:
-            continue
 
-        try:
-            percentage = float(score_entry["match_percentage"])
-        except (TypeError, ValueError):
-            continue
-
-        results.append(
-            ScholarshipMatchResult(
-                id=sid,
-                title=scholarship["title"],
-                value=scholarship["value"],
-                deadline=scholarship["deadline"],
-                level_of_study=scholarship["level_of_study"],
-                legal_status=scholarship["legal_status"],
-                description=scholarship["description"],
-                match_percentage=percentage,
-                reason=score_entry.get("reason"),
-            )
+async def _score_with_claude_chunked(
+    profile: UserProfileInput,
+    scholarship_summaries: List[Dict],
+    k: int = 5,
+) -> List[ScholarshipMatchResult]:
+    """
+    "claude" mode: split the eligible list into token-budgeted chunks, score
+    them in parallel (bounded by MATCH_CHUNK_CONCURRENCY), and merge the
+    partial results into a global top-k with a heap.
+
+    Chunks that fail are skipped; we only raise if every chunk failed.
+    """
+    chunks = _chunk_summaries(scholarship_summaries, settings.match_chunk_input_tokens)
+    semaphore = asyncio.Semaphore(settings.match_chunk_concurrency)
+
+    async def score_chunk(chunk: List[Dict]) -> List[ScholarshipMatchResult]:
+        async with semaphore:
+            return await _score_with_claude(profile, chunk)
+
+    outcomes = await asyncio.gather(
+        *(score_chunk(chunk) for chunk in chunks),
+        return_exceptions=True,
+    )
+
+    partials = [o for o in outcomes if not isinstance(o, BaseException)]
+    if not partials:
+        raise outcomes[0]
+
+    return heapq.nlargest(
+        k,
+        itertools.chain.from_iterable(partials),
+        key=lambda r: r.match_percentage,
+    )
+
+
+def _reasons_request(profile: UserProfileInput, matches: List[ScholarshipMatchResult]) -> Dict:
+    # Both parts are per-student; only the system prompt is cached
+    return build_request(
+        model=MODEL_NAME,
+        max_tokens=400,
+        temperature=0.3,
+        system=MATCH_REASONS_SYSTEM_PROMPT,
+        dynamic={
+            "student_profile": _profile_for_claude(profile),
+            "matches": [m.model_dump(exclude={"reason"}) for m in matches],
+        },
+    )
+
+
+async def _add_claude_reasons(
+    profile: UserProfileInput,
+    matches: List[ScholarshipMatchResult],
+) -> None:
+    """
+    Ask Claude for the one-sentence `reason` of each (already ranked) match.
+    Ranking doesn't depend on this call, so failures leave reason=None
+    instead of failing the whole request.
+    """
+    client = get_claude_client()
+    request = _reasons_request(profile, matches)
+
+    try:
+        with span("claude_reasons"):
+            message = await client.create_message(route="match_reasons", **request)
+        with span("parse_reasons"):
+            raw_text = message.content[0].text
+            log_model_output("match_reasons", raw_text)
+            ai_data = _parse_claude_json(raw_text, "match reasons", "match_reasons")
+    except Exception as e:
+        log_event("match_reasons_failed", logging.WARNING, error=str(e))
+        return
+
+    reasons = ai_data.get("reasons", [])
+    if not isinstance(reasons, list):
+        return
+
+    reason_by_id = {
+        str(r.get("scholarship_id")): r.get("reason")
+        for r in reasons
+        if isinstance(r, dict)
+    }
+    for m in matches:
+        m.reason = reason_by_id.get(m.id)
+
+
+# -------------------------------------------------------------------
+# NEW ROUTE: TOP 5 MATCHES WITH DOMESTIC/INTERNATIONAL FILTER
+# AND "HIDDEN PRIORITY" / WEIGHT PROFILE LOGIC
+# -------------------------------------------------------------------
+
+
+def _text_candidates(
+    profile: UserProfileInput,
+    eligible: List[Dict],
+    eligible_mask: Optional[np.ndarray],
+    pool: int,
+    snapshot: CatalogSnapshot,
+) -> List[Dict]:
+    """
+    The `pool` eligible scholarships most similar to the profile's text, in
+    catalog order. If fewer than `pool` share any terms with the profile,
+    the rest of the pool is filled with other eligible ones (catalog order),
+    so sparse profiles still get a full ranking.
+    """
+    hits = similar_scholarships(
+        profile_text(profile.model_dump()),
+        k=pool,
+        candidate_mask=eligible_mask,
+        snapshot=snapshot,
+    )
+    wanted = {str(s.get("id")) for s, _ in hits}
+    chosen = [s for s in eligible if str(s.get("id")) in wanted]
+    if len(chosen) < pool:
+        rest = (s for s in eligible if str(s.get("id")) not in wanted)
+        chosen.extend(itertools.islice(rest, pool - len(chosen)))
+    return chosen
+
+
+def _eligible_summaries(profile: UserProfileInput, snapshot: CatalogSnapshot) -> List[Dict]:
+    """
+    Steps 1-3 of match_scholarships: the compact summaries to rank, all
+    from `snapshot` (so a hot reload mid-request can't mix catalog versions).
+    """
+    # 1) Load scholarships from JSON
+    with span("catalog"):
+        scholarships = snapshot.derived("scholarship_catalog").scholarships
+
+    if not scholarships:
+        raise HTTPException(
+            status_code=500,
+            detail="No scholarships available.",
         )
 
-    if not results:
+    # 2) Filter to scholarships the student can actually win: residency
+    #    (from "citizenship" like "Domestic;International"), faculty, program,
+    #    level and year of study. The rule engine compiles every scholarship's
+    #    constraints into boolean columns once per catalog load, so this is a
+    #    few vectorized ANDs.
+    with span("filter"):
+        eligible, eligible_mask = eligible_scholarships(profile.model_dump(), snapshot)
+
+    # Safety fallback: if filtering removed everything, fall back to all
+    # scholarships (reported as legal_status "both", without copying them)
+    legal_override = None
+    if not eligible:
+        eligible = scholarships
+        eligible_mask = None
+        legal_override = "both"
+
+    # 2b) Large catalogs: only rank the scholarships whose text is most
+    #     similar to the profile (offline TF-IDF candidate generation)
+    pool = settings.match_candidate_pool
+    if pool and len(eligible) > pool:
+        with span("candidates"):
+            eligible = _text_candidates(profile, eligible, eligible_mask, pool, snapshot)
+
+    # 3) Build compact summaries (used for the response and for Claude)
+    with span("payload"):
+        scholarship_summaries: List[Dict] = [
+            {
+                "id": str(s.get("id")),
+                "title": s.get("title") or s.get("name"),
+                "value": s.get("value"),
+                "deadline": s.get("deadline"),
+                "level_of_study": s.get("level_of_study"),
+                "legal_status": legal_override or s.get("legal_status"),  # now normalized
+                "description": s.get("description"),
+            }
+            for s in eligible
+        ]
+
+    if not scholarship_summaries:
         raise HTTPException(
             status_code=500,
-            detail=(
-                "No valid scholarship matches could be built from Claude output."
-            ),
+            detail="No eligible scholarships found after filtering.",
         )
 
-    results.sort(key=lambda r: r.match_percentage, reverse=True)
-    top_five = results[:5]
+    return scholarship_summaries
+
+
+def _rank_locally(
+    profile: UserProfileInput, scholarship_summaries: List[Dict], k: int = 5
+) -> List[ScholarshipMatchResult]:
+    """Top-k by the NumPy MatchRanker ("local" mode); reasons are left empty."""
+    summary_by_id: Dict[str, Dict] = {s["id"]: s for s in scholarship_summaries}
+    with span("rank"):
+        ranked = get_match_ranker().top_k(
+            student_vector(profile.model_dump()),
+            k=k,
+            candidate_ids=summary_by_id.keys(),
+        )
+    return [_to_match_result(summary_by_id[sid], percentage) for sid, percentage in ranked]
+
+
+@router.post("/match", response_model=ScholarshipMatchResponse)
+async def match_scholarships(profile: UserProfileInput) -> ScholarshipMatchResponse:
+    """
+    Given a user's profile, return the TOP 5 most compatible scholarships
+    with a match percentage.
+
+    Algorithm (high level):
+    1. Load all scholarships from local JSON.
+    2. Filter out scholarships the student can't win (residency, faculty,
+       program, level and year of study) with the compiled eligibility rules
+       (core/eligibility.py; legal_status is derived from the scholarship's
+       citizenship field at load time).
+       On catalogs larger than MATCH_CANDIDATE_POOL, keep only the eligible
+       scholarships whose text is most similar to the profile (TF-IDF).
+    3. Rank the filtered subset against the student:
+       - "local" mode (default): the MatchRanker holds a weight vector over the
+         six priority dimensions for every scholarship, derives the same kind
+         of vector for the student, and scores all of them with one matrix
+         product. Claude is only asked to write the short `reason` for the
+         final top 5.
+       - "claude" mode: split the filtered subset into token-budgeted chunks
+         and send them (+ student profile) to Claude in parallel; Claude
+         infers both weight profiles and a match_percentage + reason for
+         every scholarship, and the chunk results are merged into a top 5.
+    4. Sort by match_percentage and return the top 5.
+
+    Results are cached per normalized profile + catalog + eligible set
+    (see infrastructure/match_cache.py); expired entries are served stale
+    while a background refresh recomputes them.
+    """
+
+    snapshot = get_snapshot()
+    scholarship_summaries = _eligible_summaries(profile, snapshot)
+
+    # Repeat submissions of the same profile (back button, refresh, a typo
+    # fix in the name) are answered from the match cache
+    cache = get_match_cache()
+    if not cache.enabled:
+        return await _build_match_response(profile, scholarship_summaries)
+
+    with span("match_cache"):
+        key = match_cache_key(
+            profile.model_dump(),
+            snapshot.content_hash,
+            (s["id"] for s in scholarship_summaries),
+            settings.match_ranking_mode,
+        )
+        cached = cache.get(key)
+
+    if cached is not None:
+        response, fresh = cached
+        MATCH_CACHE_REQUESTS.inc(result="hit" if fresh else "stale")
+        if not fresh:
+            cache.revalidate(
+                key, lambda: _cacheable_match_response(profile, scholarship_summaries)
+            )
+        return response
+
+    MATCH_CACHE_REQUESTS.inc(result="miss")
+    response = await _build_match_response(profile, scholarship_summaries)
+    entry = _cache_entry(response)
+    if entry is not None:
+        cache.set(key, *entry)
+    return response
+
+
+async def _build_match_response(
+    profile: UserProfileInput, scholarship_summaries: List[Dict]
+) -> ScholarshipMatchResponse:
+    """Step 4 of match_scholarships: rank and build the top-5 response."""
+    if settings.match_ranking_mode == "claude":
+        top_five = await _score_with_claude_chunked(profile, scholarship_summaries, k=5)
+    else:
+        top_five = _rank_locally(profile, scholarship_summaries, k=5)
+        if top_five:
+            await _add_claude_reasons(profile, top_five)
+
+    if not top_five:
+        raise HTTPException(
+            status_code=500,
+            detail="No valid scholarship matches could be built.",
+        )
 
     return ScholarshipMatchResponse(matches=top_five)
+
+
+def _cache_entry(
+    response: ScholarshipMatchResponse,
+) -> Optional[Tuple[ScholarshipMatchResponse, int]]:
+    """(response, approximate size) to cache, or None for a degraded answer."""
+    # "local" mode returns reason=None everywhere when the reasons call
+    # failed; don't pin that for the whole TTL
+    if not any(m.reason for m in response.matches):
+        return None
+    return response, len(response.model_dump_json())
+
+
+async def _cacheable_match_response(
+    profile: UserProfileInput, scholarship_summaries: List[Dict]
+) -> Optional[Tuple[ScholarshipMatchResponse, int]]:
+    return _cache_entry(await _build_match_response(profile, scholarship_summaries))
+
+
+# ---------- Route: match (streaming) ----------
+
+
+def _ndjson(event: str, **data: object) -> str:
+    """Format one NDJSON line."""
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+async def _stream_entries(request: Dict, key: str, route: str) -> AsyncIterator[Dict]:
+    """Yield each object of the `key` array in Claude's answer as soon as it closes."""
+    parser = JsonArrayStreamer(key)
+    async for text in get_claude_client().stream_text(route=route, **request):
+        for entry in parser.feed(text):
+            yield entry
+
+
+async def _stream_claude_matches(
+    profile: UserProfileInput,
+    scholarship_summaries: List[Dict],
+    k: int = 5,
+) -> AsyncIterator[str]:
+    """
+    "claude" mode: stream every chunk in parallel and forward each scored
+    scholarship the moment its JSON object closes, whichever chunk it is in.
+    """
+    summary_by_id: Dict[str, Dict] = {s["id"]: s for s in scholarship_summaries}
+    chunks = _chunk_summaries(scholarship_summaries, settings.match_chunk_input_tokens)
+    semaphore = asyncio.Semaphore(settings.match_chunk_concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def score_chunk(chunk: List[Dict]) -> None:
+        try:
+            async with semaphore:
+                request = _scoring_request(profile, chunk)
+                async for entry in _stream_entries(request, "matches", "match_scoring_stream"):
+                    result = _match_from_entry(summary_by_id, entry)
+                    if result is not None:
+                        await queue.put(result)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(None)  # this chunk is finished
+
+    tasks = [asyncio.create_task(score_chunk(chunk)) for chunk in chunks]
+    results: Dict[str, ScholarshipMatchResult] = {}
+    errors: List[Exception] = []
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is None:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                errors.append(item)
+            else:
+                results[item.id] = item  # last entry wins, as in /match
+                yield _ndjson("match", match=item.model_dump())
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if not results:
+        detail = (
+            f"Error while calling Claude for scholarship matching: {errors[0]}"
+            if errors
+            else "No valid scholarship matches could be built."
+        )
+        yield _ndjson("error", detail=detail)
+        return
+
+    top = heapq.nlargest(k, results.values(), key=lambda r: r.match_percentage)
+    yield _ndjson("done", matches=[m.model_dump() for m in top])
+
+
+async def _stream_local_matches(
+    profile: UserProfileInput,
+    scholarship_summaries: List[Dict],
+    k: int = 5,
+) -> AsyncIterator[str]:
+    """
+    "local" mode: the ranking needs no model call, so the top-k go out
+    immediately; each reason follows as soon as Claude has written it.
+    """
+    top = _rank_locally(profile, scholarship_summaries, k=k)
+    if not top:
+        yield _ndjson("error", detail="No valid scholarship matches could be built.")
+        return
+
+    for m in top:
+        yield _ndjson("match", match=m.model_dump())
+
+    by_id = {m.id: m for m in top}
+    try:
+        async for entry in _stream_entries(
+            _reasons_request(profile, top), "reasons", "match_reasons_stream"
+        ):
+            m = by_id.get(str(entry.get("scholarship_id")))
+            if m is not None and m.reason is None:
+                m.reason = entry.get("reason")
+                yield _ndjson("reason", scholarship_id=m.id, reason=m.reason)
+    except Exception as e:
+        # Ranking doesn't depend on the reasons, same as /match
+        log_event("match_reasons_stream_failed", logging.WARNING, error=str(e))
+
+    yield _ndjson("done", matches=[m.model_dump() for m in top])
+
+
+@router.post("/match/stream")
+async def match_scholarships_stream(profile: UserProfileInput) -> StreamingResponse:
+    """
+    Same ranking as /match, streamed as NDJSON (one JSON object per line)
+    while Claude is still writing, so the UI can render matches early.
+
+    Lines:
+      - {"event": "match", "match": {...}}    one scored scholarship, as soon as
+        it is known ("claude" mode: every eligible one, unordered; "local"
+        mode: the top 5 right away, without reasons)
+      - {"event": "reason", "scholarship_id": "...", "reason": "..."}
+        ("local" mode only) the reason for one of the top 5
+      - {"event": "done", "matches": [...]}   the final ranked top 5
+      - {"event": "error", "detail": "..."}   nothing usable came back
+
+    Input errors are still returned as normal HTTP errors before the stream starts.
+    """
+    scholarship_summaries = _eligible_summaries(profile, get_snapshot())
+
+    if settings.match_ranking_mode == "claude":
+        lines = _stream_claude_matches(profile, scholarship_summaries, k=5)
+    else:
+        lines = _stream_local_matches(profile, scholarship_summaries, k=5)
+
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
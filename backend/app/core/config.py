@@ -2,11 +2,16 @@
 
 from dataclasses import dataclass
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load .env file once when config is imported
 load_dotenv()
 
+# backend/ directory (local caches live under backend/.cache)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+CACHE_DIR = BACKEND_DIR / ".cache"
+
 @dataclass
 class Settings:
     backend_env: str
@@ -14,6 +19,74 @@ class Settings:
     supabase_service_role_key: str | None
     anthropic_api_key: str | None
 
+    # Override the Anthropic API endpoint (e.g. a local fake server in dev/bench)
+    anthropic_base_url: str | None = None
+
+    # Claude client tuning (shared connection pool + concurrency limit)
+    claude_max_concurrency: int = 32
+    claude_max_connections: int = 64
+    claude_max_keepalive_connections: int = 32
+    claude_timeout_seconds: float = 120.0
+
+    # Claude resilience: default retries per call, circuit breaker cooldown,
+    # per-route overrides as JSON (see infrastructure/resilience.py)
+    claude_max_retries: int = 2
+    claude_breaker_cooldown_seconds: float = 30.0
+    claude_policies: str | None = None
+
+    # Persistent scholarship analysis cache (SQLite, shared by all workers)
+    analysis_cache_path: str = str(CACHE_DIR / "analysis_cache.sqlite3")
+    analysis_cache_ttl_seconds: float = 7 * 24 * 3600
+
+    # "local": rank with the NumPy engine, Claude only writes top-5 reasons
+    # "claude": let Claude score every eligible scholarship
+    match_ranking_mode: str = "local"
+
+    # Poll the catalog source for changes every N seconds (0 = never reload)
+    catalog_reload_interval_seconds: float = 2.0
+
+    # Compiled, memory-mapped copy of scholarships.json shared by all workers
+    # (rebuilt automatically when the JSON changes; empty = parse JSON directly)
+    catalog_binary_path: str | None = str(CACHE_DIR / "catalog.bin")
+
+    # Where scholarships, success stories and analyses live:
+    # "json" (data/*.json + the SQLite analysis cache) or "postgres"
+    catalog_backend: str = "json"
+    # Postgres DSN for the "postgres" backend (e.g. Supabase's connection string)
+    database_url: str | None = None
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_command_timeout_seconds: float = 10.0
+
+    # /api/essays/generate num_variants: max drafts per request, parallel calls
+    essay_max_variants: int = 5
+    essay_variant_concurrency: int = 4
+
+    # "claude" mode: token budget per scoring chunk and parallel chunk calls
+    match_chunk_input_tokens: int = 3000
+    match_chunk_concurrency: int = 4
+
+    # Rank at most N eligible scholarships per /match, pre-selected by TF-IDF
+    # text similarity to the profile (0 = rank every eligible scholarship)
+    match_candidate_pool: int = 500
+
+    # /match result cache keyed by the normalized profile (0 entries = off);
+    # stale entries are served while a refresh runs in the background
+    match_cache_max_entries: int = 2000
+    match_cache_max_bytes: int = 32 * 1024 * 1024
+    match_cache_ttl_seconds: float = 600.0
+    match_cache_stale_seconds: float = 3600.0
+
+    # Per-stage request timing: Server-Timing header, optional JSONL export
+    server_timing_enabled: bool = True
+    trace_export_path: str | None = None
+    trace_sample_rate: float = 1.0
+
+    # Structured logging; raw Claude output is sampled and truncated
+    log_level: str = "info"
+    log_model_output_sample_rate: float = 0.05
+    log_model_output_max_chars: int = 2000
+
     @property
     def is_production(self) -> bool:
         return self.backend_env == "prod"
@@ -24,6 +97,56 @@ def get_settings() -> Settings:
         supabase_url=os.getenv("SUPABASE_URL"),
         supabase_service_role_key=os.getenv("SUPABASE_SERVICE_ROLE_KEY"),
         anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+        anthropic_base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+        claude_max_concurrency=int(os.getenv("CLAUDE_MAX_CONCURRENCY", "32")),
+        claude_max_connections=int(os.getenv("CLAUDE_MAX_CONNECTIONS", "64")),
+        claude_max_keepalive_connections=int(
+            os.getenv("CLAUDE_MAX_KEEPALIVE_CONNECTIONS", "32")
+        ),
+        claude_timeout_seconds=float(os.getenv("CLAUDE_TIMEOUT_SECONDS", "120")),
+        claude_max_retries=int(os.getenv("CLAUDE_MAX_RETRIES", "2")),
+        claude_breaker_cooldown_seconds=float(
+            os.getenv("CLAUDE_BREAKER_COOLDOWN_SECONDS", "30")
+        ),
+        claude_policies=os.getenv("CLAUDE_POLICIES") or None,
+        analysis_cache_path=os.getenv(
+            "ANALYSIS_CACHE_PATH", str(CACHE_DIR / "analysis_cache.sqlite3")
+        ),
+        analysis_cache_ttl_seconds=float(
+            os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+        ),
+        match_ranking_mode=os.getenv("MATCH_RANKING_MODE", "local").lower(),
+        catalog_reload_interval_seconds=float(
+            os.getenv("CATALOG_RELOAD_INTERVAL_SECONDS", "2")
+        ),
+        catalog_binary_path=os.getenv(
+            "CATALOG_BINARY_PATH", str(CACHE_DIR / "catalog.bin")
+        ) or None,
+        catalog_backend=os.getenv("CATALOG_BACKEND", "json").lower(),
+        database_url=os.getenv("DATABASE_URL") or None,
+        db_pool_min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+        db_pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        db_command_timeout_seconds=float(os.getenv("DB_COMMAND_TIMEOUT_SECONDS", "10")),
+        essay_max_variants=int(os.getenv("ESSAY_MAX_VARIANTS", "5")),
+        essay_variant_concurrency=int(os.getenv("ESSAY_VARIANT_CONCURRENCY", "4")),
+        match_chunk_input_tokens=int(os.getenv("MATCH_CHUNK_INPUT_TOKENS", "3000")),
+        match_chunk_concurrency=int(os.getenv("MATCH_CHUNK_CONCURRENCY", "4")),
+        match_candidate_pool=int(os.getenv("MATCH_CANDIDATE_POOL", "500")),
+        match_cache_max_entries=int(os.getenv("MATCH_CACHE_MAX_ENTRIES", "2000")),
+        match_cache_max_bytes=int(
+            os.getenv("MATCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+        ),
+        match_cache_ttl_seconds=float(os.getenv("MATCH_CACHE_TTL_SECONDS", "600")),
+        match_cache_stale_seconds=float(os.getenv("MATCH_CACHE_STALE_SECONDS", "3600")),
+        server_timing_enabled=os.getenv("SERVER_TIMING", "true").lower()
+        in ("1", "true", "yes"),
+        trace_export_path=os.getenv("TRACE_EXPORT_PATH") or None,
+        trace_sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1")),
+        log_level=os.getenv("LOG_LEVEL", "info"),
+        log_model_output_sample_rate=float(
+            os.getenv("LOG_MODEL_OUTPUT_SAMPLE_RATE", "0.05")
+        ),
+        log_model_output_max_chars=int(os.getenv("LOG_MODEL_OUTPUT_MAX_CHARS", "2000")),
     )
 
 # 👇 This gives us global `settings` everywhere we import config
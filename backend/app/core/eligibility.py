@@ -0,0 +1,262 @@
+# backend/app/core/eligibility.py
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..infrastructure.catalog_store import CatalogSnapshot, get_snapshot, register_derived
+from ..infrastructure.scholarship_repo import normalize_legal_status
+
+# Eligibility rule engine.
+#
+# Every scholarship's constraints (residency, faculty, program, level of
+# study, year of study) are compiled once per catalog snapshot into
+# boolean NumPy columns (one bool per catalog row) and a year-of-study
+# bitset, so filtering a student is a handful of vectorized ANDs.
+#
+# Constraints come from an explicit "eligibility" object on the record
+# when the catalog has one, e.g.
+#   {"faculties": ["medicine"], "programs": ["nursing"],
+#    "levels": ["undergraduate"], "years": [3, 4]}
+# and otherwise are inferred conservatively from offered_by and the
+# description. Sentences about preferences ("preference will be given
+# to ...") never restrict, and an attribute we can't tell about (on
+# either side) never excludes anyone.
+
+LEVELS: Tuple[str, ...] = ("undergraduate", "graduate")
+
+# Years of study 1..MAX_YEAR; later years count as MAX_YEAR
+MAX_YEAR = 6
+_ALL_YEARS = sum(1 << y for y in range(1, MAX_YEAR + 1))
+
+_ORDINALS = {"first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5}
+
+# Faculties / divisions. A student's faculty is the first one their
+# program names (professional faculties before Arts & Science); a program
+# that names none isn't filtered by faculty.
+FACULTY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "medicine": ("medicine", "medical"),
+    "nursing": ("nursing",),
+    "engineering": ("engineering", "applied science"),
+    "music": ("music",),
+    "law": ("law",),
+    "dentistry": ("dentistry", "dental"),
+    "pharmacy": ("pharmacy",),
+    "kinesiology": ("kinesiology", "physical education"),
+    "architecture": ("architecture",),
+    "arts_science": ("arts and science", "arts & science"),
+}
+
+# Program families a scholarship can be limited to
+PROGRAM_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "medicine": ("medicine", "medical"),
+    "nursing": ("nursing",),
+    "chemistry": ("chemistry",),
+    "english": ("english",),
+    "commerce": ("commerce", "business", "rotman"),
+    "economics": ("economics",),
+    "computer_science": ("computer science",),
+    "engineering": ("engineering",),
+    "music": ("music",),
+    "law": ("law",),
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_PREFERENCE = re.compile(r"\bprefer", re.IGNORECASE)
+_FACULTY_PHRASE = re.compile(r"\bFaculty of ([A-Z][\w&]*(?:(?: and | & | )[A-Z][\w&]*)*)")
+_PROGRAM_PHRASE = re.compile(
+    r"\b(?:Department of|enrolled in(?: the)?|registered in(?: the)?)\s+"
+    r"([A-Z][\w&]*(?:\s+[A-Z][\w&]*)*)"
+    r"|\b([A-Z][\w&]*(?:\s+[A-Z][\w&]*)*) students?\b"
+)
+_YEAR_PHRASE = re.compile(
+    r"\b((?:first|second|third|fourth|fifth)"
+    r"(?:\s*(?:,|or|and|to)\s*(?:first|second|third|fourth|fifth))*)[- ]year\b",
+    re.IGNORECASE,
+)
+_UNDERGRAD = re.compile(r"\bundergraduate\b", re.IGNORECASE)
+_GRAD = re.compile(
+    r"\b(?<!under)graduate (?:students?|degrees?|studies|programs?)\b", re.IGNORECASE
+)
+
+
+def _families(text: str, table: Dict[str, Tuple[str, ...]]) -> FrozenSet[str]:
+    text = text.lower()
+    return frozenset(
+        family
+        for family, words in table.items()
+        if any(re.search(rf"\b{re.escape(w)}\b", text) for w in words)
+    )
+
+
+@dataclass(frozen=True)
+class Constraints:
+    """One scholarship's restrictions; None = unrestricted on that attribute."""
+    faculties: Optional[FrozenSet[str]] = None
+    programs: Optional[FrozenSet[str]] = None
+    levels: Optional[FrozenSet[str]] = None
+    years: Optional[FrozenSet[int]] = None
+
+
+def _explicit_constraints(rules: Dict[str, Any]) -> Constraints:
+    def values(key: str) -> Optional[FrozenSet[str]]:
+        items = rules.get(key)
+        if not items:
+            return None
+        return frozenset(str(v).strip().lower() for v in items)
+
+    years = rules.get("years")
+    return Constraints(
+        faculties=values("faculties"),
+        programs=values("programs"),
+        levels=values("levels"),
+        years=frozenset(min(int(y), MAX_YEAR) for y in years) if years else None,
+    )
+
+
+def infer_constraints(scholarship: Dict[str, Any]) -> Constraints:
+    """Constraints of one catalog record (explicit "eligibility" wins over inference)."""
+    explicit = scholarship.get("eligibility")
+    if isinstance(explicit, dict):
+        return _explicit_constraints(explicit)
+
+    faculties = set()
+    programs = set()
+    levels = set()
+    years = set()
+
+    offered_by = scholarship.get("offered_by") or ""
+    if "faculty" in offered_by.lower():
+        faculties |= _families(offered_by, FACULTY_KEYWORDS)
+
+    level_field = (scholarship.get("level_of_study") or "").lower()
+    for level in LEVELS:
+        if re.search(rf"\b{level}\b", level_field):
+            levels.add(level)
+
+    description = scholarship.get("description") or ""
+    for sentence in _SENTENCE_SPLIT.split(description):
+        if _PREFERENCE.search(sentence):
+            continue
+        for phrase in _FACULTY_PHRASE.findall(sentence):
+            faculties |= _families(f"faculty of {phrase}", FACULTY_KEYWORDS)
+        for named, before_student in _PROGRAM_PHRASE.findall(sentence):
+            programs |= _families(named or before_student, PROGRAM_KEYWORDS)
+        for phrase in _YEAR_PHRASE.findall(sentence):
+            years |= {n for word, n in _ORDINALS.items() if word in phrase.lower()}
+        if not level_field:
+            if _UNDERGRAD.search(sentence):
+                levels.add("undergraduate")
+            if _GRAD.search(sentence):
+                levels.add("graduate")
+
+    return Constraints(
+        faculties=frozenset(faculties) or None,
+        programs=frozenset(programs) or None,
+        # Open to every level = no constraint
+        levels=frozenset(levels) if levels and len(levels) < len(LEVELS) else None,
+        years=frozenset(years) or None,
+    )
+
+
+def student_faculty(program: str) -> Optional[str]:
+    """The faculty `program` names, or None if we can't tell."""
+    named = _families(program, FACULTY_KEYWORDS)
+    for faculty in FACULTY_KEYWORDS:  # table order decides ties
+        if faculty in named:
+            return faculty
+    return None
+
+
+class EligibilityRules:
+    """
+    Compiled constraints for the whole catalog, in catalog row order.
+
+    - residency[r]: bool column, open to students with residency r
+    - faculty[f]:   bool column, open to students in faculty f
+    - level[l]:     bool column, open to students at level l
+    - program_free: bool column, no program restriction
+    - program[p]:   bool column, restricted to programs that include family p
+    - year_bits:    uint16 bitset per row, bit y set if year y may apply
+    """
+
+    def __init__(self, scholarships: Iterable[Dict[str, Any]]):
+        scholarships = list(scholarships)
+        self.constraints: List[Constraints] = [infer_constraints(s) for s in scholarships]
+        n = len(scholarships)
+
+        legal = [normalize_legal_status(s) for s in scholarships]
+        self.residency: Dict[str, np.ndarray] = {
+            r: np.array([status in (r, "both") for status in legal], dtype=bool)
+            for r in ("domestic", "international")
+        }
+
+        def column(allowed) -> np.ndarray:
+            return np.fromiter((allowed(c) for c in self.constraints), dtype=bool, count=n)
+
+        self.faculty: Dict[str, np.ndarray] = {
+            f: column(lambda c, f=f: c.faculties is None or f in c.faculties)
+            for f in FACULTY_KEYWORDS
+        }
+        self.level: Dict[str, np.ndarray] = {
+            l: column(lambda c, l=l: c.levels is None or l in c.levels) for l in LEVELS
+        }
+        self.program_free = column(lambda c: c.programs is None)
+        self.program: Dict[str, np.ndarray] = {
+            p: column(lambda c, p=p: c.programs is not None and p in c.programs)
+            for p in PROGRAM_KEYWORDS
+        }
+        self.year_bits = np.fromiter(
+            (
+                sum(1 << y for y in c.years) if c.years else _ALL_YEARS
+                for c in self.constraints
+            ),
+            dtype=np.uint16,
+            count=n,
+        )
+
+    def mask(self, profile: Dict[str, Any]) -> np.ndarray:
+        """Bool per catalog row: can this student (a UserProfileInput dict) apply?"""
+        residency = (profile.get("residency_status") or "").lower()
+        mask = self.residency["domestic" if residency == "domestic" else "international"].copy()
+
+        program = profile.get("program") or ""
+        faculty = student_faculty(program)
+        if faculty is not None:
+            mask &= self.faculty[faculty]
+
+        allowed_programs = self.program_free.copy()
+        for family in _families(program, PROGRAM_KEYWORDS):
+            allowed_programs |= self.program[family]
+        mask &= allowed_programs
+
+        level = (profile.get("level_of_study") or "").lower()
+        if level in self.level:
+            mask &= self.level[level]
+
+        year = profile.get("year")
+        if isinstance(year, int) and year >= 1:
+            mask &= (self.year_bits & (1 << min(year, MAX_YEAR))) != 0
+
+        return mask
+
+
+register_derived("eligibility_rules", lambda snap: EligibilityRules(snap.scholarships))
+
+
+def eligible_scholarships(
+    profile: Dict[str, Any], snapshot: Optional[CatalogSnapshot] = None
+) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """
+    (records the student can apply to, with legal_status normalized, in
+    catalog order; the bool mask over catalog rows), from one snapshot
+    (the live one unless given).
+    """
+    snapshot = snapshot or get_snapshot()
+    mask = snapshot.derived("eligibility_rules").mask(profile)
+    normalized = snapshot.derived("scholarship_catalog").normalized
+    return [normalized[i] for i in np.flatnonzero(mask)], mask
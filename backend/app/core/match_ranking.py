@@ -0,0 +1,191 @@
+# backend/app/core/match_ranking.py
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import re
+
+import numpy as np
+
+from ..infrastructure.catalog_store import get_snapshot, register_derived
+
+
+# The six "hidden priority" dimensions used across the app (same set the
+# matching and analysis prompts ask Claude to reason about).
+DIMENSIONS: Tuple[str, ...] = (
+    "academic_excellence",
+    "leadership",
+    "community_service",
+    "research_potential",
+    "financial_need",
+    "adversity_or_resilience",
+)
+_DIM_INDEX = {name: i for i, name in enumerate(DIMENSIONS)}
+
+
+# Catalog "category" labels -> dimension weights
+_CATEGORY_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "academic merit": {"academic_excellence": 1.0, "research_potential": 0.2},
+    "financial need": {"financial_need": 1.0, "adversity_or_resilience": 0.3},
+    "leadership": {"leadership": 1.0, "community_service": 0.2},
+    "community": {"community_service": 1.0, "leadership": 0.2},
+    "extra curriculars": {"leadership": 0.4, "community_service": 0.4},
+    "athletic performance": {"leadership": 0.3, "adversity_or_resilience": 0.2},
+}
+
+# Phrases that signal each dimension, in scholarship descriptions and in
+# student profiles alike.
+_DIMENSION_KEYWORDS: Dict[str, Sequence[str]] = {
+    "academic_excellence": (
+        "academic", "academics", "gpa", "grades", "standing", "merit",
+        "dean's list", "honours", "honors", "excellence", "top of",
+        "average", "achievement", "olympiad", "competition",
+    ),
+    "leadership": (
+        "leader", "leadership", "president", "captain", "founded", "founder",
+        "organized", "organised", "led", "executive", "student affairs",
+        "student life", "mentor", "coordinator", "club",
+    ),
+    "community_service": (
+        "community", "volunteer", "volunteered", "volunteering", "service",
+        "outreach", "non-profit", "nonprofit", "charity", "advocacy",
+        "tutoring", "tutor", "fundraising",
+    ),
+    "research_potential": (
+        "research", "researcher", "lab", "laboratory", "thesis", "publication",
+        "published", "investigation", "science fair", "project", "innovation",
+    ),
+    "financial_need": (
+        "financial need", "financial assistance", "bursary", "in need",
+        "low-income", "low income", "financial aid", "osap", "part-time job",
+        "work to support", "first-generation", "first generation",
+    ),
+    "adversity_or_resilience": (
+        "adversity", "resilience", "resilient", "overcame", "overcome",
+        "hardship", "challenge", "challenges", "barrier", "barriers",
+        "refugee", "immigrant", "disability", "perseverance", "struggle",
+    ),
+}
+
+_DIMENSION_PATTERNS = {
+    dim: re.compile(
+        r"\b(?:" + "|".join(re.escape(k) for k in sorted(words, key=len, reverse=True)) + r")\b",
+        re.IGNORECASE,
+    )
+    for dim, words in _DIMENSION_KEYWORDS.items()
+}
+
+
+def _keyword_counts(text: str) -> np.ndarray:
+    vec = np.zeros(len(DIMENSIONS), dtype=np.float32)
+    if not text:
+        return vec
+    for dim, pattern in _DIMENSION_PATTERNS.items():
+        vec[_DIM_INDEX[dim]] = len(pattern.findall(text))
+    return vec
+
+
+def _l2_normalize(vec: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0:
+        # No signal at all -> treat every dimension as equally important
+        return np.full(len(DIMENSIONS), 1.0 / np.sqrt(len(DIMENSIONS)), dtype=np.float32)
+    return (vec / norm).astype(np.float32)
+
+
+def scholarship_vector(scholarship: Dict[str, Any]) -> np.ndarray:
+    """
+    Weight profile for one scholarship over DIMENSIONS.
+
+    The catalog "category" labels give the strong signal; keyword hits in
+    the description add a softer, capped contribution on top.
+    """
+    vec = np.zeros(len(DIMENSIONS), dtype=np.float32)
+
+    categories = re.split(r"[;,]", scholarship.get("category") or "")
+    for label in categories:
+        for dim, w in _CATEGORY_WEIGHTS.get(label.strip().lower(), {}).items():
+            vec[_DIM_INDEX[dim]] += w
+
+    description = scholarship.get("description") or ""
+    vec += 0.25 * np.minimum(_keyword_counts(description), 3.0)
+
+    return _l2_normalize(vec)
+
+
+def student_vector(profile: Dict[str, Any]) -> np.ndarray:
+    """
+    Weight profile for a student over DIMENSIONS, derived from their
+    program, experiences, interests, awards and skills.
+    Each awards entry also counts as a bit of academic signal.
+    """
+    parts: List[str] = [profile.get("program") or ""]
+    for field in ("experiences", "interests", "awards", "skills"):
+        parts.extend(profile.get(field) or [])
+
+    vec = _keyword_counts("\n".join(parts))
+    vec[_DIM_INDEX["academic_excellence"]] += 0.5 * len(profile.get("awards") or [])
+    # Dampen long profiles so one dimension can't completely dominate
+    vec = np.sqrt(vec)
+
+    return _l2_normalize(vec)
+
+
+class MatchRanker:
+    """
+    Local ranking engine over the whole catalog.
+
+    Holds an (n_scholarships x len(DIMENSIONS)) matrix of L2-normalized
+    scholarship weight vectors, so scoring a student against every
+    scholarship is a single matrix-vector product (cosine similarity).
+    """
+
+    def __init__(self, scholarships: Iterable[Dict[str, Any]]):
+        scholarships = list(scholarships)
+        self.ids: List[str] = [str(s.get("id")) for s in scholarships]
+        self.row_of: Dict[str, int] = {sid: i for i, sid in enumerate(self.ids)}
+        if scholarships:
+            self.matrix = np.vstack([scholarship_vector(s) for s in scholarships])
+        else:
+            self.matrix = np.zeros((0, len(DIMENSIONS)), dtype=np.float32)
+
+    def score_all(self, student_vec: np.ndarray) -> np.ndarray:
+        """Match percentage (0-100) of the student against every scholarship."""
+        return np.clip(self.matrix @ student_vec, 0.0, 1.0) * 100.0
+
+    def top_k(
+        self,
+        student_vec: np.ndarray,
+        k: int = 5,
+        candidate_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return [(scholarship_id, match_percentage), ...] best first.
+        candidate_ids restricts the ranking (e.g. to residency-eligible awards).
+        """
+        scores = self.score_all(student_vec)
+
+        if candidate_ids is None:
+            rows = np.arange(len(self.ids))
+        else:
+            rows = np.fromiter(
+                (self.row_of[sid] for sid in candidate_ids if sid in self.row_of),
+                dtype=np.intp,
+            )
+        if rows.size == 0:
+            return []
+
+        candidate_scores = scores[rows]
+        k = min(k, rows.size)
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+
+        return [(self.ids[rows[i]], round(float(candidate_scores[i]), 1)) for i in top]
+
+
+register_derived("match_ranker", lambda snap: MatchRanker(snap.scholarships))
+
+
+def get_match_ranker() -> MatchRanker:
+    """The ranker for the live catalog (rebuilt once per catalog snapshot)."""
+    return get_snapshot().derived("match_ranker")
@@ -6,81 +6,15 @@ from json import JSONDecodeError
 
 from ..infrastructure.scholarship_repo import get_scholarship
 from ..infrastructure.ai_client import get_claude_client, MODEL_NAME
+from ..infrastructure.analysis_cache import get_analysis_cache, content_hash
+from ..infrastructure.prompt_builder import build_request
+from ..infrastructure.resilience import CircuitOpenError
+from ..infrastructure.metrics import ANALYSIS_CACHE_REQUESTS, JSON_PARSE_FAILURES
+from ..infrastructure.structured_log import log_model_output
+from ..infrastructure.tracing import span
 
 
-async def analyze_scholarship_priorities(scholarship_id: str) -> Dict[str, Any]:
-    """
-    Deep-dive analysis for a single scholarship.
-
-    Used when the user has ALREADY chosen a scholarship and wants to start
-    working on an essay. Here we:
-    - Look up the scholarship in our JSON.
-    - Identify the institution/college that offers it.
-    - Call Claude WITH web search enabled so it can:
-        * Read about the scholarship online.
-        * Read about the institution/college values.
-        * Infer hidden priorities that aren't obvious from the short description.
-        * Assign weights to up to THREE main priorities.
-        * Suggest essay strategies aligned with those priorities.
-
-    Returns a JSON-serializable dict with fields like:
-    {
-      "scholarship_id": "8",
-      "scholarship_title": "Some Award",
-      "institution": "Victoria College, University of Toronto",
-      "priorities": [
-        {
-          "name": "academic_excellence",
-          "weight": 0.4,
-          "reason": "Strong emphasis on GPA and academic awards."
-        },
-        {
-          "name": "leadership",
-          "weight": 0.35,
-          "reason": "Rewards leadership in college and student life."
-        },
-        {
-          "name": "community_service",
-          "weight": 0.25,
-          "reason": "Highlights impact on wider community and volunteer work."
-        }
-      ],
-      "essay_strategies": [
-        "Open with a concrete academic achievement tied to impact.",
-        "Show specific leadership roles within the college or university.",
-        "Tie community work back to the institution's stated values."
-      ]
-    }
-    """
-    scholarship = get_scholarship(scholarship_id)
-    if not scholarship:
-        raise ValueError(f"Scholarship {scholarship_id} not found")
-
-    # Try to infer which unit/college/department gives this scholarship.
-    institution = (
-        scholarship.get("institution")
-        or scholarship.get("college")
-        or scholarship.get("faculty")
-        or scholarship.get("division")
-        or scholarship.get("department")
-        or scholarship.get("unit")
-        or "University of Toronto"
-    )
-
-    payload = {
-        "scholarship": {
-            "id": str(scholarship.get("id")),
-            "title": scholarship.get("title") or scholarship.get("name"),
-            "description": scholarship.get("description"),
-            "value": scholarship.get("value"),
-            "deadline": scholarship.get("deadline"),
-            "level_of_study": scholarship.get("level_of_study"),
-            "legal_status": scholarship.get("legal_status"),
-            "institution": institution,
-        }
-    }
-
-    system_prompt = """
+ANALYSIS_SYSTEM_PROMPT = """
 You are analyzing ONE specific scholarship in depth.
 
 You will receive JSON with:
@@ -156,31 +90,59 @@ Rules:
 - The output MUST start with '{' and end with '}'.
 """.strip()
 
-    client = get_claude_client()
 
-    try:
-        message = client.messages.create(
-            model=MODEL_NAME,
-            max_tokens=1800,
-            temperature=0.3,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": json.dumps(payload),
-                }
-            ],
-            tools=[
-                {
-                    "type": "web_search_20250305",
-                    "name": "web_search",
-                    "max_uses": 3,
-                }
-            ],
-        )
-    except Exception as e:
-        raise RuntimeError(f"Error while calling Claude for scholarship analysis: {e}")
+def build_analysis_request(scholarship: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The messages.create() keyword arguments for analyzing one scholarship.
+    Shared by the interactive route and the offline batch pre-analysis.
+    """
+    # Try to infer which unit/college/department gives this scholarship.
+    institution = (
+        scholarship.get("institution")
+        or scholarship.get("college")
+        or scholarship.get("faculty")
+        or scholarship.get("division")
+        or scholarship.get("department")
+        or scholarship.get("unit")
+        or "University of Toronto"
+    )
 
+    payload = {
+        "scholarship": {
+            "id": str(scholarship.get("id")),
+            "title": scholarship.get("title") or scholarship.get("name"),
+            "description": scholarship.get("description"),
+            "value": scholarship.get("value"),
+            "deadline": scholarship.get("deadline"),
+            "level_of_study": scholarship.get("level_of_study"),
+            "legal_status": scholarship.get("legal_status"),
+            "institution": institution,
+        }
+    }
+
+    # Each scholarship is analyzed once per content hash (results are cached
+    # locally), so only the system prompt + tools prefix is worth caching.
+    return build_request(
+        model=MODEL_NAME,
+        max_tokens=1800,
+        temperature=0.3,
+        system=ANALYSIS_SYSTEM_PROMPT,
+        dynamic=payload,
+        tools=[
+            {
+                "type": "web_search_20250305",
+                "name": "web_search",
+                "max_uses": 3,
+            }
+        ],
+    )
+
+
+def parse_analysis_message(message: Any) -> Dict[str, Any]:
+    """
+    Turn a Claude analysis response into the validated analysis dict.
+    Raises ValueError if the output isn't usable.
+    """
     # Extract ONLY text blocks from the response.
     text_chunks: List[str] = []
     for block in message.content:
@@ -188,12 +150,13 @@ Rules:
             text_chunks.append(block.text)
 
     raw_text = "\n".join(text_chunks).strip()
-    print("RAW CLAUDE OUTPUT (scholarship_analysis):", raw_text)
+    log_model_output("scholarship_analysis", raw_text)
 
     # Try strict JSON first, then a fallback using { ... } slice.
     try:
         data = json.loads(raw_text)
     except JSONDecodeError:
+        JSON_PARSE_FAILURES.inc(site="scholarship_analysis", stage="strict")
         start = raw_text.find("{")
         end = raw_text.rfind("}")
         if start != -1 and end != -1:
@@ -201,10 +164,12 @@ Rules:
             try:
                 data = json.loads(candidate)
             except JSONDecodeError:
+                JSON_PARSE_FAILURES.inc(site="scholarship_analysis", stage="failed")
                 raise ValueError(
                     "Claude returned invalid JSON for scholarship analysis."
                 )
         else:
+            JSON_PARSE_FAILURES.inc(site="scholarship_analysis", stage="failed")
             raise ValueError(
                 "Claude returned output without any JSON object for scholarship analysis."
             )
@@ -224,3 +189,90 @@ Rules:
         data["priorities"] = priorities[:3]
 
     return data
+
+
+async def analyze_scholarship_priorities(
+    scholarship_id: str,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Deep-dive analysis for a single scholarship.
+
+    Used when the user has ALREADY chosen a scholarship and wants to start
+    working on an essay. Here we:
+    - Look up the scholarship in our JSON.
+    - Identify the institution/college that offers it.
+    - Call Claude WITH web search enabled so it can:
+        * Read about the scholarship online.
+        * Read about the institution/college values.
+        * Infer hidden priorities that aren't obvious from the short description.
+        * Assign weights to up to THREE main priorities.
+        * Suggest essay strategies aligned with those priorities.
+
+    Returns a JSON-serializable dict with fields like:
+    {
+      "scholarship_id": "8",
+      "scholarship_title": "Some Award",
+      "institution": "Victoria College, University of Toronto",
+      "priorities": [
+        {
+          "name": "academic_excellence",
+          "weight": 0.4,
+          "reason": "Strong emphasis on GPA and academic awards."
+        },
+        {
+          "name": "leadership",
+          "weight": 0.35,
+          "reason": "Rewards leadership in college and student life."
+        },
+        {
+          "name": "community_service",
+          "weight": 0.25,
+          "reason": "Highlights impact on wider community and volunteer work."
+        }
+      ],
+      "essay_strategies": [
+        "Open with a concrete academic achievement tied to impact.",
+        "Show specific leadership roles within the college or university.",
+        "Tie community work back to the institution's stated values."
+      ]
+    }
+
+    The result only depends on the scholarship record, so it is cached
+    (SQLite or Postgres) keyed by (scholarship id, content hash of the record). Pass
+    use_cache=False to force a fresh Claude call (the cache is refreshed).
+    """
+    scholarship = get_scholarship(scholarship_id)
+    if not scholarship:
+        raise ValueError(f"Scholarship {scholarship_id} not found")
+
+    # Analyses precomputed offline (app.tools.precompute_analysis) land in
+    # the same cache, so this check covers them too.
+    cache = get_analysis_cache()
+    record_hash = content_hash(scholarship)
+    if use_cache:
+        with span("cache"):
+            cached = await cache.aget(str(scholarship_id), record_hash)
+        if cached is not None:
+            ANALYSIS_CACHE_REQUESTS.inc(result="hit")
+            return cached
+    ANALYSIS_CACHE_REQUESTS.inc(result="miss")
+
+    client = get_claude_client()
+
+    try:
+        with span("claude"):
+            message = await client.create_message(
+                route="analysis", **build_analysis_request(scholarship)
+            )
+    except CircuitOpenError:
+        raise  # the route answers 503 + Retry-After
+    except Exception as e:
+        raise RuntimeError(f"Error while calling Claude for scholarship analysis: {e}")
+
+    with span("parse"):
+        data = parse_analysis_message(message)
+
+    await cache.aset(str(scholarship_id), record_hash, data)
+
+    return data
@@ -1,40 +1,392 @@
 # backend/app/infrastructure/ai_client.py
 
-from anthropic import Anthropic
-from ..core.config import settings
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient, Timeout
+from anthropic.types import Message
 
+from ..core.config import settings
+from .prompt_builder import CacheUsage
+from .metrics import (
+    CLAUDE_CIRCUIT_STATE,
+    CLAUDE_HEDGES,
+    CLAUDE_IN_FLIGHT,
+    CLAUDE_PROMPT_CACHE_HIT_RATIO,
+    CLAUDE_RETRIES,
+    observe_claude_call,
+)
+from .resilience import (
+    CallPolicy,
+    CircuitBreaker,
+    LatencyTracker,
+    backoff_delay,
+    is_retryable,
+    policy_for,
+    retry_reason,
+)
 
-# Create the Anthropic client once
-_anthropic_client = None
 
 # Set your model name (use the one from your dashboard or default)
 MODEL_NAME = "claude-sonnet-4-5-20250929"  # Safer default than a dated version
 
 
-def get_claude_client() -> Anthropic:
+# messages.create() arguments that can't change what Claude returns; every
+# other argument (top_p, stop_sequences, tool_choice, ...) is part of the key
+_UNKEYED_FIELDS = frozenset({"metadata", "timeout"})
+
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    """Canonical hash of a messages.create() request (order-insensitive JSON)."""
+    canonical = json.dumps(
+        {field: value for field, value in kwargs.items() if field not in _UNKEYED_FIELDS},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one upstream call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is still running await the same task and share its result
+    (or its exception). The task is shielded, so one caller disconnecting
+    does not cancel the call for everyone else.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.requests = 0  # calls that went through do()
+        self.upstream = 0  # calls that actually ran the work
+        self.joins = 0     # calls that piggybacked on an in-flight one
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.requests += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.joins += 1
+        else:
+            self.upstream += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream,
+            "joins": self.joins,
+            "in_flight_keys": len(self._inflight),
+            "join_ratio": (self.joins / self.requests) if self.requests else 0.0,
+        }
+
+
+class ClaudeClient:
+    """
+    Async facade over the Anthropic SDK.
+
+    - One AsyncAnthropic client (and therefore one HTTP connection pool)
+      is shared by every call site in the process.
+    - A semaphore caps how many Claude calls can be in flight at once, so a
+      burst of requests queues here instead of opening unbounded connections.
+    - Identical requests that are in flight at the same time (double-clicks,
+      many students opening the same scholarship) are coalesced into one
+      upstream call via SingleFlight.
+    - Transient failures are retried with jittered backoff, slow idempotent
+      calls can be hedged, and a circuit breaker fails fast while the API
+      is down; all per call site, see resilience.CallPolicy.
+    - Token usage (including prompt-cache reads/writes) is recorded per
+      route label, see stats(). A coalesced call's tokens are counted once,
+      under the route that started it; callers that joined it are counted
+      in their own route's coalesced_calls.
+
+    Call sites use `await client.create_message(route=..., ...)` with the
+    same keyword arguments as `messages.create()`.
+    """
+
+    def __init__(
+        self, client: AsyncAnthropic, max_concurrency: int, breaker_cooldown: float = 30.0
+    ):
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._single_flight = SingleFlight()
+        self.usage = CacheUsage()
+        self.breaker = CircuitBreaker(cooldown=breaker_cooldown)
+        self.latency = LatencyTracker()
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+
+    @property
+    def raw(self) -> AsyncAnthropic:
+        """The underlying AsyncAnthropic client (for APIs the facade doesn't wrap)."""
+        return self._client
+
+    async def create_message(
+        self,
+        *,
+        route: str = "other",
+        coalesce: bool = True,
+        policy: Optional[CallPolicy] = None,
+        **kwargs: Any,
+    ) -> Message:
+        """
+        Non-blocking messages.create(), bounded by the concurrency limit.
+        With coalesce=True, concurrent identical requests share one call.
+        `route` labels the usage counters / metrics and picks the retry /
+        hedging policy (unless `policy` is given); it isn't sent to the API.
+        """
+        policy = policy or policy_for(route)
+        if not coalesce:
+            return await self._create(route, kwargs, policy)
+
+        leader = False
+
+        def start() -> Awaitable[Message]:
+            nonlocal leader
+            leader = True
+            return self._create(route, kwargs, policy)
+
+        message = await self._single_flight.do(request_key(kwargs), start)
+        if not leader:
+            # Tokens were billed once, to the leader's route; count this caller too
+            self.usage.record_coalesced(route)
+        return message
+
+    async def _create(self, route: str, kwargs: Dict[str, Any], policy: CallPolicy) -> Message:
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(route, kwargs, policy)
+            except Exception as e:
+                if attempt >= policy.max_retries or not is_retryable(e):
+                    raise
+                delay = backoff_delay(policy, attempt, e)
+                if delay is None:
+                    raise
+                CLAUDE_RETRIES.inc(route=route, reason=retry_reason(e))
+                attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, route: str, kwargs: Dict[str, Any], policy: CallPolicy) -> Message:
+        """One try (possibly hedged), reported to the circuit breaker."""
+        probe = self.breaker.before_call() if policy.circuit_breaker else None
+        failed: Optional[bool] = None
+        try:
+            if policy.hedge:
+                message = await self._hedged(route, kwargs, policy)
+            else:
+                message = await self._call(route, kwargs)
+            failed = False
+            return message
+        except Exception as e:
+            # A non-retryable error (400, 401, ...) is our problem, not an outage
+            failed = True if is_retryable(e) else None
+            raise
+        finally:
+            if policy.circuit_breaker:
+                self.breaker.record(failed, probe)
+
+    async def _hedged(self, route: str, kwargs: Dict[str, Any], policy: CallPolicy) -> Message:
+        """
+        Start the call; if it hasn't answered after the hedge threshold
+        (policy.hedge_after, else this route's p95), start an identical one
+        and return whichever succeeds first, cancelling the other.
+        """
+        threshold = policy.hedge_after
+        if threshold is None:
+            threshold = self.latency.p95(route)
+        if threshold is None:
+            return await self._call(route, kwargs)
+
+        primary = asyncio.ensure_future(self._call(route, kwargs))
+        backup: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=threshold)
+            if done:
+                return primary.result()
+            if self._semaphore.locked():
+                # Every slot is busy: a hedge would only queue behind the original
+                CLAUDE_HEDGES.inc(route=route, outcome="skipped")
+                return await primary
+
+            backup = asyncio.ensure_future(self._call(route, kwargs))
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        CLAUDE_HEDGES.inc(route=route, outcome="won" if task is backup else "lost")
+                        return task.result()
+            # Both failed: surface the original call's error
+            return primary.result()
+        finally:
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _call(self, route: str, kwargs: Dict[str, Any]) -> Message:
+        """A single upstream messages.create(), holding a concurrency slot."""
+        started = time.perf_counter()
+        try:
+            async with self._semaphore:
+                self.in_flight += 1
+                try:
+                    message = await self._client.messages.create(**kwargs)
+                finally:
+                    self.in_flight -= 1
+        except asyncio.CancelledError:
+            observe_claude_call(route, started, "cancelled")
+            raise
+        except BaseException:
+            observe_claude_call(route, started, "error")
+            raise
+        self.latency.observe(route, time.perf_counter() - started)
+        usage = getattr(message, "usage", None)
+        self.usage.record(route, usage)
+        observe_claude_call(route, started, "ok", usage)
+        return message
+
+    async def stream_text(
+        self, *, route: str = "other", policy: Optional[CallPolicy] = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream a message with the Anthropic streaming API, yielding text
+        deltas as they arrive. Holds a concurrency slot for the whole stream.
+        Streams are never coalesced or hedged, and are only retried if they
+        fail before the first delta (after that the caller has seen text).
+        """
+        policy = policy or policy_for(route)
+        attempt = 0
+        while True:
+            probe = self.breaker.before_call() if policy.circuit_breaker else None
+            started = time.perf_counter()
+            yielded = False
+            failed: Optional[bool] = None
+            try:
+                async with self._semaphore:
+                    self.in_flight += 1
+                    try:
+                        async with self._client.messages.stream(**kwargs) as stream:
+                            async for text in stream.text_stream:
+                                yielded = True
+                                yield text
+                            final = await stream.get_final_message()
+                    finally:
+                        self.in_flight -= 1
+                failed = False
+            except Exception as e:
+                observe_claude_call(route, started, "error")
+                failed = True if is_retryable(e) else None
+                if yielded or not failed or attempt >= policy.max_retries:
+                    raise
+                delay = backoff_delay(policy, attempt, e)
+                if delay is None:
+                    raise
+                CLAUDE_RETRIES.inc(route=route, reason=retry_reason(e))
+                attempt += 1
+            except BaseException:
+                observe_claude_call(route, started, "cancelled")
+                raise
+            finally:
+                if policy.circuit_breaker:
+                    self.breaker.record(failed, probe)
+
+            if not failed:
+                self.usage.record(route, final.usage)
+                observe_claude_call(route, started, "ok", final.usage)
+                return
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency, coalescing and token counters (for debugging / dashboards)."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "coalescing": self._single_flight.stats(),
+            "circuit_breaker": self.breaker.stats(),
+            "usage_by_route": self.usage.stats(),
+        }
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+# Create the Claude client once
+_claude_client: Optional[ClaudeClient] = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """HTTP pool shared by all Claude calls (keep-alive connections are reused)."""
+    return DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.claude_max_connections,
+            max_keepalive_connections=settings.claude_max_keepalive_connections,
+        ),
+        # the SDK's own Timeout type, so it matches the HTTP library it bundles
+        timeout=Timeout(settings.claude_timeout_seconds, connect=10.0),
+    )
+
+
+def get_claude_client() -> ClaudeClient:
     """
-    Return a globally reused Anthropic client.
+    Return a globally reused async Claude client facade.
     If it doesn't exist yet, build it using the API key from settings.
     """
-    global _anthropic_client
+    global _claude_client
 
-    if _anthropic_client is None:
+    if _claude_client is None:
         api_key = settings.anthropic_api_key
         if not api_key:
             raise RuntimeError("Missing Anthropic API key! Check your .env and settings config.")
-        _anthropic_client = Anthropic(api_key=api_key)
+        _claude_client = ClaudeClient(
+            AsyncAnthropic(
+                api_key=api_key,
+                base_url=settings.anthropic_base_url,
+                http_client=_build_http_client(),
+                # Retries happen in ClaudeClient, per call-site policy
+                max_retries=0,
+            ),
+            max_concurrency=settings.claude_max_concurrency,
+            breaker_cooldown=settings.claude_breaker_cooldown_seconds,
+        )
+        client = _claude_client
+        CLAUDE_IN_FLIGHT.set_function(lambda: {(): client.in_flight})
+        CLAUDE_PROMPT_CACHE_HIT_RATIO.set_function(
+            lambda: {(route,): s["cache_hit_ratio"] for route, s in client.usage.stats().items()}
+        )
+        CLAUDE_CIRCUIT_STATE.set_function(
+            lambda: {(): {"closed": 0, "half_open": 1, "open": 2}[client.breaker.state]}
+        )
+
+    return _claude_client
+
+
+async def close_claude_client() -> None:
+    """Close the shared HTTP pool (called on app shutdown)."""
+    global _claude_client
 
-    return _anthropic_client
+    if _claude_client is not None:
+        await _claude_client.close()
+        _claude_client = None
 
 
-async def ask_claude(prompt: str, max_tokens: int = 800) -> str:
+async def ask_claude(prompt: str, max_tokens: int = 800, route: str = "ask_claude") -> str:
     """
     A simple helper that wraps messages.create() for single-shot prompt use cases.
     Keeps it for lightweight calls if needed.
     """
     client = get_claude_client()
 
-    resp = client.messages.create(
+    resp = await client.create_message(
+        route=route,
         model=MODEL_NAME,
         max_tokens=max_tokens,
         messages=[{"role": "user", "content": prompt}]
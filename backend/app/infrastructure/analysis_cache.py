@@ -0,0 +1,169 @@
+# backend/app/infrastructure/analysis_cache.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from ..core.config import settings
+
+
+def content_hash(record: Mapping[str, Any]) -> str:
+    """Stable hash of a scholarship record (key order doesn't matter)."""
+    # dict(): records may be read-only views over the compiled catalog
+    canonical = json.dumps(dict(record), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Durable cache for scholarship priority analyses.
+
+    Rows are keyed by (scholarship_id, content_hash), so editing a scholarship
+    record automatically misses the old analysis. Backed by SQLite in WAL
+    mode, which lets every uvicorn/gunicorn worker read and write the same
+    file concurrently, and survives restarts.
+
+    Methods are synchronous (SQLite calls take well under a millisecond);
+    async callers use the a*() wrappers, which run them in a thread and
+    match the interface of the Postgres-backed cache.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread: sqlite3 connections aren't thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scholarship_analyses (
+                    scholarship_id TEXT NOT NULL,
+                    content_hash   TEXT NOT NULL,
+                    data           TEXT NOT NULL,
+                    created_at     REAL NOT NULL,
+                    PRIMARY KEY (scholarship_id, content_hash)
+                )
+                """
+            )
+
+    def get(self, scholarship_id: str, record_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis, or None if missing / expired."""
+        row = self._conn().execute(
+            "SELECT data, created_at FROM scholarship_analyses "
+            "WHERE scholarship_id = ? AND content_hash = ?",
+            (str(scholarship_id), record_hash),
+        ).fetchone()
+        if row is None:
+            return None
+
+        data, created_at = row
+        if self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds:
+            return None
+        return json.loads(data)
+
+    def set(self, scholarship_id: str, record_hash: str, analysis: Dict[str, Any]) -> None:
+        """Store an analysis, dropping analyses of older versions of the record."""
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "DELETE FROM scholarship_analyses "
+                "WHERE scholarship_id = ? AND content_hash != ?",
+                (str(scholarship_id), record_hash),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO scholarship_analyses "
+                "(scholarship_id, content_hash, data, created_at) VALUES (?, ?, ?, ?)",
+                (
+                    str(scholarship_id),
+                    record_hash,
+                    json.dumps(analysis, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+
+    def invalidate(self, scholarship_id: Optional[str] = None) -> int:
+        """Drop cached analyses for one scholarship (or all). Returns rows removed."""
+        conn = self._conn()
+        with conn:
+            if scholarship_id is None:
+                cur = conn.execute("DELETE FROM scholarship_analyses")
+            else:
+                cur = conn.execute(
+                    "DELETE FROM scholarship_analyses WHERE scholarship_id = ?",
+                    (str(scholarship_id),),
+                )
+        return cur.rowcount
+
+    def purge_expired(self) -> int:
+        """Delete rows older than the TTL. Returns rows removed."""
+        if self.ttl_seconds <= 0:
+            return 0
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "DELETE FROM scholarship_analyses WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+        return cur.rowcount
+
+    # ---------- async interface (shared with PostgresAnalysisCache) ----------
+
+    async def aget(self, scholarship_id: str, record_hash: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, scholarship_id, record_hash)
+
+    async def aset(self, scholarship_id: str, record_hash: str, analysis: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.set, scholarship_id, record_hash, analysis)
+
+    async def ainvalidate(self, scholarship_id: Optional[str] = None) -> int:
+        return await asyncio.to_thread(self.invalidate, scholarship_id)
+
+    async def apurge_expired(self) -> int:
+        return await asyncio.to_thread(self.purge_expired)
+
+
+_analysis_cache: Optional[Any] = None
+
+
+def get_analysis_cache() -> Any:
+    """
+    Return the process-wide analysis cache (opened lazily): SQLite, or
+    Postgres with CATALOG_BACKEND=postgres. Use the async a*() methods.
+    """
+    global _analysis_cache
+
+    if _analysis_cache is None:
+        if settings.catalog_backend == "postgres":
+            from .postgres_repo import PostgresAnalysisCache, get_database
+
+            _analysis_cache = PostgresAnalysisCache(
+                get_database(), ttl_seconds=settings.analysis_cache_ttl_seconds
+            )
+        else:
+            _analysis_cache = AnalysisCache(
+                path=Path(settings.analysis_cache_path),
+                ttl_seconds=settings.analysis_cache_ttl_seconds,
+            )
+
+    return _analysis_cache
@@ -0,0 +1,298 @@
+# backend/app/infrastructure/catalog_binary.py
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Compiled, memory-mapped form of scholarships.json.
+#
+# The first worker to start after the JSON changes compiles it into one
+# binary file; every other worker (and every restart) maps that file
+# instead of parsing JSON, so startup doesn't depend on catalog size and
+# the OS page cache holds one copy of the catalog for all processes.
+#
+# Layout (little-endian, every section 8-byte aligned):
+#
+#   magic            8 bytes, MAGIC
+#   header length    uint32, followed by the header as UTF-8 JSON:
+#                    rows, content_hash, source_stamps, fields, strings
+#   per field:       state  uint8[rows]   0 = key absent, 1 = null, 2 = value
+#                    values int64[rows]   "int" fields: the value itself
+#                           uint32[rows]  "str" / "json" fields: string id
+#   string table:    offsets uint64[count + 1], then the UTF-8 data
+#
+# Strings are interned, so categorical fields (citizenship, category,
+# offered_by, ...) store each distinct value once. Values that aren't
+# ints or strings (floats, bools, lists, objects) are stored as JSON text.
+# Records are exposed as ScholarshipView, a read-only Mapping that
+# decodes fields from the map on access.
+
+MAGIC = b"NSCAT\x00\x01\x00"
+FORMAT_VERSION = 1
+
+_ABSENT, _NULL, _VALUE = 0, 1, 2
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+_MISSING = object()
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _kind(values: List[Any]) -> str:
+    present = [v for v in values if v is not None]
+    if all(type(v) is int and _INT64_MIN <= v <= _INT64_MAX for v in present):
+        return "int"
+    if all(type(v) is str for v in present):
+        return "str"
+    return "json"
+
+
+def compile_catalog(
+    scholarships: List[Dict[str, Any]],
+    path: Path,
+    content_hash: str,
+    source_stamps: Tuple[Tuple[int, int], ...],
+) -> None:
+    """Write `scholarships` in the binary format (atomically replaces `path`)."""
+    rows = len(scholarships)
+    names: Dict[str, None] = {}
+    for record in scholarships:
+        names.update(dict.fromkeys(record))
+
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        sid = strings.get(value)
+        if sid is None:
+            sid = strings[value] = len(strings)
+        return sid
+
+    columns: List[Tuple[str, str, bytes, bytes]] = []
+    for name in names:
+        values = [record.get(name, _MISSING) for record in scholarships]
+        kind = _kind([v for v in values if v is not _MISSING])
+        state = bytes(
+            _ABSENT if v is _MISSING else _NULL if v is None else _VALUE for v in values
+        )
+        if kind == "int":
+            packed = struct.pack(
+                f"<{rows}q", *(v if type(v) is int else 0 for v in values)
+            )
+        else:
+            encode = (lambda v: v) if kind == "str" else (
+                lambda v: json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+            )
+            packed = struct.pack(
+                f"<{rows}I",
+                *(0 if v is _MISSING or v is None else intern(encode(v)) for v in values),
+            )
+        columns.append((name, kind, state, packed))
+
+    data = bytearray()
+    offsets = [0]
+    for value in strings:  # insertion order == string id
+        data += value.encode("utf-8")
+        offsets.append(len(data))
+    offsets_packed = struct.pack(f"<{len(offsets)}Q", *offsets)
+
+    # Sections in file order: state + values per field, then the string table
+    sections: List[bytes] = []
+    for _, _, state, packed in columns:
+        sections += [state, packed]
+    sections += [offsets_packed, bytes(data)]
+
+    def header_bytes(positions: List[int]) -> bytes:
+        header = {
+            "format": FORMAT_VERSION,
+            "rows": rows,
+            "content_hash": content_hash,
+            "source_stamps": [list(s) for s in source_stamps],
+            "fields": [
+                {
+                    "name": name,
+                    "kind": kind,
+                    "state": positions[2 * i],
+                    "values": positions[2 * i + 1],
+                }
+                for i, (name, kind, _, _) in enumerate(columns)
+            ],
+            "strings": {
+                "count": len(strings),
+                "offsets": positions[-2],
+                "data": positions[-1],
+            },
+        }
+        return json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    # The header holds the section offsets, so size it with wide placeholders first
+    start = _align(len(MAGIC) + 4 + len(header_bytes([2 ** 62] * len(sections))))
+    positions: List[int] = []
+    cursor = start
+    for blob in sections:
+        positions.append(cursor)
+        cursor = _align(cursor + len(blob))
+    header = header_bytes(positions)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for position, blob in zip(positions, sections):
+            f.write(b"\0" * (position - f.tell()))
+            f.write(blob)
+        f.write(b"\0" * (cursor - f.tell()))
+    os.replace(tmp, path)  # readers see the old file or the new one, never half
+
+
+class _Field:
+    __slots__ = ("name", "kind", "state", "values")
+
+    def __init__(self, name: str, kind: str, state: memoryview, values: memoryview):
+        self.name = name
+        self.kind = kind
+        self.state = state
+        self.values = values
+
+
+class BinaryCatalog(Sequence):
+    """
+    A compiled catalog file mapped read-only; a Sequence of ScholarshipView
+    in catalog order (slicing returns a list).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._map)
+
+        if bytes(buf[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{self.path} is not a compiled catalog")
+        (header_len,) = struct.unpack_from("<I", buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(buf[start : start + header_len]))
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has an unsupported format version")
+
+        rows = self.rows = header["rows"]
+        self.content_hash: str = header["content_hash"]
+        self.source_stamps: Tuple[Tuple[int, int], ...] = tuple(
+            tuple(s) for s in header["source_stamps"]
+        )
+
+        self.fields: Dict[str, _Field] = {}
+        for meta in header["fields"]:
+            state = buf[meta["state"] : meta["state"] + rows]
+            if meta["kind"] == "int":
+                values = buf[meta["values"] : meta["values"] + 8 * rows].cast("q")
+            else:
+                values = buf[meta["values"] : meta["values"] + 4 * rows].cast("I")
+            self.fields[meta["name"]] = _Field(meta["name"], meta["kind"], state, values)
+
+        strings = header["strings"]
+        self._offsets = buf[
+            strings["offsets"] : strings["offsets"] + 8 * (strings["count"] + 1)
+        ].cast("Q")
+        self._data = strings["data"]
+
+    def string(self, sid: int) -> str:
+        base = self._data
+        return self._map[base + self._offsets[sid] : base + self._offsets[sid + 1]].decode("utf-8")
+
+    def value(self, field: _Field, row: int) -> Any:
+        """Decoded value of one cell (the caller checked its state is _VALUE)."""
+        if field.kind == "int":
+            return field.values[row]
+        text = self.string(field.values[row])
+        return text if field.kind == "str" else json.loads(text)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ScholarshipView(self, row) for row in range(*index.indices(self.rows))]
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("catalog row out of range")
+        return ScholarshipView(self, index)
+
+    def __iter__(self) -> Iterator["ScholarshipView"]:
+        for row in range(self.rows):
+            yield ScholarshipView(self, row)
+
+
+class ScholarshipView(Mapping):
+    """
+    Read-only dict-like view of one compiled catalog row. Works wherever
+    records are read with record["key"] / .get() / iteration; dict(view)
+    materializes a plain dict. legal_status, when given, overrides the
+    record's own field (the normalized value, without copying the record).
+    """
+
+    __slots__ = ("_catalog", "_row", "_legal_status")
+
+    def __init__(self, catalog: BinaryCatalog, row: int, legal_status: Optional[str] = None):
+        self._catalog = catalog
+        self._row = row
+        self._legal_status = legal_status
+
+    def with_legal_status(self, legal_status: str) -> "ScholarshipView":
+        return ScholarshipView(self._catalog, self._row, legal_status)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "legal_status" and self._legal_status is not None:
+            return self._legal_status
+        field = self._catalog.fields.get(key)
+        if field is None:
+            return default
+        state = field.state[self._row]
+        if state == _VALUE:
+            return self._catalog.value(field, self._row)
+        return None if state == _NULL else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        row = self._row
+        for name, field in self._catalog.fields.items():
+            if field.state[row] != _ABSENT or (
+                name == "legal_status" and self._legal_status is not None
+            ):
+                yield name
+        if self._legal_status is not None and "legal_status" not in self._catalog.fields:
+            yield "legal_status"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ScholarshipView({dict(self)!r})"
+
+
+def open_compiled(
+    path: Path, source_stamps: Tuple[Tuple[int, int], ...]
+) -> Optional[BinaryCatalog]:
+    """The compiled catalog at `path` if it was built from files with these stamps, else None."""
+    try:
+        catalog = BinaryCatalog(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[warning] ignoring unreadable compiled catalog {path}: {e}")
+        return None
+    return catalog if catalog.source_stamps == tuple(source_stamps) else None
@@ -0,0 +1,271 @@
+# backend/app/infrastructure/catalog_store.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..core.config import settings
+from .catalog_binary import compile_catalog, open_compiled
+from .structured_log import log_event
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # points to backend/app
+DATA_DIR = BASE_DIR / "data"
+
+SCHOLARSHIPS_FILE = DATA_DIR / "scholarships.json"
+SUCCESS_STORIES_FILE = DATA_DIR / "success_stories.json"
+
+
+# name -> builder(snapshot). Modules register the structures they derive from
+# the raw catalog (indexes, matrices, ...) so reloads can pre-build them in the
+# background before the new snapshot goes live.
+_DERIVED_BUILDERS: Dict[str, Callable[["CatalogSnapshot"], Any]] = {}
+
+
+def register_derived(name: str, builder: Callable[["CatalogSnapshot"], Any]) -> None:
+    """Register a structure derived from the catalog (built once per snapshot)."""
+    _DERIVED_BUILDERS[name] = builder
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable view of both data files at one point in time.
+
+    scholarships is a list of dicts, or a BinaryCatalog of read-only
+    ScholarshipView mappings when the compiled catalog is enabled; treat
+    records as read-only mappings either way.
+
+    - version: increases by one every time a new snapshot is swapped in
+      (per process; use it to key in-process caches).
+    - content_hash: hash of the file contents, identical across workers
+      that loaded the same data (use it for ETags / shared caches).
+
+    Derived structures are built at most once per snapshot via derived(name).
+    """
+    version: int
+    content_hash: str
+    scholarships: Sequence[Mapping[str, Any]]
+    success_stories: List[Dict[str, Any]]
+    source_stamps: Tuple[Tuple[int, int], ...]
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def derived(self, name: str) -> Any:
+        if name not in self._derived:
+            with self._lock:
+                if name not in self._derived:
+                    self._derived[name] = _DERIVED_BUILDERS[name](self)
+        return self._derived[name]
+
+    def build_all_derived(self) -> None:
+        for name in list(_DERIVED_BUILDERS):
+            self.derived(name)
+
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file, or (0, 0) if it doesn't exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_bytes(path: Path, required: bool) -> bytes:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        if required:
+            raise
+        print(f"[warning] data file not found: {path}")
+        return b"[]"
+
+
+def _parse_list(raw: bytes, path: Path, required: bool) -> List[Dict[str, Any]]:
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        if required:
+            raise
+        print(f"[warning] invalid JSON in data file: {path}")
+        return []
+    return data if isinstance(data, list) else []
+
+
+class CatalogStore:
+    """
+    Loads scholarships.json and success_stories.json once into an immutable
+    CatalogSnapshot, and hot-reloads them when they change on disk.
+
+    With CATALOG_BINARY_PATH set, scholarships.json is compiled once into a
+    memory-mapped file (see catalog_binary.py) that later loads, in this
+    and every other worker, map instead of parsing.
+
+    Readers call snapshot() and use that object for the whole request, so
+    they never see a half-updated catalog. Reloads build the new snapshot
+    (and every registered derived structure) off the event loop, then swap
+    the reference in one assignment.
+    """
+
+    def __init__(self, scholarships_file: Path, success_stories_file: Path):
+        self.scholarships_file = Path(scholarships_file)
+        self.success_stories_file = Path(success_stories_file)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._reload_lock = threading.Lock()
+        self._version = 0
+        self._failed_stamps: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def _stamps(self) -> Tuple[Tuple[int, int], ...]:
+        return (_stamp(self.scholarships_file), _stamp(self.success_stories_file))
+
+    def _build(self, version: int) -> CatalogSnapshot:
+        stamps = self._stamps()
+        stories_raw = _read_bytes(self.success_stories_file, required=False)
+        success_stories = _parse_list(stories_raw, self.success_stories_file, required=False)
+
+        # A compiled catalog built from these exact files skips JSON parsing
+        binary_path = Path(settings.catalog_binary_path) if settings.catalog_binary_path else None
+        compiled = open_compiled(binary_path, stamps) if binary_path else None
+        if compiled is not None:
+            return CatalogSnapshot(
+                version=version,
+                content_hash=compiled.content_hash,
+                scholarships=compiled,
+                success_stories=success_stories,
+                source_stamps=stamps,
+            )
+
+        scholarships_raw = _read_bytes(self.scholarships_file, required=True)
+
+        digest = hashlib.sha256()
+        digest.update(scholarships_raw)
+        digest.update(b"\0")
+        digest.update(stories_raw)
+        content_hash = digest.hexdigest()[:16]
+
+        scholarships = _parse_list(scholarships_raw, self.scholarships_file, required=True)
+        if binary_path is not None:
+            try:
+                compile_catalog(scholarships, binary_path, content_hash, stamps)
+                compiled = open_compiled(binary_path, stamps)
+            except OSError as e:
+                print(f"[warning] could not write compiled catalog {binary_path}: {e}")
+
+        return CatalogSnapshot(
+            version=version,
+            content_hash=content_hash,
+            scholarships=compiled if compiled is not None else scholarships,
+            success_stories=success_stories,
+            source_stamps=stamps,
+        )
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current snapshot (loading it on first use)."""
+        snap = self._snapshot
+        if snap is None:
+            with self._reload_lock:
+                if self._snapshot is None:
+                    self._version += 1
+                    self._snapshot = self._build(self._version)
+                snap = self._snapshot
+        return snap
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def reload_if_changed(self) -> bool:
+        """
+        Rebuild and swap in a new snapshot if either file changed on disk.
+        A file that fails to parse mid-edit keeps the old snapshot live.
+        Returns True if a new snapshot was swapped in.
+        """
+        current = self.snapshot()
+        stamps = self._stamps()
+        if stamps == current.source_stamps or stamps == self._failed_stamps:
+            return False
+
+        with self._reload_lock:
+            current = self._snapshot
+            if current is not None and self._stamps() == current.source_stamps:
+                return False
+            try:
+                new_snapshot = self._build(self._version + 1)
+                new_snapshot.build_all_derived()
+            except Exception as e:
+                # Bad files or a derived builder choking on a record: the
+                # old snapshot stays live; don't retry (and re-warn) until
+                # the files change again
+                self._failed_stamps = stamps
+                log_event(
+                    "catalog_reload_failed",
+                    logging.WARNING,
+                    version=current.version if current else 0,
+                    error=str(e),
+                )
+                return False
+
+            self._version += 1
+            self._snapshot = new_snapshot  # atomic reference swap
+        log_event("catalog_reloaded", version=new_snapshot.version)
+        return True
+
+    async def open(self) -> None:
+        """Connect to the catalog source (no-op for the JSON files)."""
+
+    async def close(self) -> None:
+        """Release the catalog source's resources (no-op for the JSON files)."""
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:  # never let the watcher die
+                log_event("catalog_watcher_error", logging.WARNING, error=str(e))
+
+    def start_watching(self, interval: float) -> None:
+        """Poll the catalog source every `interval` seconds on the running loop."""
+        if interval <= 0 or self._watch_task is not None:
+            return
+        self._watch_task = asyncio.get_running_loop().create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        task, self._watch_task = self._watch_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+_catalog_store: Optional[CatalogStore] = None
+
+
+def get_catalog_store() -> CatalogStore:
+    """Return the process-wide catalog store (JSON files or Postgres, per CATALOG_BACKEND)."""
+    global _catalog_store
+
+    if _catalog_store is None:
+        if settings.catalog_backend == "postgres":
+            from .postgres_repo import PostgresCatalogStore, get_database
+
+            _catalog_store = PostgresCatalogStore(get_database())
+        else:
+            _catalog_store = CatalogStore(SCHOLARSHIPS_FILE, SUCCESS_STORIES_FILE)
+
+    return _catalog_store
+
+
+def get_snapshot() -> CatalogSnapshot:
+    """Shortcut for get_catalog_store().snapshot()."""
+    return get_catalog_store().snapshot()
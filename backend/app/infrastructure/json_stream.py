@@ -0,0 +1,101 @@
+# backend/app/infrastructure/json_stream.py
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+
+class JsonArrayStreamer:
+    """
+    Incremental parser that pulls the elements of one array out of a JSON
+    object while it is still being generated, e.g. every entry of
+    {"matches": [{...}, {...}, ...]} as soon as its closing brace arrives.
+
+    feed() takes raw text deltas (from a model's token stream) and returns
+    the objects completed by that delta. Text before the first "{" (prose,
+    a ```json fence) is skipped; elements that fail to parse are dropped.
+    Only object elements of the top-level `key` array are emitted.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._buf = ""
+        self._pos = 0            # next character of _buf to scan
+        self._depth = 0          # current {/[ nesting depth
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None  # last string closed at depth 1
+        self._array_depth: Optional[int] = None  # depth inside the target array
+        self._object_start: Optional[int] = None
+        self.done = False        # the target array has closed
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        if self.done or not text:
+            return []
+        self._buf += text
+        completed: List[Dict[str, Any]] = []
+
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = buf[self._string_start : i]
+            elif ch == '"':
+                if self._depth > 0:
+                    self._in_string = True
+                    self._string_start = i + 1
+            elif ch == "{":
+                self._depth += 1
+                if self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._object_start = i
+            elif ch == "[":
+                if self._depth > 0:
+                    self._depth += 1
+                    if (
+                        self._array_depth is None
+                        and self._depth == 2
+                        and self._last_string == self.key
+                    ):
+                        self._array_depth = 2
+            elif ch in "}]" and self._depth > 0:
+                if (
+                    ch == "}"
+                    and self._object_start is not None
+                    and self._depth == self._array_depth + 1
+                ):
+                    try:
+                        element = json.loads(buf[self._object_start : i + 1])
+                    except json.JSONDecodeError:
+                        element = None
+                    if isinstance(element, dict):
+                        completed.append(element)
+                    self._object_start = None
+                elif ch == "]" and self._depth == self._array_depth:
+                    self.done = True
+                    i += 1
+                    break
+                self._depth -= 1
+            i += 1
+
+        # Drop text we no longer need (everything before an open element)
+        keep_from = self._object_start if self._object_start is not None else i
+        if self._in_string and self._depth == 1:
+            keep_from = min(keep_from, self._string_start)
+        self._buf = buf[keep_from:]
+        self._pos = i - keep_from
+        if self._object_start is not None:
+            self._object_start -= keep_from
+        if self._in_string:
+            self._string_start -= keep_from
+        return completed
@@ -0,0 +1,197 @@
+# backend/app/infrastructure/match_cache.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from ..core.config import settings
+from .structured_log import log_event
+
+# Profile fields that don't change which scholarships fit a student
+_IGNORED_PROFILE_FIELDS = frozenset({"full_name"})
+
+
+def _normalize_text(value: str) -> str:
+    """Collapse whitespace and case: "  Computer  Science" -> "computer science"."""
+    return " ".join(value.split()).casefold()
+
+
+def canonical_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The parts of a UserProfileInput that decide its matches, normalized so
+    cosmetic differences (list order, extra spaces, capitalization, empty
+    entries, the student's name) map to the same cache key.
+    """
+    canonical: Dict[str, Any] = {}
+    for field, value in profile.items():
+        if field in _IGNORED_PROFILE_FIELDS:
+            continue
+        if isinstance(value, str):
+            value = _normalize_text(value)
+        elif isinstance(value, (list, tuple)):
+            value = sorted(
+                _normalize_text(v) if isinstance(v, str) else json.dumps(v, sort_keys=True)
+                for v in value
+            )
+            value = [v for v in value if v]
+        canonical[field] = value
+    return canonical
+
+
+def match_cache_key(
+    profile: Dict[str, Any],
+    catalog_hash: str,
+    eligible_ids: Iterable[str],
+    mode: str,
+) -> str:
+    """
+    Hash of everything a /match answer depends on: the canonical profile,
+    the catalog contents, the residency-filtered eligible set and the
+    ranking mode.
+    """
+    canonical = json.dumps(
+        {
+            "profile": canonical_profile(profile),
+            "catalog": catalog_hash,
+            "eligible": sorted(eligible_ids),
+            "mode": mode,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored_at")
+
+    def __init__(self, value: Any, size: int, stored_at: float):
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+
+
+class MatchCache:
+    """
+    In-process LRU cache for match results with stale-while-revalidate.
+
+    - Entries younger than ttl_seconds are fresh.
+    - Entries up to stale_seconds older than that are still returned, but
+      the caller should refresh them in the background (see revalidate()).
+    - Older entries are dropped on lookup.
+    - The least recently used entries are evicted once there are more than
+      max_entries or their estimated size exceeds max_bytes.
+
+    Only used from the event loop, so no locking.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        stale_seconds: float,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """(value, is_fresh), or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = time.monotonic() - entry.stored_at
+        if age > self.ttl_seconds + self.stale_seconds:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value, age <= self.ttl_seconds
+
+    def set(self, key: str, value: Any, size: int) -> None:
+        """Store a value; `size` is its approximate footprint in bytes."""
+        if not self.enabled or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, size, time.monotonic())
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def revalidate(
+        self, key: str, compute: Callable[[], Awaitable[Optional[Tuple[Any, int]]]]
+    ) -> None:
+        """
+        Refresh a stale entry in the background (at most one refresh per key).
+        compute() returns (value, size), or None to keep the stale entry.
+        """
+        if key in self._refreshing:
+            return
+
+        async def run() -> None:
+            try:
+                result = await compute()
+                if result is not None:
+                    self.set(key, *result)
+            except Exception as e:
+                log_event("match_cache_refresh_failed", logging.WARNING, error=str(e))
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(run())
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "refreshing": len(self._refreshing),
+        }
+
+
+_match_cache: Optional[MatchCache] = None
+
+
+def get_match_cache() -> MatchCache:
+    """Return the process-wide match result cache."""
+    global _match_cache
+
+    if _match_cache is None:
+        _match_cache = MatchCache(
+            max_entries=settings.match_cache_max_entries,
+            max_bytes=settings.match_cache_max_bytes,
+            ttl_seconds=settings.match_cache_ttl_seconds,
+            stale_seconds=settings.match_cache_stale_seconds,
+        )
+
+    return _match_cache
@@ -0,0 +1,391 @@
+# backend/app/infrastructure/metrics.py
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match, Mount
+
+# Minimal Prometheus client: counters, gauges and histograms with labels,
+# rendered in the text exposition format (version 0.0.4) by render().
+#
+# Metrics are per process. With several uvicorn workers, scrape each one
+# (or run one worker per container) and aggregate in Prometheus.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latencies range from sub-millisecond catalog hits to ~60 s Claude calls
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffix, label string, value) triples for render()."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """A gauge set directly, or computed at scrape time via set_function()."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, fn: Callable[[], Dict[LabelValues, float]]) -> None:
+        """fn() returns {label values tuple: value}; () for an unlabelled gauge."""
+        self._function = fn
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        if self._function is not None:
+            try:
+                items = list(self._function().items())
+            except Exception as e:  # a broken collector must not break /metrics
+                print(f"[warning] metrics collector {self.name} failed: {e}")
+                items = []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        n = len(self.buckets)
+        # First bucket whose upper bound is >= value (le semantics)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), n)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (n + 2)
+            state[index] += 1
+            state[n + 1] += value
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        n = len(self.buckets)
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), state[: n + 1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield "_bucket", _format_labels(self.labelnames, key, le), cumulative
+            yield "_sum", _format_labels(self.labelnames, key), state[n + 1]
+            yield "_count", _format_labels(self.labelnames, key), cumulative
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ---------- metrics used across the app ----------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "northstar_http_request_duration_seconds",
+    "HTTP request latency (until the last body byte is sent), by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "northstar_http_requests_in_progress",
+    "HTTP requests currently being handled, by route template.",
+    ("method", "route"),
+)
+
+CLAUDE_REQUEST_DURATION = Histogram(
+    "northstar_claude_request_duration_seconds",
+    "Claude API call latency by call site (includes time queued for a concurrency slot).",
+    ("route", "outcome"),
+)
+CLAUDE_TOKENS = Counter(
+    "northstar_claude_tokens_total",
+    "Claude tokens from message.usage by call site and kind "
+    "(input, output, cache_creation, cache_read).",
+    ("route", "kind"),
+)
+CLAUDE_IN_FLIGHT = Gauge(
+    "northstar_claude_requests_in_flight",
+    "Claude calls currently holding a concurrency slot.",
+)
+CLAUDE_PROMPT_CACHE_HIT_RATIO = Gauge(
+    "northstar_claude_prompt_cache_hit_ratio",
+    "Share of prompt input tokens served from Anthropic's prompt cache, by call site.",
+    ("route",),
+)
+CLAUDE_RETRIES = Counter(
+    "northstar_claude_retries_total",
+    "Claude calls retried after a transient failure, by call site and reason "
+    "(rate_limited, overloaded, server_error, connection).",
+    ("route", "reason"),
+)
+CLAUDE_HEDGES = Counter(
+    "northstar_claude_hedges_total",
+    "Hedged Claude calls by call site and outcome (won: the hedge answered first, "
+    "lost: the original did, skipped: no free concurrency slot to hedge with).",
+    ("route", "outcome"),
+)
+CLAUDE_CIRCUIT_STATE = Gauge(
+    "northstar_claude_circuit_state",
+    "Claude circuit breaker state (0 closed, 1 half-open, 2 open).",
+)
+
+JSON_PARSE_FAILURES = Counter(
+    "northstar_json_parse_failures_total",
+    "Claude outputs that were not strict JSON (stage=strict, the { ... } fallback "
+    "was tried) or could not be parsed at all (stage=failed).",
+    ("site", "stage"),
+)
+
+ANALYSIS_CACHE_REQUESTS = Counter(
+    "northstar_analysis_cache_requests_total",
+    "Scholarship analysis cache lookups by result (hit, miss).",
+    ("result",),
+)
+ANALYSIS_CACHE_HIT_RATIO = Gauge(
+    "northstar_analysis_cache_hit_ratio",
+    "Share of scholarship analysis requests served from the cache.",
+)
+
+MATCH_CACHE_REQUESTS = Counter(
+    "northstar_match_cache_requests_total",
+    "/match result cache lookups by result (hit, stale, miss).",
+    ("result",),
+)
+
+
+def _analysis_cache_hit_ratio() -> Dict[LabelValues, float]:
+    hits = ANALYSIS_CACHE_REQUESTS.value(result="hit")
+    total = hits + ANALYSIS_CACHE_REQUESTS.value(result="miss")
+    return {(): hits / total if total else 0.0}
+
+
+ANALYSIS_CACHE_HIT_RATIO.set_function(_analysis_cache_hit_ratio)
+
+
+def observe_claude_call(route: str, started: float, outcome: str, usage: object = None) -> None:
+    """Record one Claude call: latency since `started` (perf_counter) and token usage."""
+    CLAUDE_REQUEST_DURATION.observe(time.perf_counter() - started, route=route, outcome=outcome)
+    if usage is None:
+        return
+    for kind, field in (
+        ("input", "input_tokens"),
+        ("output", "output_tokens"),
+        ("cache_creation", "cache_creation_input_tokens"),
+        ("cache_read", "cache_read_input_tokens"),
+    ):
+        count = getattr(usage, field, None) or 0
+        if count:
+            CLAUDE_TOKENS.inc(count, route=route, kind=kind)
+
+
+# ---------- ASGI middleware ----------
+
+
+# Route label for requests no route matches (404s), so unknown URLs can't
+# create new series
+UNMATCHED = "unmatched"
+
+
+def _match_template(routes, scope, path: str, prefix: str) -> Optional[str]:
+    """
+    Path template of the first route fully matching `path`, looking inside
+    included routers and mounts, or None. Never returns the raw URL.
+    """
+    for route in routes:
+        included = getattr(route, "original_router", None)  # FastAPI's include_router wrapper
+        if included is not None:
+            context = getattr(route, "include_context", None)
+            inner = getattr(context, "prefix", "") or ""
+            if path.startswith(inner):
+                found = _match_template(
+                    included.routes, scope, path[len(inner):] or "/", prefix + inner
+                )
+                if found:
+                    return found
+            continue
+        if isinstance(route, Mount):
+            match = re.match(f"^{re.escape(route.path)}(/.*)?$", path)
+            if match:
+                found = _match_template(route.routes, scope, match.group(1) or "/", prefix + route.path)
+                if found:
+                    return found
+            continue
+        match, _ = route.matches({**scope, "path": path})
+        if match == Match.FULL:
+            return prefix + getattr(route, "path", "")
+    return None
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency and in-flight requests
+    per route template (e.g. /api/scholarships/{scholarship_id}), so ids
+    don't explode label cardinality. Streaming responses are timed until
+    their last chunk is sent.
+    """
+
+    def __init__(self, app, skip_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = frozenset(skip_paths)
+
+    def _route_template(self, scope) -> str:
+        """Template of the route that will handle `scope` (before dispatch)."""
+        return _match_template(scope["app"].router.routes, scope, scope["path"], "") or UNMATCHED
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = "500"
+        started = time.perf_counter()
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if not finished:
+                finished = True
+                HTTP_REQUESTS_IN_PROGRESS.dec(method=method, route=route)
+                # The router records the route it dispatched to; prefer that
+                matched = getattr(scope.get("route"), "path", None)
+                HTTP_REQUEST_DURATION.observe(
+                    time.perf_counter() - started,
+                    method=method,
+                    route=matched or route,
+                    status=status,
+                )
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method, route=route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
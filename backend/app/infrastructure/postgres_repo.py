@@ -0,0 +1,459 @@
+# backend/app/infrastructure/postgres_repo.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:  # only needed with CATALOG_BACKEND=postgres
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+from ..core.config import settings
+from .catalog_store import (
+    SCHOLARSHIPS_FILE,
+    SUCCESS_STORIES_FILE,
+    CatalogSnapshot,
+    CatalogStore,
+)
+from .structured_log import log_event
+
+# Postgres (e.g. Supabase) backend for the catalog and the analysis cache,
+# selected with CATALOG_BACKEND=postgres and DATABASE_URL.
+#
+# Every worker loads the catalog from the database into the same kind of
+# immutable CatalogSnapshot the JSON backend uses, so get_scholarship /
+# list_scholarships / get_winner_stories_for_scholarship and every derived
+# index keep working unchanged, and polls a cheap change stamp to hot-reload
+# edits made by any worker or by app.tools.import_catalog.
+#
+# Lookups and filtering stay in memory: the database is the shared source
+# of truth, not a query engine, so each worker still holds the whole
+# catalog (as with the JSON files). Only full-table reads, the change stamp
+# and the analysis cache run SQL.
+#
+# Full records live in a jsonb column; name, citizenship, category and
+# offered_by are copied into plain columns for ad-hoc SQL (dashboards,
+# the SQL console). asyncpg prepares every query once per connection and
+# reuses it (statement cache), so the queries below are constants with $n
+# parameters.
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS scholarships (
+    id          TEXT PRIMARY KEY,
+    name        TEXT,
+    citizenship TEXT,
+    category    TEXT,
+    offered_by  TEXT,
+    data        JSONB NOT NULL,
+    position    BIGSERIAL,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+-- Earlier schema versions indexed these columns; nothing queries them
+DROP INDEX IF EXISTS scholarships_citizenship_idx;
+DROP INDEX IF EXISTS scholarships_category_idx;
+DROP INDEX IF EXISTS scholarships_offered_by_idx;
+
+CREATE TABLE IF NOT EXISTS success_stories (
+    id             TEXT PRIMARY KEY,
+    scholarship_id TEXT NOT NULL,
+    data           JSONB NOT NULL,
+    position       BIGSERIAL,
+    updated_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+DROP INDEX IF EXISTS success_stories_scholarship_idx;
+
+CREATE TABLE IF NOT EXISTS scholarship_analyses (
+    scholarship_id TEXT NOT NULL,
+    content_hash   TEXT NOT NULL,
+    data           JSONB NOT NULL,
+    created_at     DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (scholarship_id, content_hash)
+);
+CREATE INDEX IF NOT EXISTS scholarship_analyses_created_idx ON scholarship_analyses (created_at);
+
+-- Edits made outside import_catalog (SQL console, Supabase dashboard) still
+-- bump updated_at, so the workers' change stamp sees them
+CREATE OR REPLACE FUNCTION northstar_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'scholarships_touch') THEN
+        CREATE TRIGGER scholarships_touch BEFORE UPDATE ON scholarships
+            FOR EACH ROW EXECUTE FUNCTION northstar_touch_updated_at();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'success_stories_touch') THEN
+        CREATE TRIGGER success_stories_touch BEFORE UPDATE ON success_stories
+            FOR EACH ROW EXECUTE FUNCTION northstar_touch_updated_at();
+    END IF;
+END;
+$$;
+"""
+
+# Change stamp per table: (row count, last update in microseconds)
+_STAMP_SQL = """
+SELECT
+    (SELECT count(*) FROM scholarships),
+    (SELECT coalesce((extract(epoch FROM max(updated_at)) * 1e6)::bigint, 0) FROM scholarships),
+    (SELECT count(*) FROM success_stories),
+    (SELECT coalesce((extract(epoch FROM max(updated_at)) * 1e6)::bigint, 0) FROM success_stories)
+"""
+_SELECT_SCHOLARSHIPS_SQL = "SELECT data FROM scholarships ORDER BY position"
+_SELECT_STORIES_SQL = "SELECT data FROM success_stories ORDER BY position"
+
+_UPSERT_SCHOLARSHIP_SQL = """
+INSERT INTO scholarships (id, name, citizenship, category, offered_by, data)
+VALUES ($1, $2, $3, $4, $5, $6)
+ON CONFLICT (id) DO UPDATE SET
+    name = EXCLUDED.name,
+    citizenship = EXCLUDED.citizenship,
+    category = EXCLUDED.category,
+    offered_by = EXCLUDED.offered_by,
+    data = EXCLUDED.data
+WHERE scholarships.data IS DISTINCT FROM EXCLUDED.data
+"""
+_UPSERT_STORY_SQL = """
+INSERT INTO success_stories (id, scholarship_id, data)
+VALUES ($1, $2, $3)
+ON CONFLICT (id) DO UPDATE SET
+    scholarship_id = EXCLUDED.scholarship_id,
+    data = EXCLUDED.data
+WHERE success_stories.data IS DISTINCT FROM EXCLUDED.data
+"""
+
+_GET_ANALYSIS_SQL = (
+    "SELECT data, created_at FROM scholarship_analyses "
+    "WHERE scholarship_id = $1 AND content_hash = $2"
+)
+_DELETE_OLD_ANALYSES_SQL = (
+    "DELETE FROM scholarship_analyses WHERE scholarship_id = $1 AND content_hash != $2"
+)
+_UPSERT_ANALYSIS_SQL = """
+INSERT INTO scholarship_analyses (scholarship_id, content_hash, data, created_at)
+VALUES ($1, $2, $3, $4)
+ON CONFLICT (scholarship_id, content_hash) DO UPDATE SET
+    data = EXCLUDED.data,
+    created_at = EXCLUDED.created_at
+"""
+
+
+async def _init_connection(conn: Any) -> None:
+    # jsonb <-> Python objects instead of strings
+    await conn.set_type_codec(
+        "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+    )
+
+
+class PostgresDatabase:
+    """
+    Bounded asyncpg connection pool plus the catalog / analysis queries.
+
+    The pool is bound to the event loop that opened it; call open() from
+    the app lifespan (or a CLI's asyncio.run) and close() on shutdown.
+    """
+
+    def __init__(self, dsn: str, min_size: int, max_size: int, command_timeout: float):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self._pool: Optional[Any] = None
+        self._open_lock = asyncio.Lock()
+
+    @property
+    def pool(self) -> Any:
+        if self._pool is None:
+            raise RuntimeError("Postgres pool is not open; call `await database.open()` first.")
+        return self._pool
+
+    async def open(self) -> None:
+        async with self._open_lock:
+            if self._pool is not None:
+                return
+            if asyncpg is None:
+                raise RuntimeError(
+                    "CATALOG_BACKEND=postgres needs the asyncpg package (pip install asyncpg)."
+                )
+            self._pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                command_timeout=self.command_timeout,
+                init=_init_connection,
+            )
+            async with self._pool.acquire() as conn:
+                await conn.execute(SCHEMA_SQL)
+
+    async def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
+
+    # ---------- catalog ----------
+
+    async def catalog_stamps(self) -> Tuple[Tuple[int, int], ...]:
+        """Cheap change detector for both tables: ((count, max updated_at us), ...)."""
+        row = await self.pool.fetchrow(_STAMP_SQL)
+        return ((row[0], row[1]), (row[2], row[3]))
+
+    async def fetch_catalog(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(scholarships, success stories) in insertion order, as plain dicts."""
+        async with self.pool.acquire() as conn:
+            # One repeatable-read transaction: both lists from the same state
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                scholarships = [
+                    r["data"] async for r in conn.cursor(_SELECT_SCHOLARSHIPS_SQL, prefetch=5000)
+                ]
+                stories = [
+                    r["data"] async for r in conn.cursor(_SELECT_STORIES_SQL, prefetch=5000)
+                ]
+        return scholarships, stories
+
+    async def import_catalog(
+        self,
+        scholarships: Iterable[Dict[str, Any]],
+        stories: Iterable[Dict[str, Any]],
+        prune: bool = False,
+    ) -> Tuple[int, int]:
+        """
+        Upsert records by id (unchanged rows are left alone, so they don't
+        trigger a reload). With prune=True, rows whose id isn't in the input
+        are deleted. Returns (scholarships, stories) written.
+        """
+        scholarship_rows = [
+            (
+                str(s.get("id")),
+                s.get("name"),
+                s.get("citizenship"),
+                s.get("category"),
+                s.get("offered_by"),
+                s,
+            )
+            for s in scholarships
+        ]
+        story_rows = [
+            (str(w.get("id")), str(w.get("scholarship_id")), w) for w in stories
+        ]
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(_UPSERT_SCHOLARSHIP_SQL, scholarship_rows)
+                await conn.executemany(_UPSERT_STORY_SQL, story_rows)
+                if prune:
+                    await conn.execute(
+                        "DELETE FROM scholarships WHERE NOT (id = ANY($1::text[]))",
+                        [r[0] for r in scholarship_rows],
+                    )
+                    await conn.execute(
+                        "DELETE FROM success_stories WHERE NOT (id = ANY($1::text[]))",
+                        [r[0] for r in story_rows],
+                    )
+        return len(scholarship_rows), len(story_rows)
+
+    # ---------- analyses ----------
+
+    async def get_analysis(
+        self, scholarship_id: str, record_hash: str, ttl_seconds: float
+    ) -> Optional[Dict[str, Any]]:
+        row = await self.pool.fetchrow(_GET_ANALYSIS_SQL, str(scholarship_id), record_hash)
+        if row is None:
+            return None
+        if ttl_seconds > 0 and time.time() - row["created_at"] > ttl_seconds:
+            return None
+        return row["data"]
+
+    async def set_analysis(
+        self, scholarship_id: str, record_hash: str, analysis: Dict[str, Any]
+    ) -> None:
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(_DELETE_OLD_ANALYSES_SQL, str(scholarship_id), record_hash)
+                await conn.execute(
+                    _UPSERT_ANALYSIS_SQL, str(scholarship_id), record_hash, analysis, time.time()
+                )
+
+    async def invalidate_analyses(self, scholarship_id: Optional[str] = None) -> int:
+        if scholarship_id is None:
+            status = await self.pool.execute("DELETE FROM scholarship_analyses")
+        else:
+            status = await self.pool.execute(
+                "DELETE FROM scholarship_analyses WHERE scholarship_id = $1",
+                str(scholarship_id),
+            )
+        return int(status.split()[-1])  # "DELETE <n>"
+
+    async def purge_expired_analyses(self, ttl_seconds: float) -> int:
+        if ttl_seconds <= 0:
+            return 0
+        status = await self.pool.execute(
+            "DELETE FROM scholarship_analyses WHERE created_at < $1",
+            time.time() - ttl_seconds,
+        )
+        return int(status.split()[-1])
+
+
+def _content_hash(scholarships: List[Dict[str, Any]], stories: List[Dict[str, Any]]) -> str:
+    digest = hashlib.sha256()
+    for part in (scholarships, stories):
+        digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class PostgresCatalogStore(CatalogStore):
+    """
+    CatalogStore whose source is Postgres instead of the JSON files.
+
+    The first snapshot is loaded by `await open()` (the app lifespan does
+    this), and the watcher polls catalog_stamps() to hot-reload changes.
+    Readers use snapshot() exactly as with the JSON backend.
+    """
+
+    def __init__(self, database: PostgresDatabase):
+        super().__init__(SCHOLARSHIPS_FILE, SUCCESS_STORIES_FILE)
+        self.database = database
+        self._swap_lock = threading.Lock()
+
+    async def open(self) -> None:
+        await self.database.open()
+        if self._snapshot is None:
+            await self._load(await self.database.catalog_stamps())
+
+    async def close(self) -> None:
+        await self.database.close()
+
+    def snapshot(self) -> CatalogSnapshot:
+        snap = self._snapshot
+        if snap is None:
+            raise RuntimeError(
+                "Postgres catalog is not loaded; call `await get_catalog_store().open()` first."
+            )
+        return snap
+
+    def reload_if_changed(self) -> bool:
+        raise RuntimeError("PostgresCatalogStore reloads asynchronously; use reload_if_changed_async().")
+
+    def _make_snapshot(
+        self,
+        version: int,
+        scholarships: List[Dict[str, Any]],
+        stories: List[Dict[str, Any]],
+        stamps: Tuple[Tuple[int, int], ...],
+    ) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot(
+            version=version,
+            content_hash=_content_hash(scholarships, stories),
+            scholarships=scholarships,
+            success_stories=stories,
+            source_stamps=stamps,
+        )
+        snapshot.build_all_derived()
+        return snapshot
+
+    async def _load(self, stamps: Tuple[Tuple[int, int], ...]) -> CatalogSnapshot:
+        scholarships, stories = await self.database.fetch_catalog()
+        return await self._install(stamps, scholarships, stories)
+
+    async def _install(
+        self,
+        stamps: Tuple[Tuple[int, int], ...],
+        scholarships: List[Dict[str, Any]],
+        stories: List[Dict[str, Any]],
+    ) -> CatalogSnapshot:
+        """Build a snapshot (derived indexes included) off the loop and swap it in."""
+        snapshot = await asyncio.to_thread(
+            self._make_snapshot, self._version + 1, scholarships, stories, stamps
+        )
+        with self._swap_lock:
+            self._version = snapshot.version
+            self._snapshot = snapshot  # atomic reference swap
+        return snapshot
+
+    async def reload_if_changed_async(self) -> bool:
+        """
+        Reload if either table changed since the live snapshot. Database
+        errors propagate (the watcher logs them and retries next poll); a
+        catalog the derived indexes can't be built from isn't retried until
+        the tables change again. Either way the old snapshot stays live.
+        """
+        current = self._snapshot
+        # Stamps first: a write landing mid-fetch triggers another reload
+        stamps = await self.database.catalog_stamps()
+        if current is not None and stamps in (current.source_stamps, self._failed_stamps):
+            return False
+        scholarships, stories = await self.database.fetch_catalog()
+        try:
+            snapshot = await self._install(stamps, scholarships, stories)
+        except Exception as e:
+            self._failed_stamps = stamps
+            log_event(
+                "catalog_reload_failed",
+                logging.WARNING,
+                version=current.version if current else 0,
+                error=str(e),
+            )
+            return False
+        log_event("catalog_reloaded", version=snapshot.version, source="postgres")
+        return True
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_if_changed_async()
+            except Exception as e:  # never let the watcher die
+                log_event("catalog_watcher_error", logging.WARNING, error=str(e))
+
+
+class PostgresAnalysisCache:
+    """Analysis cache stored in Postgres; same async interface as AnalysisCache."""
+
+    def __init__(self, database: PostgresDatabase, ttl_seconds: float):
+        self.database = database
+        self.ttl_seconds = ttl_seconds
+
+    async def aget(self, scholarship_id: str, record_hash: str) -> Optional[Dict[str, Any]]:
+        await self.database.open()
+        return await self.database.get_analysis(scholarship_id, record_hash, self.ttl_seconds)
+
+    async def aset(self, scholarship_id: str, record_hash: str, analysis: Dict[str, Any]) -> None:
+        await self.database.open()
+        await self.database.set_analysis(scholarship_id, record_hash, analysis)
+
+    async def ainvalidate(self, scholarship_id: Optional[str] = None) -> int:
+        await self.database.open()
+        return await self.database.invalidate_analyses(scholarship_id)
+
+    async def apurge_expired(self) -> int:
+        await self.database.open()
+        return await self.database.purge_expired_analyses(self.ttl_seconds)
+
+
+_database: Optional[PostgresDatabase] = None
+
+
+def get_database() -> PostgresDatabase:
+    """Return the process-wide Postgres pool wrapper (opened lazily / by the lifespan)."""
+    global _database
+
+    if _database is None:
+        if not settings.database_url:
+            raise RuntimeError("CATALOG_BACKEND=postgres needs DATABASE_URL. Check your .env.")
+        _database = PostgresDatabase(
+            settings.database_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            command_timeout=settings.db_command_timeout_seconds,
+        )
+
+    return _database
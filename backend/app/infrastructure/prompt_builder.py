@@ -0,0 +1,120 @@
+# backend/app/infrastructure/prompt_builder.py
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+# Anthropic prompt caching: a cache_control breakpoint caches the whole
+# prefix up to and including that block (tools -> system -> messages).
+# We use at most two of the four allowed breakpoints per request.
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _json_text(data: Any) -> str:
+    # sort_keys: the same data must always serialize to the same bytes,
+    # otherwise the cached prefix never matches
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+
+def build_request(
+    *,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: str,
+    static: Sequence[Dict[str, Any]] = (),
+    dynamic: Optional[Dict[str, Any]] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    messages.create() kwargs laid out static-first so repeat calls hit
+    Anthropic's prompt cache:
+
+      system prompt            [breakpoint]
+      static JSON blocks       [breakpoint after the last one]
+      dynamic (per-user) JSON  (never cached)
+
+    `static` is the data shared across users (catalog chunks, the
+    scholarship, the winner story), most stable first. Each block is a
+    JSON object carrying some of the keys the system prompt describes.
+    """
+    kwargs: Dict[str, Any] = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        # The tool definitions come before the system prompt in the cached
+        # prefix, so this breakpoint covers them too
+        "system": [{"type": "text", "text": system.strip(), "cache_control": _EPHEMERAL}],
+    }
+    if tools:
+        kwargs["tools"] = tools
+
+    content: List[Dict[str, Any]] = [
+        {"type": "text", "text": _json_text(block)} for block in static
+    ]
+    if content:
+        content[-1]["cache_control"] = _EPHEMERAL
+    if dynamic is not None:
+        content.append({"type": "text", "text": _json_text(dynamic)})
+
+    kwargs["messages"] = [{"role": "user", "content": content}]
+    return kwargs
+
+
+class CacheUsage:
+    """
+    Per-route token accounting from message.usage, including Anthropic's
+    prompt-cache counters:
+
+    - input_tokens: uncached input (after the last cache breakpoint)
+    - cache_creation_input_tokens: input written to the cache (1.25x price)
+    - cache_read_input_tokens: input served from the cache (0.1x price)
+
+    calls counts upstream calls; coalesced_calls counts calls that joined
+    an identical in-flight call (its tokens are under the route that
+    started it).
+    """
+
+    _FIELDS = (
+        "input_tokens",
+        "output_tokens",
+        "cache_creation_input_tokens",
+        "cache_read_input_tokens",
+    )
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, Dict[str, int]] = {}
+
+    def _totals(self, route: str) -> Dict[str, int]:
+        return self._routes.setdefault(
+            route, {"calls": 0, "coalesced_calls": 0, **{f: 0 for f in self._FIELDS}}
+        )
+
+    def record(self, route: str, usage: Any) -> None:
+        if usage is None:
+            return
+        totals = self._totals(route)
+        totals["calls"] += 1
+        for f in self._FIELDS:
+            totals[f] += getattr(usage, f, None) or 0
+
+    def record_coalesced(self, route: str) -> None:
+        """A call served by an identical in-flight call (no tokens of its own)."""
+        self._totals(route)["coalesced_calls"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for route, totals in self._routes.items():
+            prompt_tokens = (
+                totals["input_tokens"]
+                + totals["cache_creation_input_tokens"]
+                + totals["cache_read_input_tokens"]
+            )
+            out[route] = {
+                **totals,
+                "cache_hit_ratio": (
+                    totals["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+                ),
+            }
+        return out
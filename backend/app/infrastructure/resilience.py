@@ -0,0 +1,284 @@
+# backend/app/infrastructure/resilience.py
+
+from __future__ import annotations
+
+import email.utils
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional
+
+from anthropic import APIConnectionError, APIStatusError
+
+from ..core.config import settings
+from .structured_log import log_event
+
+# Upstream statuses worth retrying: timeouts, conflicts, rate limits,
+# server errors and 529 "overloaded"
+_RETRYABLE_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """
+    How one call site talks to Claude.
+
+    - max_retries / base_delay / max_delay: jittered exponential backoff
+      ("full jitter": sleep uniform(0, min(max_delay, base_delay * 2**n))).
+      A retry-after header from a 429/529 replaces the computed delay; if
+      it asks for more than max_retry_after, we give up instead of waiting.
+    - hedge: for idempotent calls, fire a duplicate request if the first
+      hasn't answered after hedge_after seconds (default: this route's
+      observed p95) and take whichever answers first.
+    - circuit_breaker: fail fast while upstream is marked as degraded.
+    """
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    max_retry_after: float = 30.0
+    hedge: bool = False
+    hedge_after: Optional[float] = None
+    circuit_breaker: bool = True
+
+
+# Per call site (the `route` label passed to ClaudeClient), on top of the
+# CallPolicy defaults. Analysis and match scoring are deterministic enough
+# to hedge; essays are long and expensive, so a hedge would double the
+# cost of exactly the slowest requests.
+DEFAULT_POLICIES: Dict[str, Dict[str, Any]] = {
+    "analysis": {"hedge": True},
+    "match_scoring": {"hedge": True},
+    # Non-critical: /match degrades to reason=None on failure
+    "match_reasons": {"max_retries": 1, "hedge": True},
+    "essays_variants": {"max_retries": 1},
+}
+
+_POLICY_FIELDS = frozenset(f.name for f in fields(CallPolicy))
+
+
+@lru_cache(maxsize=4)
+def _load_overrides(raw: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        log_event("invalid_claude_policies", logging.WARNING, error=str(e))
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def policy_for(route: str) -> CallPolicy:
+    """
+    The policy for a call site: CallPolicy with CLAUDE_MAX_RETRIES, then
+    DEFAULT_POLICIES[route], then CLAUDE_POLICIES[route], a JSON object
+    of per-route fields, e.g. '{"essays": {"max_retries": 0}}'.
+    """
+    merged: Dict[str, Any] = {"max_retries": settings.claude_max_retries}
+    merged.update(DEFAULT_POLICIES.get(route, {}))
+    merged.update(_load_overrides(settings.claude_policies).get(route) or {})
+    return CallPolicy(**{k: v for k, v in merged.items() if k in _POLICY_FIELDS})
+
+
+# ---------- retry classification / backoff ----------
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, APIStatusError):
+        return error.status_code in _RETRYABLE_STATUSES
+    # Connection errors include timeouts
+    return isinstance(error, APIConnectionError)
+
+
+def retry_reason(error: BaseException) -> str:
+    """Metric label for why a call is being retried."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return "connection"
+    if status == 429:
+        return "rate_limited"
+    if status == 529:
+        return "overloaded"
+    return "server_error"
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Seconds requested by retry-after-ms / retry-after (delta or HTTP date), if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            date = email.utils.parsedate_to_datetime(value)
+            return max(0.0, date.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(policy: CallPolicy, attempt: int, error: BaseException) -> Optional[float]:
+    """Seconds to wait before retry number `attempt` (0-based), or None to give up."""
+    requested = retry_after_seconds(error)
+    if requested is not None:
+        if requested > policy.max_retry_after:
+            return None
+        # A little jitter so a burst of 429s doesn't retry in lockstep
+        return requested + random.uniform(0, policy.base_delay)
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * (2 ** attempt)))
+
+
+# ---------- hedging ----------
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per route, for hedge thresholds."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def p95(self, route: str) -> Optional[float]:
+        """None until we have enough samples to trust the estimate."""
+        with self._lock:
+            samples = sorted(self._samples.get(route) or ())
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+
+# ---------- circuit breaker ----------
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling Claude while the circuit breaker is open.
+    retry_after is roughly how many seconds until a call may go through.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when, over the last `window` calls (at least
+    `min_calls`), the share of upstream failures reaches failure_ratio.
+    After `cooldown` seconds one probe call is let through (half-open):
+    success closes the circuit, failure re-opens it.
+
+    Only retryable upstream failures count; a 400 is our bug, not an
+    outage.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        cooldown: float = 30.0,
+    ):
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe: Optional[object] = None  # token of the in-flight half-open probe
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self) -> Optional[object]:
+        """
+        Raise CircuitOpenError unless a call may go upstream now. Returns the
+        probe token when this call is the half-open probe, else None; pass
+        it back to record().
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return None
+            remaining = self.cooldown - (time.monotonic() - self._opened_at)
+            if self._state == self.OPEN and remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    "Claude is unavailable (circuit open); try again shortly.", remaining
+                )
+            # Cooldown over: allow exactly one probe
+            if self._probe is not None:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    "Claude is unavailable (circuit half-open); try again shortly.", 1.0
+                )
+            self._state = self.HALF_OPEN
+            self._probe = object()
+            return self._probe
+
+    def record(self, failed: Optional[bool], token: Optional[object] = None) -> None:
+        """
+        Outcome of a call let through by before_call(), with the token it
+        returned. None = no verdict (cancelled, or an error that says
+        nothing about Claude's health).
+        """
+        with self._lock:
+            if token is not None or self._state != self.CLOSED:
+                # Only the probe decides a half-open circuit; calls that
+                # started before the trip don't count
+                if token is None or token is not self._probe:
+                    return
+                self._probe = None
+                if failed is None:
+                    return
+                if failed:
+                    self._trip()
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+            if failed is None:
+                return
+
+            self._outcomes.append(failed)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio
+            ):
+                self._trip()
+
+    def _trip(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        log_event("circuit_breaker_opened", logging.WARNING, cooldown_seconds=self.cooldown)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "rejected": self.rejected}
@@ -1,48 +1,126 @@
 # backend/app/infrastructure/scholarship_repo.py
 
-import json
-from pathlib import Path
-from functools import lru_cache
-from typing import List, Dict, Optional
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Sequence, Tuple
 
-# Adjust this path if your structure is slightly different
-BASE_DIR = Path(__file__).resolve().parent.parent  # points to backend/app
-DATA_DIR = BASE_DIR / "data"
+import numpy as np
 
-SCHOLARSHIPS_FILE = DATA_DIR / "scholarships.json"
-WINNER_STORIES_FILE = DATA_DIR / "success_stories.json"
+from .catalog_binary import ScholarshipView
+from .catalog_store import CatalogSnapshot, get_snapshot, register_derived
+from .text_vectorizer import TfidfIndex
 
+def normalize_legal_status(scholarship: Dict) -> str:
+    """
+    Return "domestic", "international" or "both" for a scholarship.
 
-@lru_cache(maxsize=1)
-def _load_scholarships() -> List[Dict]:
-    with open(SCHOLARSHIPS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    Uses an explicit legal_status if present, otherwise derives it from the
+    "citizenship" string (e.g. "Domestic" or "Domestic;International").
+    If we really can't tell, treat it as "both" so it isn't silently dropped.
+    """
+    legal_raw = (scholarship.get("legal_status") or "").lower().strip()
+    if legal_raw:
+        return legal_raw
 
+    citizenship_raw = (scholarship.get("citizenship") or "").lower()
+    has_domestic = "domestic" in citizenship_raw
+    has_international = "international" in citizenship_raw
 
-@lru_cache(maxsize=1)
-def _load_winner_stories() -> List[Dict]:
-    with open(WINNER_STORIES_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if has_domestic and has_international:
+        return "both"
+    if has_international:
+        return "international"
+    if has_domestic:
+        return "domestic"
+    return "both"
+
+
+@dataclass(frozen=True)
+class ScholarshipCatalog:
+    """
+    The scholarship list plus structures derived from it once per load:
+    - by_id: id (as string) -> raw record, for O(1) lookups
+    - normalized: the records with legal_status filled in (views over the
+      compiled catalog, or dict copies for a plain list), in catalog order
+
+    Who may apply to what is decided by core/eligibility.py.
+    """
+    scholarships: Sequence[Dict]
+    by_id: Dict[str, Dict]
+    normalized: List[Dict]
+
+
+def _with_legal_status(record: Dict, legal: str) -> Dict:
+    if isinstance(record, ScholarshipView):
+        return record.with_legal_status(legal)  # no copy of the row
+    return {**record, "legal_status": legal}
+
+
+def build_catalog(scholarships: Sequence[Dict]) -> ScholarshipCatalog:
+    by_id: Dict[str, Dict] = {}
+    normalized: List[Dict] = []
+
+    for s in scholarships:
+        by_id.setdefault(str(s.get("id")), s)
+        normalized.append(_with_legal_status(s, normalize_legal_status(s)))
+
+    return ScholarshipCatalog(scholarships=scholarships, by_id=by_id, normalized=normalized)
+
+
+def _build_winner_story_index(snapshot: CatalogSnapshot) -> Dict[str, List[Dict]]:
+    index: Dict[str, List[Dict]] = defaultdict(list)
+    for w in snapshot.success_stories:
+        index[str(w.get("scholarship_id"))].append(w)
+    return dict(index)
+
+
+# Rebuilt by the catalog store whenever the data files change
+register_derived("scholarship_catalog", lambda snap: build_catalog(snap.scholarships))
+register_derived("winner_stories_by_scholarship", _build_winner_story_index)
+register_derived("tfidf_index", lambda snap: TfidfIndex(snap.scholarships))
+
+
+def _load_catalog() -> ScholarshipCatalog:
+    return get_snapshot().derived("scholarship_catalog")
 
 
 def get_scholarship(scholarship_id: str) -> Optional[Dict]:
     """Return a single scholarship dict or None."""
-    target = str(scholarship_id)
-    for s in _load_scholarships():
-        if str(s.get("id")) == target:
-            return s
-    return None
+    return _load_catalog().by_id.get(str(scholarship_id))
 
 
-def list_scholarships() -> List[Dict]:
-    """Return all scholarships."""
-    return _load_scholarships()
+def list_scholarships() -> Sequence[Dict]:
+    """Return all scholarships (read-only; may be views over the compiled catalog)."""
+    return _load_catalog().scholarships
 
 
 def get_winner_stories_for_scholarship(scholarship_id: str) -> List[Dict]:
     """Return winner stories linked to a scholarship_id."""
-    target = str(scholarship_id)
+    index = get_snapshot().derived("winner_stories_by_scholarship")
+    return index.get(str(scholarship_id), [])
+
+
+def similar_scholarships(
+    texts: Sequence[str],
+    k: int = 10,
+    candidate_mask: Optional[np.ndarray] = None,
+    snapshot: Optional[CatalogSnapshot] = None,
+) -> List[Tuple[Dict, float]]:
+    """
+    [(scholarship, similarity), ...] by TF-IDF cosine similarity between
+    `texts` (e.g. a profile's experiences / interests / awards / skills) and
+    the catalog, best first, optionally restricted to the rows set in
+    candidate_mask (bool per catalog row, e.g. an eligibility mask).
+
+    Pass the snapshot candidate_mask was computed from, so the mask, the
+    index and the returned records all come from the same catalog version.
+    """
+    snapshot = snapshot or get_snapshot()
+    index = snapshot.derived("tfidf_index")
+    if candidate_mask is not None and len(candidate_mask) != index.n_docs:
+        raise ValueError("candidate_mask doesn't match the catalog snapshot")
+    by_id = snapshot.derived("scholarship_catalog").by_id
     return [
-        w for w in _load_winner_stories()
-        if str(w.get("scholarship_id")) == target
+        (by_id[sid], similarity)
+        for sid, similarity in index.top_k(texts, k=k, candidate_mask=candidate_mask)
     ]
@@ -2,13 +2,136 @@
 
 import re
 import json
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, Iterable, List, Sequence, Set, Tuple
 
 from ..infrastructure.ai_client import ask_claude
+from ..infrastructure.metrics import JSON_PARSE_FAILURES
 
 
 # ---------- 1. LOCAL KEYWORD-BASED SCORE (FAST, CHEAP) ----------
 
+# Phrases that show an essay speaks to a priority. Priority ids without a
+# lexicon fall back to their own text ("research_plan" -> "research plan").
+PRIORITY_LEXICONS: Dict[str, Tuple[str, ...]] = {
+    "academic_excellence": (
+        "academic excellence", "academic achievement", "academic standing",
+        "dean's list", "honour roll", "honor roll", "gpa", "top of my class",
+        "high marks", "scholarly", "coursework", "grades", "academic",
+    ),
+    "leadership": (
+        "leadership", "leader", "led", "lead", "president", "captain",
+        "founded", "co-founded", "organized", "organised", "spearheaded",
+        "coordinated", "mentored", "executive", "took charge",
+    ),
+    "community_service": (
+        "community service", "volunteer", "volunteered", "volunteering",
+        "community", "outreach", "charity", "non-profit", "nonprofit",
+        "food bank", "fundraiser", "fundraising", "giving back", "tutored",
+    ),
+    "research_potential": (
+        "research", "researcher", "lab", "laboratory", "experiment",
+        "hypothesis", "thesis", "publication", "published", "data",
+        "investigate", "investigated", "discovery", "supervisor",
+    ),
+    "financial_need": (
+        "financial need", "financial hardship", "financial barriers",
+        "low-income", "low income", "afford", "tuition", "worked part-time",
+        "part-time job", "support my family", "first-generation",
+        "first generation", "bursary", "financial aid",
+    ),
+    "adversity_or_resilience": (
+        "adversity", "resilience", "resilient", "overcame", "overcome",
+        "hardship", "struggle", "struggled", "setback", "obstacle",
+        "persevered", "perseverance", "barrier", "challenges",
+    ),
+    "innovation": (
+        "innovation", "innovative", "invented", "prototype", "designed",
+        "built", "startup", "new approach", "creative solution",
+    ),
+    "global_perspective": (
+        "global", "international", "abroad", "cultures", "cross-cultural",
+        "immigrated", "worldwide",
+    ),
+    "equity_advocacy": (
+        "equity", "advocacy", "advocate", "inclusion", "diversity",
+        "underrepresented", "representation", "justice",
+    ),
+    "mentorship": ("mentorship", "mentor", "mentored", "mentee", "coached"),
+}
+
+# Distinct lexicon phrases needed for a priority to count as fully covered
+_FULL_COVERAGE_HITS = 3
+
+
+def _phrases_for(priority_id: str) -> Tuple[str, ...]:
+    return PRIORITY_LEXICONS.get(priority_id) or (priority_id.replace("_", " ").lower(),)
+
+
+class CompiledScorer:
+    """
+    All lexicon phrases for a set of priorities compiled into ONE regex
+    alternation (longest phrases first, word boundaries), plus a map from
+    each phrase back to the priorities that use it.
+
+    Scoring an essay is a single finditer() pass over the lower-cased text.
+    """
+
+    def __init__(self, priority_ids: Iterable[str]):
+        self.priority_ids = tuple(priority_ids)
+        self.phrase_owners: Dict[str, List[str]] = {}
+        for pid in self.priority_ids:
+            for phrase in _phrases_for(pid):
+                self.phrase_owners.setdefault(phrase.lower(), []).append(pid)
+
+        phrases = sorted(self.phrase_owners, key=len, reverse=True)
+        self.pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(p) for p in phrases) + r")\b"
+        ) if phrases else None
+
+    def coverage(self, essay_text: str) -> Dict[str, float]:
+        """Per-priority coverage in [0, 1] (distinct phrases hit / _FULL_COVERAGE_HITS)."""
+        hits: Dict[str, Set[str]] = {pid: set() for pid in self.priority_ids}
+        if self.pattern is not None:
+            for m in self.pattern.finditer(essay_text.lower()):
+                phrase = m.group(0)
+                for pid in self.phrase_owners[phrase]:
+                    hits[pid].add(phrase)
+
+        return {
+            pid: min(len(found) / _FULL_COVERAGE_HITS, 1.0)
+            for pid, found in hits.items()
+        }
+
+    def score(self, essay_text: str, weights: Dict[str, float]) -> Tuple[float, Dict[str, float]]:
+        """(score capped at 100, per-priority coverage breakdown)."""
+        breakdown = self.coverage(essay_text)
+        score = sum(weights.get(pid, 0.0) * cov for pid, cov in breakdown.items())
+        return min(score, 100.0), breakdown
+
+
+@lru_cache(maxsize=256)
+def get_compiled_scorer(priority_ids: FrozenSet[str]) -> CompiledScorer:
+    """Compile (once) the scorer for a set of priority ids."""
+    return CompiledScorer(sorted(priority_ids))
+
+
+def score_essay_breakdown(
+    essay_text: str, weights: Dict[str, float]
+) -> Tuple[float, Dict[str, float]]:
+    """Local score plus the per-priority coverage it was computed from."""
+    scorer = get_compiled_scorer(frozenset(weights))
+    return scorer.score(essay_text, weights)
+
+
+def score_essays_batch(
+    essay_texts: Sequence[str], weights: Dict[str, float]
+) -> List[Tuple[float, Dict[str, float]]]:
+    """Score many drafts against the same weights with one compiled scorer."""
+    scorer = get_compiled_scorer(frozenset(weights))
+    return [scorer.score(text, weights) for text in essay_texts]
+
+
 def score_essay_local(essay_text: str, weights: Dict[str, float]) -> float:
     """
     Simple keyword-based score function for hackathon demo.
@@ -24,27 +147,18 @@ def score_essay_local(essay_text: str, weights: Dict[str, float]) -> float:
             }
 
     Logic:
-        - Convert essay to lowercase
-        - For each priority ID:
-            - Replace underscores with spaces to create a keyword
-            - If keyword is found in essay => add its weight
+        - Each priority ID has a lexicon of synonyms/phrases (PRIORITY_LEXICONS);
+          unknown IDs use the ID text itself ("research_plan" -> "research plan")
+        - All lexicons are compiled once into a single regex and the essay is
+          scanned in one pass
+        - Each priority contributes weight * coverage, where coverage grows
+          with the number of distinct phrases found (full at 3)
         - Result is capped to 100
 
     This is a deterministic baseline that doesn't call Claude.
     """
-
-    score = 0.0
-    text = essay_text.lower()
-
-    for priority_id, weight in weights.items():
-        keyword = priority_id.replace("_", " ").lower()
-
-        # Word boundary regex to avoid partial matches
-        if re.search(rf"\b{re.escape(keyword)}\b", text):
-            score += weight
-
-    # Normalize score to 0–100
-    return min(score, 100.0)
+    score, _ = score_essay_breakdown(essay_text, weights)
+    return score
 
 
 # ---------- 2. CLAUDE + WEB CONTEXT SCORE (SMART, RICH) ----------
@@ -119,8 +233,12 @@ Here is the STUDENT ESSAY:
 \"\"\"{essay_text}\"\"\"
 """
 
-    raw = await ask_claude(prompt, max_tokens=800)
-    result = json.loads(raw)
+    raw = await ask_claude(prompt, max_tokens=800, route="scoring_engine")
+    try:
+        result = json.loads(raw)
+    except json.JSONDecodeError:
+        JSON_PARSE_FAILURES.inc(site="scoring_engine", stage="failed")
+        raise
 
     # Safety: ensure "score" exists and is a float
     score_val = float(result.get("score", 0.0))
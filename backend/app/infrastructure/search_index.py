@@ -0,0 +1,265 @@
+# backend/app/infrastructure/search_index.py
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .catalog_store import CatalogSnapshot, get_snapshot, register_derived
+from .analysis_cache import content_hash
+from .scholarship_repo import normalize_legal_status
+
+
+# Fields that are searchable, with a BM25F-style boost (term counts are
+# multiplied, so a hit in the name counts more than one in the description).
+FIELD_BOOSTS: Dict[str, int] = {
+    "name": 3,
+    "category": 2,
+    "offered_by": 2,
+    "description": 1,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the to who with will their "
+    "be been has have this that".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _split_labels(value: Optional[str]) -> Set[str]:
+    """'Academic Merit; Community, Other' -> {'academic merit', 'community', 'other'}"""
+    return {part.strip().lower() for part in re.split(r"[;,]", value or "") if part.strip()}
+
+
+class _Doc:
+    __slots__ = ("record", "fingerprint", "length", "legal_status", "categories", "offered_by")
+
+    def __init__(self, record: Dict[str, Any], fingerprint: str, length: int):
+        self.record = record
+        self.fingerprint = fingerprint
+        self.length = length
+        self.legal_status = normalize_legal_status(record)
+        self.categories = _split_labels(record.get("category"))
+        self.offered_by = (record.get("offered_by") or "").strip().lower()
+
+
+class SearchIndex:
+    """
+    In-memory inverted index with BM25 ranking over the scholarship catalog.
+
+    The index is updated incrementally: sync() diffs the catalog against what
+    is indexed (by id + content hash) and only re-indexes added, changed or
+    removed scholarships. All reads and writes go through one lock, so a
+    background sync never races a query.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)  # term -> {doc_id: tf}
+        self._docs: Dict[str, _Doc] = {}
+        self._order: Dict[str, int] = {}  # doc_id -> catalog position (tie-breaker)
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self.synced_version = 0
+
+    def copy(self) -> "SearchIndex":
+        """An independent copy, to sync a new catalog into without touching this one."""
+        with self._lock:
+            other = SearchIndex(self.k1, self.b)
+            other._postings = defaultdict(
+                dict, {term: dict(postings) for term, postings in self._postings.items()}
+            )
+            other._docs = dict(self._docs)  # _Doc objects are never mutated
+            other._order = dict(self._order)
+            other._total_length = self._total_length
+            other.synced_version = self.synced_version
+        return other
+
+    # ---------- indexing ----------
+
+    def _add(self, doc_id: str, record: Dict[str, Any], fingerprint: str) -> None:
+        counts: Counter = Counter()
+        for field, boost in FIELD_BOOSTS.items():
+            for term in tokenize(str(record.get(field) or "")):
+                counts[term] += boost
+
+        for term, tf in counts.items():
+            self._postings[term][doc_id] = tf
+
+        length = sum(counts.values())
+        self._docs[doc_id] = _Doc(record, fingerprint, length)
+        self._total_length += length
+
+    def _remove(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for field in FIELD_BOOSTS:
+            for term in tokenize(str(doc.record.get(field) or "")):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def sync(self, scholarships: Iterable[Dict[str, Any]], version: int = 0) -> Tuple[int, int]:
+        """
+        Bring the index in line with the given catalog.
+        Returns (docs re-indexed, docs removed).
+        """
+        with self._lock:
+            seen: Dict[str, int] = {}
+            added = 0
+            for position, record in enumerate(scholarships):
+                doc_id = str(record.get("id"))
+                if doc_id in seen:
+                    continue  # first record wins, same as get_scholarship
+                seen[doc_id] = position
+
+                fingerprint = content_hash(record)
+                current = self._docs.get(doc_id)
+                if current is not None and current.fingerprint == fingerprint:
+                    continue
+                if current is not None:
+                    self._remove(doc_id)
+                self._add(doc_id, record, fingerprint)
+                added += 1
+
+            stale = [doc_id for doc_id in self._docs if doc_id not in seen]
+            for doc_id in stale:
+                self._remove(doc_id)
+
+            self._order = seen
+            self.synced_version = version
+            return added, len(stale)
+
+    # ---------- querying ----------
+
+    def _matches_filters(
+        self,
+        doc: _Doc,
+        citizenship: Optional[str],
+        category: Optional[str],
+        offered_by: Optional[str],
+    ) -> bool:
+        if citizenship and doc.legal_status not in (citizenship, "both"):
+            return False
+        if category and category not in doc.categories:
+            return False
+        if offered_by and doc.offered_by != offered_by:
+            return False
+        return True
+
+    def search(
+        self,
+        query: str,
+        citizenship: Optional[str] = None,
+        category: Optional[str] = None,
+        offered_by: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return every matching (doc_id, score), best first (ties in catalog
+        order). An empty query returns all documents that pass the filters.
+        citizenship filters on eligibility ("domestic" also includes "both").
+        """
+        citizenship = (citizenship or "").strip().lower() or None
+        category = (category or "").strip().lower() or None
+        offered_by = (offered_by or "").strip().lower() or None
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if n_docs == 0:
+                return []
+
+            terms = tokenize(query)
+            if terms:
+                avg_length = self._total_length / n_docs
+                scores: Dict[str, float] = defaultdict(float)
+                for term in set(terms):
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    df = len(postings)
+                    idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                    for doc_id, tf in postings.items():
+                        length_norm = 1.0 - self.b + self.b * self._docs[doc_id].length / avg_length
+                        scores[doc_id] += idf * tf * (self.k1 + 1.0) / (tf + self.k1 * length_norm)
+            else:
+                scores = {doc_id: 0.0 for doc_id in self._docs}
+
+            hits = [
+                (doc_id, score)
+                for doc_id, score in scores.items()
+                if self._matches_filters(self._docs[doc_id], citizenship, category, offered_by)
+            ]
+            hits.sort(key=lambda hit: (-hit[1], self._order.get(hit[0], 0)))
+            return hits
+
+    def record(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(doc_id)
+        return doc.record if doc else None
+
+    def position(self, doc_id: str) -> int:
+        return self._order.get(doc_id, 0)
+
+
+# ---------- cursor pagination ----------
+
+
+def encode_cursor(score: float, position: int) -> str:
+    """Opaque keyset cursor: resume after the hit with this (score, position)."""
+    raw = json.dumps({"s": round(score, 9), "p": position}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(data["s"]), int(data["p"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# ---------- per-snapshot index ----------
+
+
+# The most recently built index, used as the starting point for the next
+# one so only added / changed / removed scholarships are re-tokenized
+_latest_index: Optional[SearchIndex] = None
+_latest_lock = threading.Lock()
+
+
+def _build_search_index(snapshot: CatalogSnapshot) -> SearchIndex:
+    global _latest_index
+
+    with _latest_lock:
+        base = _latest_index
+    index = base.copy() if base is not None else SearchIndex()
+    index.sync(snapshot.scholarships, version=snapshot.version)
+    with _latest_lock:
+        if _latest_index is None or _latest_index.synced_version < index.synced_version:
+            _latest_index = index
+    return index
+
+
+# Each snapshot owns its index, so /search only ever serves a catalog that
+# went live (a reload that fails after this build leaves the old one in use)
+register_derived("search_index", _build_search_index)
+
+
+def get_search_index() -> SearchIndex:
+    """The search index, synced to the live catalog snapshot."""
+    return get_snapshot().derived("search_index")
@@ -0,0 +1,163 @@
+# backend/app/infrastructure/structured_log.py
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from ..core.config import settings
+
+# Structured (JSON lines) logging that never blocks the request path:
+# callers put records on an in-memory queue, and a QueueListener thread
+# does the formatting and I/O.
+#
+#   northstar        -> stdout
+#   northstar.trace  -> TRACE_EXPORT_PATH (JSON lines), if set
+
+_LOGGER_NAME = "northstar"
+_TRACE_LOGGER_NAME = "northstar.trace"
+
+_QUEUE_SIZE = 10_000
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+_atexit_registered = False
+_dropped = 0
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; skip the default
+        # prepare(), which formats the message on the caller's thread.
+        return record
+
+
+class _NameFilter(logging.Filter):
+    def __init__(self, name: str, include: bool):
+        super().__init__()
+        self.target = name
+        self.include = include
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (record.name == self.target) == self.include
+
+
+def _setup() -> None:
+    global _listener, _atexit_registered
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        formatter = _JsonFormatter()
+        handlers = []
+
+        stdout = logging.StreamHandler(sys.stdout)
+        stdout.setFormatter(formatter)
+        stdout.addFilter(_NameFilter(_TRACE_LOGGER_NAME, include=False))
+        handlers.append(stdout)
+
+        if settings.trace_export_path:
+            path = Path(settings.trace_export_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            traces = logging.FileHandler(path, encoding="utf-8")
+            traces.setFormatter(formatter)
+            traces.addFilter(_NameFilter(_TRACE_LOGGER_NAME, include=True))
+            handlers.append(traces)
+
+        log_queue: queue.Queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        logger = logging.getLogger(_LOGGER_NAME)
+        logger.setLevel(settings.log_level.upper())
+        logger.propagate = False
+        logger.handlers = [_DroppingQueueHandler(log_queue)]
+        # Exported traces don't depend on LOG_LEVEL
+        logging.getLogger(_TRACE_LOGGER_NAME).setLevel(logging.INFO)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _listener.start()
+        # stop_logging() clears _listener, so _setup can run again after it
+        if not _atexit_registered:
+            atexit.register(stop_logging)
+            _atexit_registered = True
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread (app shutdown)."""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        logging.getLogger(_LOGGER_NAME).handlers = []
+
+
+def log_event(event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Queue one structured log line: {"ts", "level", "event", "trace_id", **fields}
+    (trace_id only inside a traced request).
+    """
+    if _listener is None:
+        _setup()
+    from .tracing import current_trace  # tracing exports through this module
+
+    trace = current_trace()
+    if trace is not None:
+        fields.setdefault("trace_id", trace.trace_id)
+    logging.getLogger(_LOGGER_NAME).log(level, event, extra={"fields": fields})
+
+
+def log_trace(record: dict) -> None:
+    """Queue one exported request trace (see tracing.TracingMiddleware)."""
+    if _listener is None:
+        _setup()
+    logging.getLogger(_TRACE_LOGGER_NAME).info("trace", extra={"fields": record})
+
+
+def log_model_output(site: str, raw_text: str) -> None:
+    """
+    Log raw Claude output for debugging, sampled (LOG_MODEL_OUTPUT_SAMPLE_RATE)
+    and truncated (LOG_MODEL_OUTPUT_MAX_CHARS) so multi-KB completions don't
+    flood the logs.
+    """
+    if random.random() >= settings.log_model_output_sample_rate:
+        return
+    limit = settings.log_model_output_max_chars
+    log_event(
+        "claude_output",
+        site=site,
+        chars=len(raw_text),
+        truncated=len(raw_text) > limit,
+        text=raw_text[:limit],
+    )
+
+
+def dropped_records() -> int:
+    """Records dropped because the log queue was full."""
+    return _dropped
@@ -2,25 +2,22 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, Tuple
 
-# Path to the success stories JSON file
-_DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "success_stories.json"
+import numpy as np
+
+from .catalog_store import get_snapshot, register_derived
+
+# style_profile attributes callers can filter stories on
+STYLE_ATTRIBUTES = ("hook_style", "tone", "emotional_pacing")
 
 
 def _load_success_stories() -> List[Dict[str, Any]]:
-    """Load all success stories from the local JSON file."""
-    try:
-        with _DATA_PATH.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"[warning] success stories file not found: {_DATA_PATH}")
-        return []
-    except json.JSONDecodeError:
-        print(f"[warning] invalid JSON in success stories file: {_DATA_PATH}")
-        return []
+    """
+    All success stories from the live catalog snapshot (the file is parsed
+    once per change, not on every call; missing/invalid files give []).
+    """
+    return get_snapshot().success_stories
 
 
 def list_success_stories() -> List[Dict[str, Any]]:
@@ -30,6 +27,135 @@ def list_success_stories() -> List[Dict[str, Any]]:
     return _load_success_stories()
 
 
+class StoryIndex:
+    """
+    Winner stories compiled for vectorized matching (built once per catalog
+    snapshot).
+
+    - columns: priority name -> dense column index
+    - matrix: (n_stories x n_priorities) float32, 1.0 where the story lists
+      that priority (its bitmask, usable directly as weights)
+    - style_masks: attribute -> value -> boolean mask over stories, for
+      hook_style / tone / emotional_pacing filters
+
+    Scoring every story against a priority weight profile is then a single
+    matrix-vector product.
+    """
+
+    def __init__(self, stories: List[Dict[str, Any]]):
+        self.stories = stories
+        self.columns: Dict[str, int] = {}
+        for story in stories:
+            for p in story.get("priorities") or []:
+                self.columns.setdefault(p, len(self.columns))
+
+        self.matrix = np.zeros((len(stories), len(self.columns)), dtype=np.float32)
+        for row, story in enumerate(stories):
+            for p in story.get("priorities") or []:
+                self.matrix[row, self.columns[p]] += 1.0
+
+        self.style_masks: Dict[str, Dict[str, np.ndarray]] = {}
+        for attr in STYLE_ATTRIBUTES:
+            values = [
+                (story.get("style_profile") or {}).get(attr) for story in stories
+            ]
+            self.style_masks[attr] = {
+                value: np.array([v == value for v in values], dtype=bool)
+                for value in set(values)
+                if value
+            }
+
+    def style_values(self, attr: str) -> List[str]:
+        """Distinct values of one style attribute (e.g. every hook_style)."""
+        return sorted(self.style_masks.get(attr, {}))
+
+    def _query_vector(self, priority_weights: Dict[str, float]) -> np.ndarray:
+        query = np.zeros(len(self.columns), dtype=np.float32)
+        for name, weight in priority_weights.items():
+            col = self.columns.get(name)
+            if col is not None:
+                query[col] = weight
+        return query
+
+    def _filter_mask(self, style_filters: Dict[str, Optional[str]]) -> Optional[np.ndarray]:
+        mask: Optional[np.ndarray] = None
+        for attr, value in style_filters.items():
+            if value is None:
+                continue
+            attr_mask = self.style_masks.get(attr, {}).get(value)
+            if attr_mask is None:
+                attr_mask = np.zeros(len(self.stories), dtype=bool)
+            mask = attr_mask if mask is None else (mask & attr_mask)
+        return mask
+
+    def top_k(
+        self,
+        priority_weights: Dict[str, float],
+        k: int = 1,
+        **style_filters: Optional[str],
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Return up to k (story, score) pairs, best first. The score is the sum
+        of priority weights the story shares with priority_weights. Ties keep
+        file order. style_filters: hook_style=..., tone=..., emotional_pacing=...
+        """
+        if not self.stories or k <= 0:
+            return []
+
+        scores = self.matrix @ self._query_vector(priority_weights)
+
+        mask = self._filter_mask(style_filters)
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+        else:
+            candidates = np.arange(len(self.stories))
+
+        candidate_scores = scores[candidates]
+        k = min(k, candidates.size)
+        if k == 1:
+            top = np.array([np.argmax(candidate_scores)])  # first max, like a linear scan
+        else:
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+            top = top[np.lexsort((top, -candidate_scores[top]))]
+
+        return [
+            (self.stories[candidates[i]], float(candidate_scores[i])) for i in top
+        ]
+
+
+register_derived("story_index", lambda snap: StoryIndex(snap.success_stories))
+
+
+def get_story_index() -> StoryIndex:
+    """The story index for the live catalog snapshot."""
+    return get_snapshot().derived("story_index")
+
+
+def find_matching_stories(
+    priority_weights: Dict[str, float],
+    k: int = 3,
+    hook_style: Optional[str] = None,
+    tone: Optional[str] = None,
+    emotional_pacing: Optional[str] = None,
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Top-k success stories for a priority weight profile, as (story, score)
+    pairs best first, optionally restricted to a style_profile
+    hook_style / tone / emotional_pacing.
+    """
+    if not priority_weights:
+        return []
+    return get_story_index().top_k(
+        priority_weights,
+        k=k,
+        hook_style=hook_style,
+        tone=tone,
+        emotional_pacing=emotional_pacing,
+    )
+
+
 def find_best_matching_story(priority_weights: Dict[str, float]) -> Optional[Dict[str, Any]]:
     """
     Determine the most compatible success story for a scholarship
@@ -47,24 +173,11 @@ def find_best_matching_story(priority_weights: Dict[str, float]) -> Optional[Dic
 
     Scoring rule:
         sum of scholarship priority weights *matching that story's priorities*
+        (one matrix-vector product over the precomputed StoryIndex)
 
     Returns:
         A single success story dict (the best match),
         or None if no stories match.
     """
-    stories = _load_success_stories()
-    if not stories or not priority_weights:
-        return None
-
-    best_story: Optional[Dict[str, Any]] = None
-    best_score: float = -1.0
-
-    for story in stories:
-        story_prios = story.get("priorities") or []
-        score = sum(priority_weights.get(p, 0.0) for p in story_prios)
-
-        if score > best_score:
-            best_score = score
-            best_story = story
-
-    return best_story
+    best = find_matching_stories(priority_weights, k=1)
+    return best[0][0] if best else None
@@ -0,0 +1,179 @@
+# backend/app/infrastructure/text_vectorizer.py
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Offline TF-IDF over the scholarship catalog, for text similarity between
+# a student's profile and scholarship descriptions (no network, no model).
+#
+# The document matrix is kept column-wise (term -> the rows it occurs in,
+# with their weights), i.e. a CSC sparse matrix in three NumPy arrays.
+# Scoring a profile is a sparse matrix-vector product: gather the postings
+# of the profile's terms and sum them per row with np.bincount.
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the to who with will their "
+    "be been has have this that i my me we our".split()
+)
+
+# Fields of a scholarship that describe it, with a term-count boost
+DOC_FIELDS: Dict[str, int] = {
+    "name": 2,
+    "category": 2,
+    "description": 1,
+}
+
+# Profile fields compared against the catalog
+PROFILE_FIELDS: Tuple[str, ...] = ("program", "experiences", "interests", "awards", "skills")
+
+
+def _terms(text: str) -> List[str]:
+    """Unigrams plus adjacent-word bigrams ("computer science" -> ..., "computer_science")."""
+    words = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+def _document_counts(scholarship: Dict[str, Any]) -> Counter:
+    counts: Counter = Counter()
+    for field, boost in DOC_FIELDS.items():
+        field_counts = Counter(_terms(str(scholarship.get(field) or "")))
+        if boost != 1:
+            for term in field_counts:
+                field_counts[term] *= boost
+        counts.update(field_counts)
+    return counts
+
+
+def profile_text(profile: Dict[str, Any]) -> List[str]:
+    """The free-text parts of a UserProfileInput, one string per entry."""
+    parts: List[str] = []
+    for field in PROFILE_FIELDS:
+        value = profile.get(field)
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, (list, tuple)):
+            parts.extend(str(v) for v in value)
+    return parts
+
+
+class TfidfIndex:
+    """
+    L2-normalized TF-IDF document matrix over the catalog.
+
+    Weights are sublinear term frequency (1 + log tf) times smoothed idf
+    (log((1 + n) / (1 + df)) + 1), the same scheme for documents and
+    queries, so a dot product is the cosine similarity. Query terms that
+    never occur in the catalog are ignored.
+    """
+
+    def __init__(self, scholarships: Iterable[Dict[str, Any]]):
+        scholarships = list(scholarships)
+        self.ids: List[str] = [str(s.get("id")) for s in scholarships]
+        self.row_of: Dict[str, int] = {sid: i for i, sid in enumerate(self.ids)}
+        n_docs = len(scholarships)
+
+        doc_counts = [_document_counts(s) for s in scholarships]
+        df: Counter = Counter()
+        for counts in doc_counts:
+            df.update(counts.keys())
+
+        terms = list(df)  # first-seen order; deterministic for a given catalog
+        self.vocabulary: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.idf = np.array(
+            [math.log((1 + n_docs) / (1 + df[term])) + 1.0 for term in terms],
+            dtype=np.float32,
+        )
+
+        # COO triples for the whole catalog, weighted and row-normalized in bulk
+        vocabulary = self.vocabulary
+        row_list: List[int] = []
+        col_list: List[int] = []
+        tf_list: List[int] = []
+        for row, counts in enumerate(doc_counts):
+            row_list.extend([row] * len(counts))
+            col_list.extend(vocabulary[t] for t in counts)
+            tf_list.extend(counts.values())
+
+        row_arr = np.array(row_list, dtype=np.int32)
+        col_arr = np.array(col_list, dtype=np.int32)
+        val_arr = (1.0 + np.log(np.array(tf_list, dtype=np.float32))) * self.idf[col_arr]
+        norms = np.sqrt(np.bincount(row_arr, weights=val_arr * val_arr, minlength=n_docs))
+        if val_arr.size:
+            val_arr = (val_arr / norms[row_arr]).astype(np.float32)
+
+        # Transpose to CSC: postings grouped by term
+        order = np.argsort(col_arr, kind="stable")
+        self.term_rows = row_arr[order]
+        self.term_weights = val_arr[order]
+        self.term_ptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(col_arr, minlength=len(self.vocabulary)), out=self.term_ptr[1:])
+        self.n_docs = n_docs
+
+    def query_vector(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(term ids, L2-normalized weights) of a query; empty if nothing is known."""
+        counts: Counter = Counter()
+        for text in texts:
+            counts.update(t for t in _terms(text) if t in self.vocabulary)
+        if not counts:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+        col = np.fromiter(
+            (self.vocabulary[t] for t in counts), dtype=np.int32, count=len(counts)
+        )
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weight = (1.0 + np.log(tf)) * self.idf[col]
+        return col, (weight / np.linalg.norm(weight)).astype(np.float32)
+
+    def score_all(self, texts: Sequence[str]) -> np.ndarray:
+        """Cosine similarity (0-1) of the query against every scholarship."""
+        col, weight = self.query_vector(texts)
+        if col.size == 0:
+            return np.zeros(self.n_docs, dtype=np.float32)
+
+        starts = self.term_ptr[col]
+        lengths = self.term_ptr[col + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(self.n_docs, dtype=np.float32)
+
+        # Flat positions of every posting of every query term, without a Python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        contributions = self.term_weights[offsets] * np.repeat(weight, lengths)
+        return np.bincount(
+            self.term_rows[offsets], weights=contributions, minlength=self.n_docs
+        ).astype(np.float32)
+
+    def top_k(
+        self,
+        texts: Sequence[str],
+        k: int = 10,
+        candidate_mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return [(scholarship_id, similarity), ...] best first, only
+        scholarships sharing at least one term with the query.
+        candidate_mask (one bool per catalog row) restricts the ranking,
+        e.g. to residency-eligible awards.
+        """
+        scores = self.score_all(texts)
+
+        matched = scores > 0
+        if candidate_mask is not None:
+            matched &= candidate_mask
+        rows = np.flatnonzero(matched)
+        if rows.size == 0 or k <= 0:
+            return []
+
+        candidate_scores = scores[rows]
+        k = min(k, rows.size)
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+
+        return [(self.ids[rows[i]], round(float(candidate_scores[i]), 4)) for i in top]
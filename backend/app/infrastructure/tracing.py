@@ -0,0 +1,140 @@
+# backend/app/infrastructure/tracing.py
+
+from __future__ import annotations
+
+import contextvars
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..core.config import settings
+from .structured_log import log_trace
+
+
+class Span:
+    __slots__ = ("name", "start", "duration")
+
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+
+
+class Trace:
+    """
+    Per-request list of timed stages. Child tasks (asyncio.gather) and
+    threadpool calls inherit the same Trace through the context variable,
+    so their spans land here too.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.trace_id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value. Spans with the same name (e.g. parallel
+        Claude chunk calls) are summed, with the count in desc.
+        """
+        totals: Dict[str, Tuple[float, int]] = {}
+        for s in self.spans:
+            duration, count = totals.get(s.name, (0.0, 0))
+            totals[s.name] = (duration + s.duration, count + 1)
+
+        parts = []
+        for name, (duration, count) in totals.items():
+            part = f"{name};dur={duration * 1000:.3f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.3f}")
+        return ", ".join(parts)
+
+    def to_record(self, status: int) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "spans": [
+                {
+                    "name": s.name,
+                    "offset_ms": round((s.start - self.started) * 1000, 3),
+                    "duration_ms": round(s.duration * 1000, 3),
+                }
+                for s in self.spans
+            ],
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "northstar_trace", default=None
+)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time one stage of the current request (no-op outside a request).
+    Names become Server-Timing metric names: use [a-z0-9_-] only.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    s = Span(name, time.perf_counter())
+    try:
+        yield
+    finally:
+        s.duration = time.perf_counter() - s.start
+        trace.spans.append(s)
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware that opens a Trace per HTTP request, adds a
+    Server-Timing header with the stages finished before the response
+    starts (for streams: everything before the first chunk), and exports a
+    sample of finished traces when TRACE_EXPORT_PATH is set.
+    """
+
+    def __init__(self, app, skip_paths: Sequence[str] = ("/metrics", "/health")):
+        self.app = app
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope["method"], scope["path"])
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing_enabled:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    headers.append((b"timing-allow-origin", b"*"))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            if settings.trace_export_path and random.random() < settings.trace_sample_rate:
+                log_trace(trace.to_record(status))
@@ -1,20 +1,44 @@
 # backend/app/main.py
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
-from .infrastructure.ai_client import ask_claude
+from .infrastructure.ai_client import ask_claude, close_claude_client, get_claude_client
+from .infrastructure.catalog_store import get_catalog_store
+from .infrastructure.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from .infrastructure.structured_log import stop_logging
+from .infrastructure.tracing import TracingMiddleware
 
 from .api.routes.weights import router as weights_router
 from .api.routes.scholarships import router as scholarships_router
 from .api.routes.essays import router as essays_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the catalog (and its indexes) up front, then watch for edits
+    catalog = get_catalog_store()
+    await catalog.open()
+    catalog.snapshot().build_all_derived()
+    catalog.start_watching(settings.catalog_reload_interval_seconds)
+    yield
+    await catalog.stop_watching()
+    # Close the Postgres pool (CATALOG_BACKEND=postgres)
+    await catalog.close()
+    # Release the shared Claude HTTP connection pool
+    await close_claude_client()
+    # Flush queued log lines / exported traces
+    stop_logging()
+
+
 app = FastAPI(
     title="NorthStar API",
     description="Backend for scholarship analysis and essay generation",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS (hackathon-friendly: allow everything)
@@ -24,7 +48,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the browser read the catalog caching / pagination headers
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "Server-Timing"],
 )
+app.add_middleware(TracingMiddleware)
+# Outermost, so latency covers CORS and everything below it
+app.add_middleware(MetricsMiddleware)
 
 # Register routers ONCE
 app.include_router(weights_router)
@@ -37,11 +66,19 @@ async def health_check() -> dict:
     return {
         "status": "ok",
         "env": settings.backend_env,
+        "catalog_version": get_catalog_store().version,
+        "catalog_backend": settings.catalog_backend,
         "supabase_configured": settings.supabase_url is not None,
         "claude_configured": settings.anthropic_api_key is not None,
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus scrape endpoint (per-process metrics, text format)."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/api/debug/claude")
 async def debug_claude() -> dict:
     """
@@ -52,3 +89,15 @@ async def debug_claude() -> dict:
 
     reply = await ask_claude("Say hi to the NorthStar hackathon team in one short sentence.")
     return {"reply": reply}
+
+
+@app.get("/api/debug/claude/stats")
+async def debug_claude_stats() -> dict:
+    """
+    Claude client counters: in-flight calls and how many requests were
+    coalesced onto an identical in-flight call instead of going upstream.
+    """
+    if not settings.anthropic_api_key:
+        return {"error": "ANTHROPIC_API_KEY is not set"}
+
+    return get_claude_client().stats()
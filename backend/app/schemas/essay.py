@@ -2,14 +2,6 @@ from pydantic import BaseModel
 from typing import Dict, List, Optional
 
 
-class EssayGenerateIn(BaseModel):
-    profile_id: str
-    scholarship_id: str
-    selected_priorities: Optional[List[str]] = None
-    custom_weights: Optional[Dict[str, float]] = None
-    num_variants: int = 1
-
-
 class EssayDraftOut(BaseModel):
     id: str
     text: str
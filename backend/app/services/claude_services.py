@@ -1,11 +1,11 @@
 # claude_services.py (example)
-from anthropic import Anthropic
-from app.core.config import settings
+from app.infrastructure.ai_client import get_claude_client
 
-client = Anthropic(api_key=settings.anthropic_api_key)
 
-def call_claude(messages: list[dict]) -> str:
-    response = client.messages.create(
+async def call_claude(messages: list[dict]) -> str:
+    client = get_claude_client()
+    response = await client.create_message(
+        route="claude_services",
         model="claude-3-haiku-20240307",
         max_tokens=256,
         messages=messages,
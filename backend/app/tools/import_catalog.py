@@ -0,0 +1,66 @@
+# backend/app/tools/import_catalog.py
+"""
+Load scholarships.json and success_stories.json into Postgres for
+CATALOG_BACKEND=postgres (creates the tables if needed).
+Records are upserted by id; running it again only touches changed rows,
+and running API workers pick the changes up on their next poll.
+
+    cd backend
+    python -m app.tools.import_catalog
+    python -m app.tools.import_catalog --prune        # also delete rows not in the files
+    python -m app.tools.import_catalog --database-url postgresql://localhost/northstar
+
+Needs `pip install asyncpg` and DATABASE_URL (or --database-url).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.config import settings
+from ..infrastructure.catalog_store import SCHOLARSHIPS_FILE, SUCCESS_STORIES_FILE
+from ..infrastructure.postgres_repo import get_database
+
+
+def _load(path: Path) -> list:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, list):
+        raise ValueError(f"{path} must contain a JSON list")
+    return data
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.tools.import_catalog",
+        description="Import the JSON catalog into Postgres.",
+    )
+    parser.add_argument("--scholarships", type=Path, default=SCHOLARSHIPS_FILE)
+    parser.add_argument("--success-stories", type=Path, default=SUCCESS_STORIES_FILE)
+    parser.add_argument("--prune", action="store_true", help="delete rows whose id isn't in the files")
+    parser.add_argument("--database-url", help="Postgres DSN (default: DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        settings.database_url = args.database_url
+
+    scholarships = _load(args.scholarships)
+    stories = _load(args.success_stories) if args.success_stories.exists() else []
+
+    database = get_database()
+    await database.open()
+    try:
+        written = await database.import_catalog(scholarships, stories, prune=args.prune)
+    finally:
+        await database.close()
+
+    print(f"[info] imported {written[0]} scholarship(s) and {written[1]} success story(ies)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
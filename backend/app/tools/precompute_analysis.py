@@ -0,0 +1,188 @@
+# backend/app/tools/precompute_analysis.py
+"""
+Pre-compute scholarship priority analyses offline through the Message
+Batches API and store them in the analysis cache, so GET /{id}/analysis
+is served without a live Claude call.
+
+    cd backend
+    python -m app.tools.precompute_analysis            # new / changed only
+    python -m app.tools.precompute_analysis --all      # whole catalog
+    python -m app.tools.precompute_analysis --ids 3,7 --base-url http://127.0.0.1:8787
+
+Set ANTHROPIC_BASE_URL (or --base-url) to run against a local fake server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.scholarship_analysis import build_analysis_request, parse_analysis_message
+from ..infrastructure.ai_client import close_claude_client, get_claude_client
+from ..infrastructure.analysis_cache import AnalysisCache, content_hash, get_analysis_cache
+from ..infrastructure.catalog_store import get_catalog_store
+from ..infrastructure.scholarship_repo import list_scholarships
+
+# Batches are capped at 100k requests / 256 MB; the catalog is far below that,
+# but keep submissions bounded anyway.
+MAX_BATCH_REQUESTS = 10_000
+
+
+async def select_scholarships(
+    cache: AnalysisCache,
+    ids: Optional[List[str]] = None,
+    force: bool = False,
+) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    (scholarship_id, content_hash, record) for every scholarship that needs
+    analysis: no fresh cache entry for its current content hash (or all of
+    them with force=True), optionally restricted to `ids`.
+    """
+    wanted = set(ids) if ids else None
+    selected: List[Tuple[str, str, Dict[str, Any]]] = []
+    seen = set()
+    for record in list_scholarships():
+        sid = str(record.get("id"))
+        if sid in seen or (wanted is not None and sid not in wanted):
+            continue
+        seen.add(sid)
+        record_hash = content_hash(record)
+        if force or await cache.aget(sid, record_hash) is None:
+            selected.append((sid, record_hash, record))
+    return selected
+
+
+async def _wait_for_batch(batches: Any, batch_id: str, poll_interval: float, timeout: float) -> Any:
+    deadline = time.monotonic() + timeout
+    while True:
+        batch = await batches.retrieve(batch_id)
+        counts = batch.request_counts
+        print(
+            f"[info] batch {batch_id}: {batch.processing_status} "
+            f"(processing={counts.processing}, succeeded={counts.succeeded}, "
+            f"errored={counts.errored})"
+        )
+        if batch.processing_status == "ended":
+            return batch
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Batch {batch_id} did not finish within {timeout:.0f}s")
+        await asyncio.sleep(poll_interval)
+
+
+async def run_batch(
+    items: List[Tuple[str, str, Dict[str, Any]]],
+    cache: AnalysisCache,
+    poll_interval: float = 30.0,
+    timeout: float = 24 * 3600,
+) -> Dict[str, int]:
+    """
+    Submit one batch for `items`, wait for it, and write every valid result
+    into the cache. Returns counts of stored / invalid / failed requests.
+    """
+    batches = get_claude_client().raw.messages.batches
+
+    # custom_id must be short and unique; map it back to (id, hash) afterwards
+    pending: Dict[str, Tuple[str, str]] = {}
+    requests = []
+    for index, (sid, record_hash, record) in enumerate(items):
+        custom_id = f"a-{index}"
+        pending[custom_id] = (sid, record_hash)
+        requests.append({"custom_id": custom_id, "params": build_analysis_request(record)})
+
+    batch = await batches.create(requests=requests)
+    print(f"[info] submitted batch {batch.id} with {len(requests)} request(s)")
+    await _wait_for_batch(batches, batch.id, poll_interval, timeout)
+
+    counts = {"stored": 0, "invalid": 0, "failed": 0}
+    async for entry in await batches.results(batch.id):
+        target = pending.pop(entry.custom_id, None)
+        if target is None:
+            continue
+        sid, record_hash = target
+
+        if entry.result.type != "succeeded":
+            counts["failed"] += 1
+            print(f"[warning] analysis for scholarship {sid} {entry.result.type}")
+            continue
+
+        try:
+            data = parse_analysis_message(entry.result.message)
+        except ValueError as e:
+            counts["invalid"] += 1
+            print(f"[warning] analysis for scholarship {sid} rejected: {e}")
+            continue
+
+        await cache.aset(sid, record_hash, data)
+        counts["stored"] += 1
+
+    # Requests missing from the results file count as failures too
+    counts["failed"] += len(pending)
+    return counts
+
+
+async def _submit(
+    items: List[Tuple[str, str, Dict[str, Any]]],
+    cache: AnalysisCache,
+    poll_interval: float,
+    timeout: float,
+) -> Dict[str, int]:
+    """run_batch() over chunks of at most MAX_BATCH_REQUESTS; summed counts."""
+    totals = {"stored": 0, "invalid": 0, "failed": 0}
+    try:
+        for start in range(0, len(items), MAX_BATCH_REQUESTS):
+            chunk = items[start : start + MAX_BATCH_REQUESTS]
+            counts = await run_batch(chunk, cache, poll_interval, timeout)
+            for key, value in counts.items():
+                totals[key] += value
+    finally:
+        await close_claude_client()
+    return totals
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.tools.precompute_analysis",
+        description="Pre-compute scholarship analyses via the Message Batches API.",
+    )
+    parser.add_argument("--all", action="store_true", help="re-analyze every scholarship, even if cached")
+    parser.add_argument("--ids", help="comma-separated scholarship ids to limit the run to")
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be submitted")
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="seconds between status checks")
+    parser.add_argument("--timeout", type=float, default=24 * 3600, help="give up waiting after N seconds")
+    parser.add_argument("--base-url", help="Anthropic API base URL (e.g. a local fake server)")
+    args = parser.parse_args(argv)
+
+    if args.base_url:
+        settings.anthropic_base_url = args.base_url
+
+    catalog = get_catalog_store()
+    await catalog.open()
+    cache = get_analysis_cache()
+    try:
+        ids = [i.strip() for i in args.ids.split(",") if i.strip()] if args.ids else None
+        items = await select_scholarships(cache, ids=ids, force=args.all)
+
+        if not items:
+            print("[info] every selected scholarship already has a fresh analysis")
+            return 0
+        print(f"[info] {len(items)} scholarship(s) need analysis: "
+              f"{', '.join(sid for sid, _, _ in items)}")
+        if args.dry_run:
+            return 0
+        totals = await _submit(items, cache, args.poll_interval, args.timeout)
+    finally:
+        await catalog.close()
+
+    print(
+        f"[info] done: {totals['stored']} stored, {totals['invalid']} invalid, "
+        f"{totals['failed']} failed"
+    )
+    return 0 if totals["invalid"] == 0 and totals["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
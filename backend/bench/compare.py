@@ -0,0 +1,75 @@
+# backend/bench/compare.py
+"""
+Compare two bench.run result files (e.g. main vs. your branch).
+
+    cd backend
+    python -m bench.compare bench/results/base.json bench/results/new.json --threshold 10
+
+Exits with status 1 if any scenario's throughput dropped, or its p50/p95/p99
+latency rose, by more than --threshold percent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# (label, getter, higher_is_better)
+_METRICS = (
+    ("throughput", lambda r: r["throughput_rps"], True),
+    ("p50", lambda r: r["latency_ms"]["p50"], False),
+    ("p95", lambda r: r["latency_ms"]["p95"], False),
+    ("p99", lambda r: r["latency_ms"]["p99"], False),
+    ("lag p99", lambda r: r["event_loop_lag_ms"]["p99"], False),
+)
+
+# Event-loop lag is noisy at the ms level; don't gate on it
+_GATED = {"throughput", "p50", "p95", "p99"}
+
+
+def _change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - old) / old * 100.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.compare", description=__doc__.split("\n\n")[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    base = json.loads(args.base.read_text())
+    new = json.loads(args.new.read_text())
+    print(f"base: {base['meta'].get('git_commit')}  new: {new['meta'].get('git_commit')}")
+
+    regressions = []
+    for name, new_result in new["scenarios"].items():
+        old_result = base["scenarios"].get(name)
+        if old_result is None:
+            print(f"{name:>15}: (new scenario)")
+            continue
+        cells = []
+        for label, get, higher_is_better in _METRICS:
+            old_value, new_value = get(old_result), get(new_result)
+            change = _change(old_value, new_value)
+            worse = -change if higher_is_better else change
+            flag = ""
+            if label in _GATED and worse > args.threshold:
+                flag = " !"
+                regressions.append(f"{name} {label} {change:+.1f}%")
+            cells.append(f"{label} {old_value:.1f}->{new_value:.1f} ({change:+.1f}%){flag}")
+        print(f"{name:>15}: " + "  ".join(cells))
+
+    if regressions:
+        print(f"\nregressions over {args.threshold:.0f}%: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
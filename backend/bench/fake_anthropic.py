@@ -0,0 +1,403 @@
+# backend/bench/fake_anthropic.py
+"""
+Fake Anthropic API for benchmarks and local testing: no network, no cost,
+and controllable latency / streaming speed / failure rate.
+
+Implements the endpoints the backend uses:
+  POST /v1/messages                          (plain and stream=true SSE)
+  POST /v1/messages/batches                  Message Batches API
+  GET  /v1/messages/batches/{id}
+  GET  /v1/messages/batches/{id}/results     (JSON lines)
+
+Responses are canned but shaped like the real thing for each call site
+(match scoring / match reasons / analysis / essay), so the backend parses
+them exactly as it would parse Claude's output. Prompt caching is
+simulated too: a cache_control prefix seen before is billed as
+cache_read_input_tokens instead of cache_creation_input_tokens.
+
+    cd backend
+    python -m bench.fake_anthropic --port 8787 --latency-ms 1500 --error-rate 0.02
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8787 ANTHROPIC_API_KEY=fake uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class FakeConfig:
+    # Time to first token: "lognormal" (median latency_ms, spread latency_sigma),
+    # "uniform" (latency_ms +/- 50%) or "fixed"
+    latency_dist: str = "lognormal"
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.4
+    # Output speed; non-streaming responses wait for the whole completion
+    tokens_per_second: float = 80.0
+    # Share of calls failing with 529 overloaded / 429 rate limited (retry-after: 1)
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    # How long a message batch stays "in_progress"
+    batch_processing_seconds: float = 2.0
+    seed: Optional[int] = None
+
+
+ESSAY_TEXT = (
+    "When I founded the tutoring club at my high school, I did not expect it to "
+    "change how I saw my community. Leading twelve volunteers taught me that "
+    "leadership means listening first. Through community service every weekend, "
+    "I learned how financial need shapes the choices families make, and how "
+    "resilience grows when people overcome adversity together.\n\n"
+    "My academic excellence in mathematics gave me the tools, but it was "
+    "persevering through setbacks that gave me purpose. I organized a fundraiser "
+    "that raised $4,000 for local food banks, mentored younger students, and "
+    "researched how innovation in education can close opportunity gaps.\n\n"
+    "This scholarship would let me continue that work at university: building "
+    "programs that serve others, advocating for equity, and proving that "
+    "students from every background can lead."
+)
+
+
+class FakeAnthropic:
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.cached_prefixes: set = set()
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"messages": 0, "streams": 0, "errors": 0, "batches": 0}
+
+    # ---------- simulated timing / failures ----------
+
+    def first_token_delay(self) -> float:
+        c = self.config
+        if c.latency_dist == "fixed":
+            ms = c.latency_ms
+        elif c.latency_dist == "uniform":
+            ms = self.rng.uniform(0.5 * c.latency_ms, 1.5 * c.latency_ms)
+        else:
+            ms = self.rng.lognormvariate(0.0, c.latency_sigma) * c.latency_ms
+        return ms / 1000.0
+
+    def maybe_error(self) -> Optional[Response]:
+        roll = self.rng.random()
+        if roll < self.config.error_rate:
+            self.stats["errors"] += 1
+            return JSONResponse(
+                {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+                status_code=529,
+            )
+        if roll < self.config.error_rate + self.config.rate_limit_rate:
+            self.stats["errors"] += 1
+            return JSONResponse(
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "Rate limited"}},
+                status_code=429,
+                headers={"retry-after": "1"},
+            )
+        return None
+
+    # ---------- canned content ----------
+
+    @staticmethod
+    def _user_data(body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """(raw text, merged JSON objects) of the last user message."""
+        content = body["messages"][-1]["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        texts: List[str] = []
+        merged: Dict[str, Any] = {}
+        for block in content:
+            text = block.get("text", "")
+            texts.append(text)
+            try:
+                data = json.loads(text)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                merged.update(data)
+        return "\n".join(texts), merged
+
+    def completion_text(self, body: Dict[str, Any]) -> str:
+        raw, data = self._user_data(body)
+
+        if any(t.get("name") == "web_search" for t in body.get("tools") or []):
+            return json.dumps({
+                "scholarship_id": str((data.get("scholarship") or {}).get("id")),
+                "priorities": [
+                    {"name": "leadership", "weight": 0.45, "evidence": "Committee values initiative."},
+                    {"name": "community_service", "weight": 0.35, "evidence": "Service is cited."},
+                    {"name": "academic_excellence", "weight": 0.20, "evidence": "GPA threshold."},
+                ],
+                "summary": "Rewards student leaders with sustained community impact.",
+            })
+
+        if "scholarships" in data:
+            matches = []
+            for s in data["scholarships"]:
+                sid = str(s.get("id"))
+                pct = int(hashlib.md5(sid.encode()).hexdigest(), 16) % 70 + 25
+                matches.append({
+                    "scholarship_id": sid,
+                    "match_percentage": pct,
+                    "reason": "Your leadership and service fit what this award rewards.",
+                })
+            return json.dumps({"matches": matches})
+
+        if "matches" in data:
+            return json.dumps({
+                "reasons": [
+                    {"scholarship_id": str(m.get("id")), "reason": "Strong fit with your community work."}
+                    for m in data["matches"]
+                ]
+            })
+
+        if "STUDENT ESSAY" in raw:  # scoring_engine.score_essay_with_web
+            return json.dumps({
+                "score": 78,
+                "reasoning": "Well aligned with leadership and service.",
+                "aligned_priorities": ["leadership"],
+                "misaligned_priorities": [],
+            })
+
+        return ESSAY_TEXT
+
+    def usage(self, body: Dict[str, Any], output_text: str) -> Dict[str, int]:
+        """Token usage, with prompt caching simulated per cache_control prefix."""
+        prefix_parts: List[Any] = [body.get("tools"), body.get("model")]
+        cached_tokens = 0
+        total_chars = 0
+        cache_key: Optional[str] = None
+
+        system = body.get("system") or []
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+        blocks = list(system)
+        for message in body.get("messages", []):
+            content = message["content"]
+            blocks.extend([{"type": "text", "text": content}] if isinstance(content, str) else content)
+
+        for block in blocks:
+            text = block.get("text", "")
+            total_chars += len(text)
+            prefix_parts.append(text)
+            if block.get("cache_control"):
+                cached_tokens = total_chars // _CHARS_PER_TOKEN
+                cache_key = hashlib.sha256(json.dumps(prefix_parts, default=str).encode()).hexdigest()
+
+        usage = {
+            "input_tokens": total_chars // _CHARS_PER_TOKEN + 1,
+            "output_tokens": len(output_text) // _CHARS_PER_TOKEN + 1,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+        if cache_key is not None:
+            usage["input_tokens"] -= cached_tokens
+            if cache_key in self.cached_prefixes:
+                usage["cache_read_input_tokens"] = cached_tokens
+            else:
+                self.cached_prefixes.add(cache_key)
+                usage["cache_creation_input_tokens"] = cached_tokens
+        return usage
+
+    def message(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        text = self.completion_text(body)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": self.usage(body, text),
+        }
+
+    def generation_time(self, message: Dict[str, Any]) -> float:
+        return message["usage"]["output_tokens"] / max(self.config.tokens_per_second, 1e-6)
+
+    # ---------- streaming ----------
+
+    async def sse_events(self, message: Dict[str, Any], delay: float) -> AsyncIterator[bytes]:
+        def event(name: str, data: Dict[str, Any]) -> bytes:
+            return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+
+        await asyncio.sleep(delay)
+        text = message["content"][0]["text"]
+        usage = message["usage"]
+        start = {**message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 1}}
+        yield event("message_start", {"type": "message_start", "message": start})
+        yield event("content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        })
+
+        # ~one token per delta at tokens_per_second
+        step = _CHARS_PER_TOKEN
+        pause = 1.0 / max(self.config.tokens_per_second, 1e-6)
+        for i in range(0, len(text), step):
+            yield event("content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": text[i : i + step]},
+            })
+            await asyncio.sleep(pause)
+
+        yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        })
+        yield event("message_stop", {"type": "message_stop"})
+
+    # ---------- batches ----------
+
+    def batch_object(self, batch: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+        ended = time.time() - batch["created"] >= self.config.batch_processing_seconds
+        n = len(batch["results"])
+        errored = sum(1 for r in batch["results"] if r["result"]["type"] != "succeeded")
+
+        def iso(ts: Optional[float]) -> Optional[str]:
+            return None if ts is None else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else n,
+                "succeeded": n - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": iso(batch["created"]),
+            "expires_at": iso(batch["created"] + 24 * 3600),
+            "ended_at": iso(batch["created"] + self.config.batch_processing_seconds) if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{base_url}v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    def create_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        results = []
+        for item in requests:
+            if self.rng.random() < self.config.error_rate:
+                result = {"type": "errored", "error": {
+                    "type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"},
+                }}
+            else:
+                result = {"type": "succeeded", "message": self.message(item["params"])}
+            results.append({"custom_id": item["custom_id"], "result": result})
+        batch = {"id": f"msgbatch_{uuid.uuid4().hex[:24]}", "created": time.time(), "results": results}
+        self.batches[batch["id"]] = batch
+        self.stats["batches"] += 1
+        return batch
+
+
+def build_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake Anthropic API")
+    fake = FakeAnthropic(config)
+    app.state.fake = fake
+
+    @app.post("/v1/messages")
+    async def create_message(request: Request) -> Response:
+        body = await request.json()
+        error = fake.maybe_error()
+        if error is not None:
+            await asyncio.sleep(fake.first_token_delay() / 4)
+            return error
+
+        message = fake.message(body)
+        delay = fake.first_token_delay()
+        if body.get("stream"):
+            fake.stats["streams"] += 1
+            return StreamingResponse(fake.sse_events(message, delay), media_type="text/event-stream")
+
+        fake.stats["messages"] += 1
+        await asyncio.sleep(delay + fake.generation_time(message))
+        return JSONResponse(message)
+
+    @app.post("/v1/messages/batches")
+    async def create_batch(request: Request) -> Response:
+        body = await request.json()
+        batch = fake.create_batch(body["requests"])
+        return JSONResponse(fake.batch_object(batch, str(request.base_url)))
+
+    @app.get("/v1/messages/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str, request: Request) -> Response:
+        batch = fake.batches.get(batch_id)
+        if batch is None:
+            return JSONResponse(
+                {"type": "error", "error": {"type": "not_found_error", "message": "No such batch"}},
+                status_code=404,
+            )
+        return JSONResponse(fake.batch_object(batch, str(request.base_url)))
+
+    @app.get("/v1/messages/batches/{batch_id}/results")
+    async def batch_results(batch_id: str) -> Response:
+        batch = fake.batches.get(batch_id)
+        if batch is None:
+            return JSONResponse(
+                {"type": "error", "error": {"type": "not_found_error", "message": "No such batch"}},
+                status_code=404,
+            )
+        lines = "\n".join(json.dumps(r) for r in batch["results"]) + "\n"
+        return Response(lines, media_type="application/binary")
+
+    @app.get("/_fake/stats")
+    async def stats() -> Dict[str, Any]:
+        return {"config": asdict(config), **fake.stats}
+
+    return app
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeConfig()
+    parser.add_argument("--latency-dist", choices=("lognormal", "uniform", "fixed"), default=defaults.latency_dist)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="median time to first token")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="share of 529 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate, help="share of 429 responses")
+    parser.add_argument("--batch-processing-seconds", type=float, default=defaults.batch_processing_seconds)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(
+        latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        batch_processing_seconds=args.batch_processing_seconds,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m bench.fake_anthropic", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    uvicorn.run(build_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+# backend/bench/run.py
+"""
+Benchmark the API against the fake Anthropic server.
+
+Starts bench.fake_anthropic in a subprocess and the FastAPI app in-process
+(uvicorn, real HTTP), drives each scenario at a fixed concurrency, and
+writes throughput, latency percentiles and the app's event-loop lag to a
+JSON file you can diff across commits with `python -m bench.compare`.
+
+    cd backend
+    python -m bench.run                                    # every scenario
+    python -m bench.run --scenarios match,essay --concurrency 64 --requests 500
+    python -m bench.run --latency-ms 2000 --error-rate 0.05 --match-mode claude
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from .fake_anthropic import add_config_arguments, config_from_args
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+_LAG_INTERVAL = 0.005  # event-loop lag probe period (seconds)
+
+
+# ---------- request payloads ----------
+
+_PROGRAMS = ["Computer Science", "Life Sciences", "Engineering Science", "Economics", "Music"]
+_EXPERIENCES = [
+    "Founded a coding club for girls in my high school",
+    "Volunteered weekly at a food bank for three years",
+    "Captain of the varsity basketball team",
+    "Research assistant in a neuroscience lab",
+    "Worked part-time to support my family",
+    "Organized a climate action fundraiser",
+]
+_INTERESTS = ["robotics", "public health", "music", "social justice", "entrepreneurship", "writing"]
+_AWARDS = ["Dean's List", "Provincial science fair gold", "Community leadership award"]
+_PRIORITIES = ["leadership", "community_service", "academic_excellence", "financial_need", "resilience"]
+_QUERIES = ["leadership", "international students", "engineering", "community service", "financial need"]
+
+
+def _profile(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "full_name": f"Student {rng.randint(1, 10_000)}",
+        "university": "University of Toronto",
+        "program": rng.choice(_PROGRAMS),
+        "year": rng.randint(1, 4),
+        "residency_status": rng.choice(["domestic", "international"]),
+        "experiences": rng.sample(_EXPERIENCES, 3),
+        "interests": rng.sample(_INTERESTS, 2),
+        "awards": rng.sample(_AWARDS, 1),
+    }
+
+
+@dataclass
+class Scenario:
+    method: str
+    # (rng, scholarship ids) -> (path, json body or None)
+    build: Callable[[random.Random, List[str]], Tuple[str, Optional[Dict[str, Any]]]]
+
+
+def _scenarios(analysis_refresh: bool) -> Dict[str, Scenario]:
+    refresh = "?refresh=true" if analysis_refresh else ""
+    return {
+        "match": Scenario("POST", lambda rng, ids: ("/api/scholarships/match", _profile(rng))),
+        "match_stream": Scenario("POST", lambda rng, ids: ("/api/scholarships/match/stream", _profile(rng))),
+        "essay": Scenario("POST", lambda rng, ids: ("/api/essays/generate", {
+            "scholarship_id": rng.choice(ids),
+            "student_profile": _profile(rng),
+            "selected_priorities": [
+                {"name": name, "weight": rng.uniform(0.1, 1.0)}
+                for name in rng.sample(_PRIORITIES, 2)
+            ],
+        })),
+        "analysis": Scenario("GET", lambda rng, ids: (f"/api/scholarships/{rng.choice(ids)}/analysis{refresh}", None)),
+        "reweight": Scenario("POST", lambda rng, ids: ("/api/weights/reweight", {
+            "priorities": [{"id": p, "base_weight": rng.uniform(5, 40)} for p in _PRIORITIES],
+            "selected_ids": rng.sample(_PRIORITIES, 2),
+        })),
+        "catalog_list": Scenario("GET", lambda rng, ids: ("/api/scholarships/", None)),
+        "catalog_get": Scenario("GET", lambda rng, ids: (f"/api/scholarships/{rng.choice(ids)}", None)),
+        "catalog_batch": Scenario("GET", lambda rng, ids: (f"/api/scholarships/batch?ids={','.join(rng.sample(ids, 5))}", None)),
+        "catalog_search": Scenario("GET", lambda rng, ids: (f"/api/scholarships/search?q={rng.choice(_QUERIES)}", None)),
+    }
+
+
+# ---------- servers ----------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server at {url} did not start within {timeout:.0f}s")
+
+
+class AppServer:
+    """The FastAPI app under uvicorn on a background thread, plus a loop-lag probe."""
+
+    def __init__(self, port: int):
+        import uvicorn
+
+        from app.main import app  # imported after the env is configured
+
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+        )
+        self.loop = asyncio.new_event_loop()
+        self.lag_samples: List[Tuple[float, float]] = []  # (perf_counter, lag seconds)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        probe = self.loop.create_task(self._probe_lag())
+        try:
+            self.loop.run_until_complete(self.server.serve())
+        finally:
+            probe.cancel()
+            self.loop.run_until_complete(asyncio.gather(probe, return_exceptions=True))
+            self.loop.close()
+
+    async def _probe_lag(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(_LAG_INTERVAL)
+            now = time.perf_counter()
+            self.lag_samples.append((now, max(0.0, now - before - _LAG_INTERVAL)))
+
+    def start(self) -> None:
+        self._thread.start()
+        _wait_until_up(f"http://127.0.0.1:{self.port}/health")
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=10)
+
+    def lag_between(self, start: float, end: float) -> List[float]:
+        return [lag for ts, lag in list(self.lag_samples) if start <= ts <= end]
+
+
+# ---------- load generation ----------
+
+
+def _percentiles_ms(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    arr = np.asarray(values) * 1000.0
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+async def _run_scenario(
+    base_url: str,
+    scenario: Scenario,
+    ids: List[str],
+    total: int,
+    concurrency: int,
+    seed: int,
+) -> Tuple[List[float], Dict[str, int], float]:
+    rng = random.Random(seed)
+    requests = [scenario.build(rng, ids) for _ in range(total)]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300.0) as client:
+
+        async def worker() -> None:
+            nonlocal next_index
+            while next_index < len(requests):
+                path, body = requests[next_index]
+                next_index += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.request(scenario.method, path, json=body)
+                    await response.aread()  # include streamed bodies
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description="Benchmark the NorthStar API.")
+    parser.add_argument("--scenarios", default="all", help="comma-separated scenario names, or 'all'")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests per scenario")
+    parser.add_argument("--match-mode", choices=("local", "claude"), default="local")
+    parser.add_argument("--analysis-refresh", action="store_true", help="bypass the analysis cache")
+    parser.add_argument("--output", help=f"result file (default: {RESULTS_DIR.name}/<time>-<commit>.json)")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    all_scenarios = _scenarios(args.analysis_refresh)
+    names = list(all_scenarios) if args.scenarios == "all" else [n.strip() for n in args.scenarios.split(",")]
+    unknown = [n for n in names if n not in all_scenarios]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(all_scenarios)})")
+
+    fake_config = config_from_args(args)
+    fake_port, app_port = _free_port(), _free_port()
+    fake_argv = [sys.executable, "-m", "bench.fake_anthropic", "--port", str(fake_port)]
+    for key, value in vars(args).items():
+        if key in fake_config.__dataclass_fields__ and value is not None:
+            fake_argv += [f"--{key.replace('_', '-')}", str(value)]
+
+    tmp = tempfile.TemporaryDirectory(prefix="northstar-bench-")
+    os.environ.update({
+        "ANTHROPIC_API_KEY": "bench-fake-key",
+        "ANTHROPIC_BASE_URL": f"http://127.0.0.1:{fake_port}",
+        "ANALYSIS_CACHE_PATH": str(Path(tmp.name) / "analysis_cache.sqlite3"),
+        "MATCH_RANKING_MODE": args.match_mode,
+        "CATALOG_RELOAD_INTERVAL_SECONDS": "0",
+        "LOG_MODEL_OUTPUT_SAMPLE_RATE": "0",
+    })
+
+    fake = subprocess.Popen(fake_argv, cwd=BACKEND_DIR)
+    app_server: Optional[AppServer] = None
+    try:
+        _wait_until_up(f"http://127.0.0.1:{fake_port}/_fake/stats")
+        app_server = AppServer(app_port)
+        app_server.start()
+        base_url = f"http://127.0.0.1:{app_port}"
+        ids = [str(s["id"]) for s in httpx.get(f"{base_url}/api/scholarships/?fields=id").json()]
+
+        results: Dict[str, Any] = {}
+        for i, name in enumerate(names):
+            scenario = all_scenarios[name]
+            if args.warmup:
+                asyncio.run(_run_scenario(base_url, scenario, ids, args.warmup, args.concurrency, seed=-i - 1))
+            window_start = time.perf_counter()
+            latencies, statuses, elapsed = asyncio.run(
+                _run_scenario(base_url, scenario, ids, args.requests, args.concurrency, seed=i)
+            )
+            lag = app_server.lag_between(window_start, time.perf_counter())
+            ok = sum(n for status, n in statuses.items() if status.startswith("2"))
+            results[name] = {
+                "requests": len(latencies),
+                "concurrency": args.concurrency,
+                "ok": ok,
+                "errors": len(latencies) - ok,
+                "status_counts": statuses,
+                "duration_s": round(elapsed, 3),
+                "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+                "latency_ms": _percentiles_ms(latencies),
+                "event_loop_lag_ms": _percentiles_ms(lag),
+            }
+            r = results[name]
+            print(
+                f"{name:>15}: {r['throughput_rps']:9.1f} req/s  "
+                f"p50 {r['latency_ms']['p50']:8.1f} ms  p95 {r['latency_ms']['p95']:8.1f} ms  "
+                f"p99 {r['latency_ms']['p99']:8.1f} ms  lag p99 {r['event_loop_lag_ms']['p99']:6.1f} ms  "
+                f"errors {r['errors']}"
+            )
+
+        fake_stats = httpx.get(f"http://127.0.0.1:{fake_port}/_fake/stats").json()
+    finally:
+        if app_server is not None:
+            app_server.stop()
+        fake.terminate()
+        fake.wait(timeout=10)
+        tmp.cleanup()
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_commit": commit,
+            "git_dirty": bool(_git("status", "--porcelain", "--", ".")),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "fake_server": fake_stats,
+        "scenarios": results,
+    }
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from anthropic import APIStatusError
+
+from app.infrastructure.ai_client import ClaudeClient, SingleFlight, request_key
+from app.infrastructure.resilience import CallPolicy
+
+PLAIN = CallPolicy(max_retries=0, circuit_breaker=False)
+
+
+class FakeMessages:
+    """Stands in for AsyncAnthropic.messages: `outcomes` are returned / raised in order."""
+
+    def __init__(self, *outcomes, delay=0.01):
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        delay = outcome[1] if isinstance(outcome, tuple) else self.delay
+        outcome = outcome[0] if isinstance(outcome, tuple) else outcome
+        await asyncio.sleep(delay)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return SimpleNamespace(
+            text=outcome,
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+
+def _client(messages, max_concurrency=4):
+    return ClaudeClient(SimpleNamespace(messages=messages), max_concurrency=max_concurrency)
+
+
+def test_request_key_ignores_order_and_unkeyed_fields():
+    a = {"model": "m", "max_tokens": 10, "messages": [{"role": "user", "content": "hi"}]}
+    b = dict(reversed(list(a.items())), metadata={"user_id": "x"})
+    assert request_key(a) == request_key(b)
+    assert request_key(a) != request_key({**a, "temperature": 0.2})
+    assert request_key(a) != request_key({**a, "stop_sequences": ["\n"]})
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(calls) == 1
+    stats = flight.stats()
+    assert (stats["upstream_calls"], stats["joins"], stats["in_flight_keys"]) == (1, 4, 0)
+
+
+def test_single_flight_does_not_cache_finished_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        return [await flight.do("k", work), await flight.do("k", work)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def main():
+        leaver = asyncio.ensure_future(flight.do("k", work))
+        stayer = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.005)
+        leaver.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaver
+        return await stayer
+
+    assert asyncio.run(main()) == "result"
+
+
+def test_create_message_coalesces_and_counts_joined_routes():
+    messages = FakeMessages()
+    client = _client(messages)
+    request = {"model": "m", "max_tokens": 10, "messages": []}
+
+    async def main():
+        return await asyncio.gather(
+            client.create_message(route="a", policy=PLAIN, **request),
+            client.create_message(route="b", policy=PLAIN, **request),
+            client.create_message(route="b", policy=PLAIN, **request),
+        )
+
+    results = asyncio.run(main())
+    assert messages.calls == 1
+    assert results[0] is results[1] is results[2]
+    usage = client.usage.stats()
+    assert usage["a"]["calls"] == 1
+    assert usage["b"]["calls"] == 0
+    assert usage["b"]["coalesced_calls"] == 2
+
+
+def test_create_message_without_coalescing_calls_upstream_each_time():
+    messages = FakeMessages()
+    client = _client(messages)
+
+    async def main():
+        await asyncio.gather(
+            *(client.create_message(route="a", coalesce=False, policy=PLAIN, model="m") for _ in range(3))
+        )
+
+    asyncio.run(main())
+    assert messages.calls == 3
+
+
+# ---------- retries and hedging ----------
+
+
+def _status_error(status, **headers):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status, request=request, headers=headers)
+    return APIStatusError(f"status {status}", response=response, body=None)
+
+
+def _call(client, policy, route="test"):
+    return asyncio.run(client.create_message(route=route, policy=policy, model="m"))
+
+
+def test_retries_retryable_errors_after_retry_after():
+    messages = FakeMessages(_status_error(429, **{"retry-after": "0"}), "ok")
+    result = _call(_client(messages), CallPolicy(max_retries=1, base_delay=0.001))
+    assert result.text == "ok"
+    assert messages.calls == 2
+
+
+def test_gives_up_when_retry_after_exceeds_the_cap():
+    messages = FakeMessages(_status_error(429, **{"retry-after": "120"}), "ok")
+    with pytest.raises(APIStatusError):
+        _call(_client(messages), CallPolicy(max_retries=3, max_retry_after=30.0))
+    assert messages.calls == 1
+
+
+def test_non_retryable_errors_are_raised_and_give_the_breaker_no_verdict():
+    messages = FakeMessages(_status_error(400))
+    client = _client(messages)
+    with pytest.raises(APIStatusError):
+        _call(client, CallPolicy(max_retries=3))
+    assert messages.calls == 1
+    assert list(client.breaker._outcomes) == []
+
+
+def test_hedge_takes_the_faster_call():
+    messages = FakeMessages(("slow", 0.3), ("fast", 0.0))
+    result = _call(_client(messages), CallPolicy(max_retries=0, hedge=True, hedge_after=0.02))
+    assert result.text == "fast"
+    assert messages.calls == 2
+
+
+def test_fast_calls_are_not_hedged():
+    messages = FakeMessages(("fast", 0.0))
+    _call(_client(messages), CallPolicy(max_retries=0, hedge=True, hedge_after=0.1))
+    assert messages.calls == 1
+
+
+def test_no_hedge_when_every_slot_is_busy():
+    messages = FakeMessages(("slow", 0.05), ("never", 0.0))
+    result = _call(
+        _client(messages, max_concurrency=1),
+        CallPolicy(max_retries=0, hedge=True, hedge_after=0.01),
+    )
+    assert result.text == "slow"
+    assert messages.calls == 1
+
+
+def test_hedge_falls_back_to_the_original_error():
+    messages = FakeMessages((_status_error(500), 0.05), (_status_error(503), 0.0))
+    with pytest.raises(APIStatusError) as info:
+        _call(_client(messages), CallPolicy(max_retries=0, hedge=True, hedge_after=0.01))
+    assert info.value.status_code == 500
+
+
+def test_without_a_threshold_hedging_waits_for_latency_samples():
+    messages = FakeMessages(("slow", 0.05), ("fast", 0.0))
+    _call(_client(messages), CallPolicy(max_retries=0, hedge=True))
+    assert messages.calls == 1
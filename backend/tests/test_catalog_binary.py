@@ -0,0 +1,67 @@
+import pytest
+
+from app.infrastructure.catalog_binary import (
+    BinaryCatalog,
+    ScholarshipView,
+    compile_catalog,
+    open_compiled,
+)
+
+RECORDS = [
+    {"id": 1, "title": "Alpha", "value": 1500, "tags": ["a", "b"], "ratio": 0.5},
+    {"id": 2, "title": "Bêta ✓", "value": None, "citizenship": "Domestic"},
+    {"id": "3", "title": "Alpha", "eligibility": {"years": [3, 4]}, "big": 2 ** 70},
+]
+STAMPS = ((123, 456),)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "catalog.bin"
+    compile_catalog(RECORDS, path, "hash", STAMPS)
+    return BinaryCatalog(path)
+
+
+def test_roundtrip(catalog):
+    assert len(catalog) == len(RECORDS)
+    assert [dict(view) for view in catalog] == RECORDS
+    assert catalog.content_hash == "hash"
+    assert catalog.source_stamps == STAMPS
+
+
+def test_absent_and_null_are_distinct(catalog):
+    second = catalog[1]
+    assert second["value"] is None
+    assert "value" in second
+    assert "tags" not in second
+    assert second.get("tags", "missing") == "missing"
+    with pytest.raises(KeyError):
+        second["tags"]
+    assert set(second) == {"id", "title", "value", "citizenship"}
+
+
+def test_indexing_and_slicing(catalog):
+    assert catalog[-1]["id"] == "3"
+    assert [v["id"] for v in catalog[:2]] == [1, 2]
+    with pytest.raises(IndexError):
+        catalog[3]
+
+
+def test_legal_status_override(catalog):
+    view = catalog[0].with_legal_status("both")
+    assert isinstance(view, ScholarshipView)
+    assert view["legal_status"] == "both"
+    assert dict(view) == {**RECORDS[0], "legal_status": "both"}
+    assert "legal_status" not in catalog[0]
+
+
+def test_open_compiled_checks_stamps_and_format(tmp_path):
+    path = tmp_path / "catalog.bin"
+    assert open_compiled(path, STAMPS) is None
+
+    compile_catalog(RECORDS, path, "hash", STAMPS)
+    assert open_compiled(path, STAMPS) is not None
+    assert open_compiled(path, ((1, 1),)) is None
+
+    path.write_bytes(b"not a catalog")
+    assert open_compiled(path, STAMPS) is None
@@ -0,0 +1,76 @@
+from app.core.eligibility import (
+    Constraints,
+    EligibilityRules,
+    infer_constraints,
+    student_faculty,
+)
+
+CATALOG = [
+    {"id": "open", "citizenship": "Domestic;International", "description": "Open to all students."},
+    {"id": "domestic", "citizenship": "Domestic"},
+    {"id": "nursing", "offered_by": "Faculty of Nursing"},
+    {
+        "id": "cs-third-year",
+        "description": "For third or fourth-year students enrolled in Computer Science.",
+    },
+    {"id": "graduate", "level_of_study": "Graduate"},
+    {
+        "id": "explicit",
+        "eligibility": {"faculties": ["Medicine"], "years": [1]},
+        "description": "Only for Engineering students.",
+    },
+]
+
+
+def _eligible(profile):
+    rules = EligibilityRules(CATALOG)
+    mask = rules.mask(profile)
+    return {s["id"] for s, ok in zip(CATALOG, mask) if ok}
+
+
+def test_infers_constraints_from_offered_by_and_description():
+    assert infer_constraints(CATALOG[0]) == Constraints()
+    assert infer_constraints(CATALOG[2]).faculties == {"nursing"}
+    cs = infer_constraints(CATALOG[3])
+    assert cs.programs == {"computer_science"}
+    assert cs.years == {3, 4}
+    assert infer_constraints(CATALOG[4]).levels == {"graduate"}
+
+
+def test_preferences_never_restrict():
+    record = {"description": "Preference will be given to Nursing students in third-year."}
+    assert infer_constraints(record) == Constraints()
+
+
+def test_explicit_eligibility_wins_over_inference():
+    c = infer_constraints(CATALOG[5])
+    assert c.faculties == {"medicine"}
+    assert c.programs is None
+    assert c.years == {1}
+
+
+def test_student_faculty():
+    assert student_faculty("Nursing") == "nursing"
+    assert student_faculty("Engineering Science") == "engineering"
+    assert student_faculty("Arts & Science, Economics") == "arts_science"
+    assert student_faculty("Computer Science") is None
+    assert student_faculty("") is None
+
+
+def test_mask_applies_every_constraint():
+    profile = {
+        "residency_status": "International",
+        "program": "Computer Science",
+        "year": 3,
+        "level_of_study": "undergraduate",
+    }
+    assert _eligible(profile) == {"open", "nursing", "cs-third-year"}
+
+    profile.update(residency_status="domestic", program="Nursing", year=2, level_of_study=None)
+    assert _eligible(profile) == {"open", "domestic", "nursing", "graduate"}
+
+
+def test_unknown_faculty_is_not_filtered():
+    # No faculty named: faculty-restricted awards aren't ruled out
+    assert {"nursing", "explicit"} <= _eligible({"residency_status": "domestic", "year": 1})
+    assert "nursing" not in _eligible({"residency_status": "domestic", "program": "Medicine"})
@@ -0,0 +1,58 @@
+from app.infrastructure.json_stream import JsonArrayStreamer
+
+DOC = (
+    'Here you go:\n```json\n{"note": "matches", "matches": ['
+    '{"scholarship_id": "1", "reason": "has a } brace and \\"quotes\\""}, '
+    '{"scholarship_id": "2", "tags": ["a", "b"], "nested": {"x": [1, 2]}}'
+    '], "other": [{"scholarship_id": "ignored"}]}\n```'
+)
+
+
+def _feed_in_chunks(text, size):
+    streamer = JsonArrayStreamer("matches")
+    out = []
+    for i in range(0, len(text), size):
+        out.extend(streamer.feed(text[i : i + size]))
+    return streamer, out
+
+
+def test_emits_each_element_of_the_target_array():
+    streamer, out = _feed_in_chunks(DOC, len(DOC))
+    assert [e["scholarship_id"] for e in out] == ["1", "2"]
+    assert out[0]["reason"] == 'has a } brace and "quotes"'
+    assert out[1]["nested"] == {"x": [1, 2]}
+    assert streamer.done
+
+
+def test_result_does_not_depend_on_chunking():
+    _, whole = _feed_in_chunks(DOC, len(DOC))
+    for size in (1, 2, 3, 7, 16):
+        _, chunked = _feed_in_chunks(DOC, size)
+        assert chunked == whole
+
+
+def test_elements_arrive_as_soon_as_they_close():
+    streamer = JsonArrayStreamer("matches")
+    assert streamer.feed('{"matches": [{"scholarship_id": "1"}') == [{"scholarship_id": "1"}]
+    assert streamer.feed(', {"scholarship_id": ') == []
+    assert streamer.feed('"2"}') == [{"scholarship_id": "2"}]
+    assert not streamer.done
+
+
+def test_ignores_arrays_under_other_keys_and_nested_keys():
+    streamer = JsonArrayStreamer("matches")
+    doc = '{"meta": {"matches": [{"id": "x"}]}, "reasons": [{"id": "y"}]}'
+    assert streamer.feed(doc) == []
+
+
+def test_key_inside_a_string_value_is_not_the_array():
+    streamer = JsonArrayStreamer("matches")
+    assert streamer.feed('{"title": "matches", "x": [{"id": "no"}]}') == []
+
+
+def test_drops_malformed_elements_and_stops_after_the_array():
+    streamer = JsonArrayStreamer("matches")
+    out = streamer.feed('{"matches": [{"a": 1,}, {"a": 2}]}')
+    assert out == [{"a": 2}]
+    assert streamer.done
+    assert streamer.feed('{"matches": [{"a": 3}]}') == []
@@ -0,0 +1,102 @@
+import asyncio
+
+from app.infrastructure.match_cache import MatchCache, canonical_profile, match_cache_key
+
+
+def _cache(**kwargs):
+    options = dict(max_entries=3, max_bytes=1000, ttl_seconds=60.0, stale_seconds=60.0)
+    options.update(kwargs)
+    return MatchCache(**options)
+
+
+def _age(cache, key, seconds):
+    cache._entries[key].stored_at -= seconds
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = _cache()
+    for key in "abc":
+        cache.set(key, key.upper(), 10)
+    cache.get("a")  # a is now the most recently used
+    cache.set("d", "D", 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("A", True)
+    assert cache.evictions == 1
+
+
+def test_evicts_by_size_and_skips_oversized_values():
+    cache = _cache(max_entries=10, max_bytes=100)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    assert cache.get("a") is None
+    assert cache.get("b") == (2, True)
+
+    cache.set("huge", 3, 101)
+    assert cache.get("huge") is None
+    assert cache.stats()["bytes"] == 60
+
+
+def test_stale_entries_are_served_then_dropped():
+    cache = _cache()
+    cache.set("k", "v", 1)
+    _age(cache, "k", 90)
+    assert cache.get("k") == ("v", False)
+    _age(cache, "k", 60)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = _cache(max_entries=0)
+    cache.set("k", "v", 1)
+    assert cache.get("k") is None
+
+
+def test_revalidate_refreshes_once_per_key():
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "new", 1
+
+    async def main():
+        cache.set("k", "old", 1)
+        _age(cache, "k", 90)
+        cache.revalidate("k", compute)
+        cache.revalidate("k", compute)  # already refreshing
+        assert cache.stats()["refreshing"] == 1
+        while cache.stats()["refreshing"]:
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert len(calls) == 1
+    assert cache.get("k") == ("new", True)
+
+
+def test_failed_revalidation_keeps_the_stale_entry():
+    cache = _cache()
+
+    async def compute():
+        raise RuntimeError("upstream down")
+
+    async def main():
+        cache.set("k", "old", 1)
+        _age(cache, "k", 90)
+        cache.revalidate("k", compute)
+        while cache.stats()["refreshing"]:
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cache.get("k") == ("old", False)
+
+
+def test_cosmetic_profile_differences_share_a_key():
+    a = {"full_name": "Ana", "program": "Computer  Science", "interests": ["AI", "music", ""]}
+    b = {"full_name": "Bo", "program": "computer science", "interests": ["Music", "ai"]}
+    assert canonical_profile(a) == canonical_profile(b)
+    assert match_cache_key(a, "h", ["2", "1"], "local") == match_cache_key(b, "h", ["1", "2"], "local")
+    assert match_cache_key(a, "h", ["1"], "local") != match_cache_key(a, "h", ["1"], "claude")
+    assert match_cache_key(a, "h", ["1"], "local") != match_cache_key(a, "h2", ["1"], "local")
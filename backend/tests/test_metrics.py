@@ -0,0 +1,23 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _route_labels(body: str) -> set:
+    return {
+        line.split('route="', 1)[1].split('"', 1)[0]
+        for line in body.splitlines()
+        if line.startswith("northstar_http_request_duration_seconds_count")
+    }
+
+
+def test_requests_are_labelled_by_route_template():
+    with TestClient(app) as client:
+        client.get("/api/scholarships/metrics-test-1")
+        client.get("/api/scholarships/metrics-test-2")
+        client.get("/no/such/path/42")
+        labels = _route_labels(client.get("/metrics").text)
+
+    assert "/api/scholarships/{scholarship_id}" in labels
+    assert "unmatched" in labels
+    assert not any("metrics-test" in label or "/no/such" in label for label in labels)
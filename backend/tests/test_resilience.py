@@ -0,0 +1,147 @@
+import email.utils
+import time
+
+import httpx
+import pytest
+from anthropic import APIConnectionError, APIStatusError
+
+from app.infrastructure.resilience import (
+    CallPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    is_retryable,
+    retry_after_seconds,
+    retry_reason,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+def status_error(status, **headers):
+    response = httpx.Response(status, request=_REQUEST, headers=headers)
+    return APIStatusError(f"status {status}", response=response, body=None)
+
+
+def _breaker(**kwargs):
+    options = dict(failure_ratio=0.5, window=4, min_calls=4, cooldown=30.0)
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def _trip(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record(failed=True, token=breaker.before_call())
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def _expire_cooldown(breaker):
+    breaker._opened_at -= breaker.cooldown
+
+
+def test_opens_once_the_failure_ratio_is_reached():
+    breaker = _breaker()
+    for failed in (False, True, False):
+        breaker.record(failed, breaker.before_call())
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record(True, breaker.before_call())
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert 0 < info.value.retry_after <= breaker.cooldown
+    assert breaker.rejected == 1
+
+
+def test_no_verdict_calls_are_not_counted():
+    breaker = _breaker()
+    for _ in range(10):
+        breaker.record(None, breaker.before_call())
+    breaker.record(True, breaker.before_call())
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = _breaker()
+    _trip(breaker)
+    _expire_cooldown(breaker)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    probe = breaker.before_call()
+    assert probe is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(False, probe)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = _breaker()
+    _trip(breaker)
+    _expire_cooldown(breaker)
+    breaker.record(True, breaker.before_call())
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_probe_without_verdict_frees_the_slot():
+    breaker = _breaker()
+    _trip(breaker)
+    _expire_cooldown(breaker)
+    breaker.record(None, breaker.before_call())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is not None
+
+
+def test_calls_started_before_the_trip_cannot_close_the_circuit():
+    breaker = _breaker()
+    straggler = breaker.before_call()  # admitted while closed
+    _trip(breaker)
+    _expire_cooldown(breaker)
+    probe = breaker.before_call()
+
+    breaker.record(False, straggler)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # the probe is still in flight
+
+    breaker.record(True, probe)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_retry_classification():
+    assert is_retryable(status_error(429))
+    assert is_retryable(status_error(529))
+    assert is_retryable(APIConnectionError(request=_REQUEST))
+    assert not is_retryable(status_error(400))
+    assert not is_retryable(ValueError("bug"))
+    assert retry_reason(status_error(429)) == "rate_limited"
+    assert retry_reason(status_error(529)) == "overloaded"
+    assert retry_reason(status_error(503)) == "server_error"
+    assert retry_reason(APIConnectionError(request=_REQUEST)) == "connection"
+
+
+def test_retry_after_header_forms():
+    assert retry_after_seconds(status_error(429, **{"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(status_error(429, **{"retry-after": "3"})) == 3.0
+    date = email.utils.formatdate(time.time() + 10, usegmt=True)
+    assert 8 <= retry_after_seconds(status_error(429, **{"retry-after": date})) <= 10
+    assert retry_after_seconds(status_error(429, **{"retry-after": "soon"})) is None
+    assert retry_after_seconds(status_error(429)) is None
+    assert retry_after_seconds(APIConnectionError(request=_REQUEST)) is None
+
+
+def test_backoff_honours_retry_after_within_the_cap():
+    policy = CallPolicy(base_delay=0.5, max_retry_after=5.0)
+    delay = backoff_delay(policy, 0, status_error(429, **{"retry-after": "2"}))
+    assert 2.0 <= delay <= 2.5
+    assert backoff_delay(policy, 0, status_error(429, **{"retry-after": "60"})) is None
+
+
+def test_backoff_is_jittered_exponential_and_capped():
+    policy = CallPolicy(base_delay=0.5, max_delay=2.0)
+    error = status_error(503)
+    for attempt, ceiling in ((0, 0.5), (1, 1.0), (2, 2.0), (6, 2.0)):
+        delays = [backoff_delay(policy, attempt, error) for _ in range(200)]
+        assert all(0 <= d <= ceiling for d in delays)
+        assert max(delays) > ceiling / 2
@@ -0,0 +1,93 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.responses import PrecomputedBody
+from app.main import app
+
+LIST = "/api/scholarships/"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _get(client, url=LIST, encoding="identity", **headers):
+    return client.get(url, headers={"Accept-Encoding": encoding, **headers})
+
+
+def test_etag_revalidation(client):
+    first = _get(client)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    assert "Accept-Encoding" in first.headers["vary"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        again = _get(client, **{"If-None-Match": header})
+        assert again.status_code == 304, header
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+    assert _get(client, **{"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_gzip_variant_has_a_suffixed_etag_that_still_revalidates(client):
+    plain = _get(client)
+    zipped = _get(client, encoding="gzip")
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] == plain.headers["etag"][:-1] + '-gz"'
+    assert zipped.json() == plain.json()
+
+    assert _get(client, encoding="gzip", **{"If-None-Match": zipped.headers["etag"]}).status_code == 304
+    # Any encoding variant's ETag names the same resource version
+    assert _get(client, **{"If-None-Match": zipped.headers["etag"]}).status_code == 304
+
+
+def test_refused_encodings_are_not_used(client):
+    response = _get(client, encoding="gzip;q=0, identity")
+    assert "content-encoding" not in response.headers
+    assert not response.headers["etag"].endswith('-gz"')
+
+
+def test_shapes_have_distinct_etags(client):
+    full = _get(client)
+    projected = _get(client, f"{LIST}?fields=id,name")
+    page = _get(client, f"{LIST}?limit=2")
+    assert len({full.headers["etag"], projected.headers["etag"], page.headers["etag"]}) == 3
+    assert set(projected.json()[0]) == {"id", "name"}
+    assert page.headers["x-total-count"] == str(len(full.json()))
+
+    rest = _get(client, f"{LIST}?cursor={page.headers['x-next-cursor']}")
+    assert page.json() + rest.json() == full.json()
+    assert _get(client, f"{LIST}?cursor=junk").status_code == 400
+    assert _get(client, f"{LIST}?fields=nope").status_code == 400
+
+
+def test_batch_revalidation(client):
+    url = "/api/scholarships/batch?ids=1,does-not-exist"
+    first = _get(client, url)
+    assert first.json()["missing_ids"] == ["does-not-exist"]
+    assert _get(client, url, **{"If-None-Match": first.headers["etag"]}).status_code == 304
+
+
+def test_small_bodies_are_not_compressed():
+    body = PrecomputedBody({"a": 1}, etag="e")
+    assert body.gzip is None and body.br is None
+
+
+def test_large_bodies_are_precompressed():
+    obj = [{"id": i, "text": "scholarship " * 20} for i in range(20)]
+    body = PrecomputedBody(obj, etag="e")
+    assert gzip.decompress(body.gzip) == body.raw
+
+
+def test_brotli_variant_preferred_when_available(client):
+    pytest.importorskip("brotli")
+    response = _get(client, encoding="gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"].endswith('-br"')
+    assert _get(client, **{"If-None-Match": response.headers["etag"]}).status_code == 304
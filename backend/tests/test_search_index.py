@@ -0,0 +1,85 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.search_index import SearchIndex, decode_cursor, encode_cursor
+from app.main import app
+
+CATALOG = [
+    {"id": 1, "name": "Robotics Award", "description": "For students in engineering.",
+     "citizenship": "Domestic"},
+    {"id": 2, "name": "Community Prize", "description": "Robotics outreach and volunteering.",
+     "category": "Community; Leadership", "citizenship": "Domestic;International"},
+    {"id": 3, "name": "Music Bursary", "offered_by": "Faculty of Music",
+     "citizenship": "International"},
+]
+
+
+def _index(records=CATALOG):
+    index = SearchIndex()
+    index.sync(records, version=1)
+    return index
+
+
+def test_name_hits_outrank_description_hits():
+    hits = _index().search("robotics")
+    assert [doc_id for doc_id, _ in hits] == ["1", "2"]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_filters():
+    index = _index()
+    assert [d for d, _ in index.search("", citizenship="international")] == ["2", "3"]
+    assert [d for d, _ in index.search("", citizenship="Domestic")] == ["1", "2"]
+    assert [d for d, _ in index.search("", category="leadership")] == ["2"]
+    assert [d for d, _ in index.search("", offered_by="faculty of music")] == ["3"]
+    assert index.search("nothing matches this") == []
+
+
+def test_sync_is_incremental_and_drops_removed_docs():
+    index = _index()
+    changed = [dict(CATALOG[0], name="Drone Award"), CATALOG[1]]
+    assert index.sync(changed, version=2) == (1, 1)
+    assert [d for d, _ in index.search("robotics")] == ["2"]
+    assert [d for d, _ in index.search("drone")] == ["1"]
+    assert index.search("music") == []
+    assert index.sync(changed, version=3) == (0, 0)
+
+
+def test_copy_is_independent():
+    index = _index()
+    other = index.copy()
+    other.sync(CATALOG[:1], version=2)
+    assert len(index.search("")) == 3
+    assert len(other.search("")) == 1
+
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(1.2345, 7)) == (1.2345, 7)
+    for bad in ("", "not-a-cursor", encode_cursor(1.0, 2)[:-3] + "!!"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def _page_through(client, **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        body = client.get("/api/scholarships/search", params=query).json()
+        ids += [hit["scholarship"]["id"] for hit in body["results"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, body["total"]
+
+
+def test_cursor_pages_cover_every_hit_once():
+    with TestClient(app) as client:
+        full = client.get("/api/scholarships/search", params={"q": "student", "limit": 100}).json()
+        ids, total = _page_through(client, q="student", limit=2)
+        assert ids == [hit["scholarship"]["id"] for hit in full["results"]]
+        assert len(ids) == total
+
+        # An empty query scores every hit 0: ties must page in catalog order
+        ids, total = _page_through(client, limit=3)
+        assert len(ids) == len(set(map(str, ids))) == total
+
+        assert client.get("/api/scholarships/search", params={"cursor": "junk"}).status_code == 400
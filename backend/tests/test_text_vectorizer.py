@@ -0,0 +1,112 @@
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.catalog_store import CatalogSnapshot
+from app.infrastructure.scholarship_repo import similar_scholarships
+from app.infrastructure.text_vectorizer import TfidfIndex, _document_counts, _terms, profile_text
+from app.main import app
+
+CATALOG = [
+    {"id": 1, "name": "Robotics Award", "description": "Engineering students building robots."},
+    {"id": 2, "name": "Community Prize", "category": "Community",
+     "description": "Volunteer work in the community, including robotics outreach."},
+    {"id": 3, "name": "Music Bursary", "description": "Piano and violin performance."},
+    {"id": 4, "name": "Computer Science Scholarship", "description": "Computer science research."},
+]
+
+
+def _dense_cosine(texts):
+    """Brute-force reference: dense TF-IDF vectors and cosine similarity."""
+    docs = [_document_counts(s) for s in CATALOG]
+    df = Counter(t for counts in docs for t in counts)
+    n = len(docs)
+    idf = {t: math.log((1 + n) / (1 + d)) + 1 for t, d in df.items()}
+
+    def vector(counts):
+        v = {t: (1 + math.log(c)) * idf[t] for t, c in counts.items() if t in idf}
+        norm = math.sqrt(sum(w * w for w in v.values())) or 1.0
+        return {t: w / norm for t, w in v.items()}
+
+    query = vector(Counter(t for text in texts for t in _terms(text)))
+    return [sum(w * vector(d).get(t, 0.0) for t, w in query.items()) for d in docs]
+
+
+def test_scores_match_dense_cosine_similarity():
+    index = TfidfIndex(CATALOG)
+    for texts in (["robotics"], ["community volunteer", "robots"], ["computer science research"]):
+        np.testing.assert_allclose(index.score_all(texts), _dense_cosine(texts), atol=1e-5)
+
+
+def test_bigrams_favour_the_exact_phrase():
+    assert "computer_science" in _terms("Computer Science")
+    hits = TfidfIndex(CATALOG).top_k(["computer science"], k=2)
+    assert hits[0][0] == "4"
+
+
+def test_top_k_ordering_mask_and_limits():
+    index = TfidfIndex(CATALOG)
+    hits = index.top_k(["robotics"], k=10)
+    assert [sid for sid, _ in hits] == ["1", "2"]
+    assert hits[0][1] > hits[1][1] > 0
+
+    mask = np.array([False, True, True, True])
+    assert [sid for sid, _ in index.top_k(["robotics"], candidate_mask=mask)] == ["2"]
+    assert len(index.top_k(["robotics"], k=1)) == 1
+    assert index.top_k(["robotics"], k=0) == []
+    assert index.top_k(["quantum chromodynamics"]) == []
+    assert index.top_k([]) == []
+
+
+def test_empty_catalog():
+    index = TfidfIndex([])
+    assert index.top_k(["anything"]) == []
+
+
+def test_profile_text_collects_free_text_fields():
+    profile = {"program": "Music", "experiences": ["orchestra"], "interests": ("piano",), "year": 2}
+    assert profile_text(profile) == ["Music", "orchestra", "piano"]
+
+
+def _snapshot(records):
+    return CatalogSnapshot(
+        version=1, content_hash="h", scholarships=records, success_stories=[], source_stamps=()
+    )
+
+
+def test_similar_scholarships_returns_records_from_the_given_snapshot():
+    snapshot = _snapshot(CATALOG)
+    hits = similar_scholarships(["violin"], snapshot=snapshot)
+    assert [(s["id"], s["name"]) for s, _ in hits] == [(3, "Music Bursary")]
+
+    mask = np.array([False, True, False, False])
+    hits = similar_scholarships(["robotics"], candidate_mask=mask, snapshot=snapshot)
+    assert [s["id"] for s, _ in hits] == [2]
+
+
+def test_similar_scholarships_rejects_a_mask_from_another_snapshot():
+    with pytest.raises(ValueError):
+        similar_scholarships(
+            ["robotics"], candidate_mask=np.ones(3, dtype=bool), snapshot=_snapshot(CATALOG)
+        )
+
+
+def test_similar_route():
+    profile = {
+        "full_name": "A", "university": "U of T", "program": "Computer Science",
+        "year": 2, "residency_status": "domestic", "experiences": ["student leadership"],
+    }
+    with TestClient(app) as client:
+        eligible = client.post("/api/scholarships/similar?limit=5", json=profile).json()["results"]
+        everything = client.post(
+            "/api/scholarships/similar?limit=100&eligible_only=false", json=profile
+        ).json()["results"]
+
+    assert 0 < len(eligible) <= 5
+    assert all(isinstance(hit["scholarship"], dict) for hit in eligible)
+    similarities = [hit["similarity"] for hit in everything]
+    assert similarities == sorted(similarities, reverse=True)
+    assert {hit["scholarship"]["id"] for hit in eligible} <= {hit["scholarship"]["id"] for hit in everything}